@@ -7,24 +7,29 @@ from pathlib import Path
 from contextlib import asynccontextmanager
 import asyncio
 import uuid
+from typing import AsyncIterator, List, Optional, Tuple
 from contextvars import ContextVar
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
 import logging
+import numpy as np
+import orjson
 from starlette.middleware.base import BaseHTTPMiddleware
 
 # Import from mantra package
-from src.mantra import (
-    DelawareCaseLawIndexer,
-    QueryClassifier,
-    LegalResponseGenerator,
+from mantra import (
+    aclose_clients,
+    get_components,
     get_settings,
     format_sources,
     get_http_status_code,
-    MantraException
+    MantraException,
+    SemanticCache,
+    MicroBatcher,
+    RelevanceGate
 )
 
 # Load settings
@@ -33,6 +38,10 @@ settings = get_settings()
 # Request ID context variable (for async-safe request tracking)
 request_id_var: ContextVar[str] = ContextVar('request_id', default='no-request-id')
 
+# Rows of the shared query cache holding ChatResponse dicts (the Streamlit app
+# caches its own response shape under another namespace)
+QUERY_CACHE_NAMESPACE = "chat_api"
+
 
 class RequestIDFilter(logging.Filter):
     """Add request ID to log records."""
@@ -46,46 +55,89 @@ logging.basicConfig(
     level=getattr(logging, settings.log_level),
     format='%(asctime)s - %(name)s - [%(request_id)s] - %(levelname)s - %(message)s'
 )
+# On the handlers, so records from every module (not just this one) get an ID
+for handler in logging.getLogger().handlers:
+    handler.addFilter(RequestIDFilter())
 logger = logging.getLogger(__name__)
-logger.addFilter(RequestIDFilter())
 
 # Global components (loaded once at startup)
 indexer = None
 classifier = None
 generator = None
+semantic_cache = None
+search_batcher = None
+embed_batcher = None
+relevance_gate = None
+
+
+def batch_embed(queries: list) -> list:
+    """Embed a batch of queries with a single embeddings API call."""
+    return [vector[None, :] for vector in indexer.embed_queries(queries)]
+
+
+def batch_search(query_vectors: list) -> list:
+    """Search a batch of query embeddings with a single FAISS call."""
+    return indexer.search_vectors(
+        np.vstack(query_vectors),
+        k=settings.default_retrieval_k,
+        mmr_lambda=settings.mmr_lambda
+    )
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan event handler for startup and shutdown."""
-    global indexer, classifier, generator
+    global indexer, classifier, generator, semantic_cache, search_batcher, embed_batcher, relevance_gate
 
     # Startup
     logger.info("Initializing Mantra components...")
 
     try:
-        # Initialize indexer
-        indexer = DelawareCaseLawIndexer(
-            embedding_model=settings.embedding_model,
-            index_path=str(settings.faiss_index_path),
-            data_path=str(settings.data_path)
-        )
-
-        # Load index
-        indexer.load_index()
+        # Shared components (index is loaded once per process)
+        components = get_components()
+        indexer = components.indexer
+        classifier = components.classifier
+        generator = components.generator
         logger.info(f"✅ Loaded FAISS index with {indexer.index.ntotal} vectors")
 
-        # Initialize classifier
-        classifier = QueryClassifier(
-            model=settings.llm_model
+        # Coalesce concurrent searches into batched FAISS calls
+        search_batcher = MicroBatcher(
+            batch_search,
+            max_batch=settings.search_batch_size,
+            max_wait=settings.search_batch_wait_ms / 1000
         )
-        logger.info("✅ Initialized query classifier")
+        search_batcher.start()
 
-        # Initialize response generator
-        generator = LegalResponseGenerator(
-            model=settings.llm_model
+        # Coalesce concurrent query embeddings into one API call
+        embed_batcher = MicroBatcher(
+            batch_embed,
+            max_batch=settings.search_batch_size,
+            max_wait=settings.search_batch_wait_ms / 1000
         )
-        logger.info("✅ Initialized response generator")
+        embed_batcher.start()
+
+        # Decide clear-cut queries locally; the classifier handles the rest
+        if settings.relevance_gate_enabled:
+            relevance_gate = RelevanceGate(
+                relevant_threshold=settings.relevance_gate_relevant_threshold,
+                irrelevant_threshold=settings.relevance_gate_irrelevant_threshold
+            )
+            # One embeddings call; nothing is written to the index directory
+            relevance_gate.build(indexer.embed_queries)
+            logger.info("✅ Initialized relevance gate")
+
+        # Initialize query cache (SQLite store shared with other workers)
+        if settings.semantic_cache_enabled:
+            semantic_cache = SemanticCache(
+                dimension=indexer.index.d,
+                threshold=settings.semantic_cache_threshold,
+                max_entries=settings.semantic_cache_size,
+                db_path=str(settings.query_cache_db_path),
+                ttl=settings.semantic_cache_ttl,
+                index_version=indexer.index_version,
+                namespace=QUERY_CACHE_NAMESPACE
+            )
+            logger.info(f"✅ Initialized query cache ({len(semantic_cache)} entries)")
 
         logger.info("🎉 Mantra is ready!")
 
@@ -99,10 +151,16 @@ async def lifespan(app: FastAPI):
         logger.error(f"❌ Unexpected error during startup: {e}")
         raise
 
-    yield
-
-    # Shutdown (cleanup if needed)
-    logger.info("Shutting down Mantra...")
+    try:
+        yield
+    finally:
+        # Shutdown
+        logger.info("Shutting down Mantra...")
+        if search_batcher is not None:
+            await search_batcher.stop()
+        if embed_batcher is not None:
+            await embed_batcher.stop()
+        await aclose_clients()
 
 
 class RequestIDMiddleware(BaseHTTPMiddleware):
@@ -128,6 +186,8 @@ app = FastAPI(
     title="Mantra Chat API",
     description="Delaware Corporate Law AI Assistant API",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
+    openapi_url="/openapi.json" if settings.api_docs_enabled else None,
     lifespan=lifespan
 )
 
@@ -178,12 +238,164 @@ async def health_check():
     }
 
 
+NO_ANSWER_MESSAGE = (
+    "This is a relevant legal question, but we currently don't have the answer in a document "
+    "that we can reference. Please kindly create a ticket so we can help you with this issue."
+)
+
+
+def start_classification(user_query: str, query_vector=None) -> asyncio.Future:
+    """
+    Start classifying a query so it overlaps other work.
+
+    When the relevance gate is enabled and the query embedding is available,
+    clear-cut queries are decided immediately without calling the classifier.
+
+    Args:
+        user_query: Stripped user query
+        query_vector: Query embedding (required for the relevance gate)
+
+    Returns:
+        Awaitable resolving to the classification dictionary
+    """
+    if relevance_gate is not None and query_vector is not None:
+        classification = relevance_gate.classify(query_vector)
+        if classification is not None:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(classification)
+            return future
+
+    return asyncio.create_task(asyncio.to_thread(classifier.classify_query, user_query))
+
+
+async def retrieve_context(
+    user_query: str,
+    query_vector,
+    classification_task: Optional[asyncio.Future] = None
+) -> Tuple[Optional[ChatResponse], List[dict]]:
+    """
+    Classify a query and retrieve its supporting chunks.
+
+    Classification and retrieval run concurrently; the search result is
+    discarded if the query turns out not to be relevant.
+
+    Args:
+        user_query: Stripped user query
+        query_vector: Precomputed query embedding (reused for retrieval)
+        classification_task: Already-running task from start_classification()
+
+    Returns:
+        Tuple of (early response, search results). The early response is set
+        when the query is rejected or escalated and no generation is needed.
+    """
+    if classification_task is None:
+        classification_task = start_classification(user_query, query_vector)
+
+    # Speculatively search while classification is in flight
+    search_task = asyncio.create_task(search_batcher.submit(query_vector))
+
+    # Step 1: Classify query
+    try:
+        classification = await classification_task
+    except BaseException:
+        search_task.cancel()
+        raise
+
+    if not classification.get("relevant", False):
+        search_task.cancel()
+        # Query is not relevant to Delaware law
+        rejection_message = classifier.get_rejection_message(user_query, classification)
+        return ChatResponse(
+            message=rejection_message,
+            relevant=False,
+            sources=[],
+            confidence="high"
+        ), []
+
+    # Step 2: Search for relevant cases (batched with concurrent requests)
+    search_results = await search_task
+
+    # Check if results are high quality enough to answer
+    # Escalate if: no results OR top result has low similarity
+    if not search_results:
+        return ChatResponse(
+            message=NO_ANSWER_MESSAGE,
+            relevant=True,
+            sources=[],
+            confidence="low"
+        ), []
+
+    # Check similarity of top result
+    top_similarity = search_results[0].get("similarity", 0)
+    logger.info(f"Top result similarity: {top_similarity:.3f}")
+
+    if top_similarity < settings.similarity_threshold:
+        logger.info(f"Low similarity ({top_similarity:.3f} < {settings.similarity_threshold}), escalating to ticket")
+        return ChatResponse(
+            message=NO_ANSWER_MESSAGE,
+            relevant=True,
+            sources=[],
+            confidence="low"
+        ), []
+
+    return None, search_results
+
+
+async def answer_query(
+    user_query: str,
+    query_vector,
+    classification_task: Optional[asyncio.Future] = None
+) -> Tuple[ChatResponse, bool]:
+    """
+    Run the RAG pipeline for a single query.
+
+    Args:
+        user_query: Stripped user query
+        query_vector: Precomputed query embedding (reused for retrieval)
+        classification_task: Already-running task from start_classification()
+
+    Returns:
+        Tuple of (chat response, whether the message was generated by the LLM).
+        Rejections and escalations are not generated.
+    """
+    early_response, search_results = await retrieve_context(
+        user_query, query_vector, classification_task
+    )
+    if early_response is not None:
+        return early_response, False
+
+    # Step 3: Generate response (async client, no worker thread per request)
+    response_data = await generator.agenerate_response(
+        question=user_query,
+        retrieved_chunks=search_results,
+        include_sources=False,  # Don't add sources to text; chat widget displays them separately
+        query_vector=query_vector
+    )
+
+    # Step 4: Format sources using utility function
+    sources = format_sources(search_results, max_sources=3)
+
+    return ChatResponse(
+        message=response_data["answer"],
+        relevant=True,
+        sources=sources,
+        confidence=response_data.get("confidence", "medium")
+    ), True
+
+
+def sse_event(data: dict, event: Optional[str] = None) -> str:
+    """Format a Server-Sent Event."""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {orjson.dumps(data).decode()}\n\n"
+
+
 @app.post("/chat", response_model=ChatResponse)
 async def chat(message: ChatMessage):
     """
     Main chat endpoint.
 
     Processes user message through:
+    0. Query cache (exact match, then semantic match on the query embedding)
     1. Query classification (is it relevant?)
     2. If relevant: RAG search + response generation
     3. If not: polite rejection
@@ -196,96 +408,173 @@ async def chat(message: ChatMessage):
 
         logger.info(f"Received query: {user_query[:100]}...")
 
-        # Step 1: Classify query (async wrapper to prevent blocking)
-        classification = await asyncio.to_thread(
-            classifier.classify_query, user_query
-        )
+        # Step 0: Exact-match cache (no embedding needed). Cache calls may wait
+        # on SQLite while another worker writes, so they run off the event loop
+        if semantic_cache is not None:
+            cached = await asyncio.to_thread(semantic_cache.get_exact, user_query)
+            if cached is not None:
+                logger.info("Query cache hit (exact)")
+                return ChatResponse(**cached)
+
+        # Without the relevance gate, classify while the query is embedded
+        # (the embedding is reused for the semantic cache and for retrieval)
+        classification_task = None
+        if relevance_gate is None:
+            classification_task = start_classification(user_query)
+        try:
+            query_vector = await embed_batcher.submit(user_query)
+        except BaseException:
+            if classification_task is not None:
+                classification_task.cancel()
+            raise
+
+        if semantic_cache is not None:
+            cached = await asyncio.to_thread(semantic_cache.get_similar, query_vector)
+            if cached is not None:
+                if classification_task is not None:
+                    classification_task.cancel()
+                return ChatResponse(**cached)
+
+        response, generated = await answer_query(user_query, query_vector, classification_task)
+
+        # Only cache generated answers: rejections and escalations depend on
+        # the classifier (possibly its keyword fallback) and on the index
+        if semantic_cache is not None and generated and response.confidence != "error":
+            await asyncio.to_thread(semantic_cache.add, user_query, query_vector, response.model_dump())
 
-        if not classification.get("relevant", False):
-            # Query is not relevant to Delaware law
-            rejection_message = classifier.get_rejection_message(user_query, classification)
-            return ChatResponse(
-                message=rejection_message,
-                relevant=False,
-                sources=[],
-                confidence="high"
-            )
+        return response
 
-        # Step 2: Search for relevant cases (async wrapper to prevent blocking)
-        search_results = await asyncio.to_thread(
-            indexer.search, user_query, k=settings.default_retrieval_k
-        )
+    except MantraException as e:
+        # Handle known Mantra exceptions with proper HTTP status codes
+        status_code = get_http_status_code(e)
+        logger.error(f"Mantra error ({status_code}): {e}")
+        raise HTTPException(status_code=status_code, detail=str(e))
+    except Exception as e:
+        # Handle unexpected errors
+        logger.error(f"Unexpected error processing query: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="An unexpected error occurred")
 
-        # Check if results are high quality enough to answer
-        # Escalate if: no results OR top result has low similarity
-        if not search_results:
-            return ChatResponse(
-                message="This is a relevant legal question, but we currently don't have the answer in a document that we can reference. Please kindly create a ticket so we can help you with this issue.",
-                relevant=True,
-                sources=[],
-                confidence="low"
-            )
 
-        # Check similarity of top result
-        top_similarity = search_results[0].get("similarity", 0)
-        logger.info(f"Top result similarity: {top_similarity:.3f}")
-
-        if top_similarity < settings.similarity_threshold:
-            logger.info(f"Low similarity ({top_similarity:.3f} < {settings.similarity_threshold}), escalating to ticket")
-            return ChatResponse(
-                message="This is a relevant legal question, but we currently don't have the answer in a document that we can reference. Please kindly create a ticket so we can help you with this issue.",
-                relevant=True,
-                sources=[],
-                confidence="low"
-            )
+@app.post("/chat/stream")
+async def chat_stream(message: ChatMessage):
+    """
+    Streaming chat endpoint (Server-Sent Events).
 
-        # Step 3: Generate response (async wrapper to prevent blocking)
-        response_data = await asyncio.to_thread(
-            generator.generate_response,
-            question=user_query,
-            retrieved_chunks=search_results,
-            include_sources=False  # Don't add sources to text; chat widget displays them separately
-        )
+    Emits one ``data: {"delta": ...}`` event per generated token, then a final
+    ``event: sources`` event with sources, relevance and confidence.
+    Rejections, escalations and cache hits are sent as a single delta.
+    """
+    try:
+        user_query = message.message.strip()
 
-        # Step 4: Format sources using utility function
-        sources = format_sources(search_results, max_sources=3)
+        if not user_query:
+            raise HTTPException(status_code=400, detail="Empty message")
 
-        return ChatResponse(
-            message=response_data["answer"],
-            relevant=True,
-            sources=sources,
-            confidence=response_data.get("confidence", "medium")
-        )
+        logger.info(f"Received streaming query: {user_query[:100]}...")
+
+        early_response = None
+        if semantic_cache is not None:
+            cached = await asyncio.to_thread(semantic_cache.get_exact, user_query)
+            if cached is not None:
+                logger.info("Query cache hit (exact)")
+                early_response = ChatResponse(**cached)
+
+        query_vector = None
+        search_results = []
+        classification_task = None
+        if early_response is None:
+            if relevance_gate is None:
+                classification_task = start_classification(user_query)
+            try:
+                query_vector = await embed_batcher.submit(user_query)
+            except BaseException:
+                if classification_task is not None:
+                    classification_task.cancel()
+                raise
+
+            if semantic_cache is not None:
+                cached = await asyncio.to_thread(semantic_cache.get_similar, query_vector)
+                if cached is not None:
+                    if classification_task is not None:
+                        classification_task.cancel()
+                    early_response = ChatResponse(**cached)
+
+        if early_response is None:
+            early_response, search_results = await retrieve_context(
+                user_query, query_vector, classification_task
+            )
 
     except MantraException as e:
-        # Handle known Mantra exceptions with proper HTTP status codes
         status_code = get_http_status_code(e)
         logger.error(f"Mantra error ({status_code}): {e}")
         raise HTTPException(status_code=status_code, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
-        # Handle unexpected errors
         logger.error(f"Unexpected error processing query: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="An unexpected error occurred")
 
+    async def event_stream() -> AsyncIterator[str]:
+        if early_response is not None:
+            yield sse_event({"delta": early_response.message})
+            yield sse_event({
+                "sources": early_response.sources,
+                "relevant": early_response.relevant,
+                "confidence": early_response.confidence
+            }, event="sources")
+            return
+
+        parts = []
+        try:
+            async for delta in generator.astream(user_query, search_results):
+                parts.append(delta)
+                yield sse_event({"delta": delta})
+        except Exception as e:
+            logger.error(f"Error streaming response: {e}", exc_info=True)
+            yield sse_event({"detail": "An unexpected error occurred"}, event="error")
+            return
+
+        response = ChatResponse(
+            message="".join(parts),
+            relevant=True,
+            sources=format_sources(search_results, max_sources=3),
+            confidence=generator.estimate_confidence(search_results)
+        )
+        yield sse_event({
+            "sources": response.sources,
+            "relevant": response.relevant,
+            "confidence": response.confidence
+        }, event="sources")
+
+        # Only completed generated answers are cached (see /chat)
+        if semantic_cache is not None:
+            await asyncio.to_thread(semantic_cache.add, user_query, query_vector, response.model_dump())
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+# Static payload, serialized once at import
+EXAMPLES_JSON = orjson.dumps({
+    "relevant": [
+        "What is fiduciary duty?",
+        "Explain the Revlon doctrine",
+        "What is the business judgment rule?",
+        "What are the requirements for entire fairness review?",
+        "Explain the MFW framework",
+        "What is Caremark oversight?"
+    ],
+    "irrelevant": [
+        "Who is Koosha?",
+        "What's the weather today?",
+        "How do I make pasta?"
+    ]
+})
+
 
 @app.get("/examples")
 async def get_examples():
     """Get example queries."""
-    return {
-        "relevant": [
-            "What is fiduciary duty?",
-            "Explain the Revlon doctrine",
-            "What is the business judgment rule?",
-            "What are the requirements for entire fairness review?",
-            "Explain the MFW framework",
-            "What is Caremark oversight?"
-        ],
-        "irrelevant": [
-            "Who is Koosha?",
-            "What's the weather today?",
-            "How do I make pasta?"
-        ]
-    }
+    return Response(content=EXAMPLES_JSON, media_type="application/json")
 
 
 if __name__ == "__main__":
@@ -3,20 +3,52 @@ Mantra - Delaware Corporate Law Chatbot
 Integrated application with all components.
 """
 
+import asyncio
+import html
+import logging
+
 import streamlit as st
+from typing import Optional
 
 # Import from mantra package
-from src.mantra import (
-    DelawareCaseLawIndexer,
-    QueryClassifier,
-    LegalResponseGenerator,
+from mantra import (
+    Components,
+    SemanticCache,
+    get_components,
     get_settings,
     format_sources
 )
+from mantra.exceptions import IndexNotFoundError
+from mantra.utils import date_to_int
 
 # Load settings
 settings = get_settings()
 
+# Library modules only create loggers; the app configures root logging
+logging.basicConfig(
+    level=getattr(logging, settings.log_level),
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+# Rows of the shared query cache holding this app's response dicts (the API
+# caches ChatResponse dicts under another namespace)
+QUERY_CACHE_NAMESPACE = "streamlit"
+
+# Court filter choices (the first one disables the filter)
+COURT_OPTIONS = ["All Courts", "delaware-supreme", "delaware-chancery"]
+
+# Source card templates (fields are HTML-escaped by render_sources)
+_SOURCE_CARD = (
+    '<div class="source-box">'
+    '<strong>{i}. {case_name}</strong><br>'
+    'Court: {court}<br>'
+    'Date: {date_filed}<br>'
+    'Citations: {citation_count}<br>'
+    '{link}'
+    '</div>'
+)
+_SOURCE_LINK = '<a href="{url}" target="_blank" rel="noopener">View Full Case →</a>'
+
 # Page configuration
 st.set_page_config(
     page_title="Mantra - Delaware Corporate Law Assistant",
@@ -71,10 +103,52 @@ if "classifier" not in st.session_state:
     st.session_state.classifier = None
 if "generator" not in st.session_state:
     st.session_state.generator = None
+if "query_cache" not in st.session_state:
+    st.session_state.query_cache = None
 if "index_loaded" not in st.session_state:
     st.session_state.index_loaded = False
 if "retrieval_k" not in st.session_state:
     st.session_state.retrieval_k = settings.default_retrieval_k
+if "retrieve_k" not in st.session_state:
+    st.session_state.retrieve_k = 20
+if "filter_court" not in st.session_state:
+    st.session_state.filter_court = COURT_OPTIONS[0]
+if "filter_date_from" not in st.session_state:
+    st.session_state.filter_date_from = None
+if "search_filters" not in st.session_state:
+    st.session_state.search_filters = None
+
+
+@st.cache_resource(show_spinner=False)
+def load_components() -> Components:
+    """
+    Load the shared component registry once per process.
+
+    Same indexer, classifier and generator (with its response cache) as the
+    API builds; a failed load (e.g. no index yet) is retried on the next run.
+    """
+    return get_components()
+
+
+@st.cache_resource(show_spinner=False)
+def get_query_cache(
+    dimension: int,
+    threshold: float,
+    max_entries: int,
+    db_path: str,
+    ttl: Optional[float] = None,
+    index_version: Optional[str] = None
+) -> SemanticCache:
+    """Open the persistent query cache once per process (and per index build)."""
+    return SemanticCache(
+        dimension=dimension,
+        threshold=threshold,
+        max_entries=max_entries,
+        db_path=db_path,
+        ttl=ttl,
+        index_version=index_version,
+        namespace=QUERY_CACHE_NAMESPACE
+    )
 
 
 def initialize_components():
@@ -82,95 +156,140 @@ def initialize_components():
     if st.session_state.indexer is None:
         with st.spinner("Initializing Mantra components..."):
             try:
-                # Initialize indexer
-                st.session_state.indexer = DelawareCaseLawIndexer(
-                    embedding_model=settings.embedding_model,
-                    index_path=str(settings.faiss_index_path),
-                    data_path=str(settings.data_path)
-                )
+                # Shared components (index is loaded once per process, not per session)
+                components = load_components()
+                st.session_state.indexer = components.indexer
+                st.session_state.classifier = components.classifier
+                st.session_state.generator = components.generator
+                if settings.semantic_cache_enabled:
+                    st.session_state.query_cache = get_query_cache(
+                        dimension=st.session_state.indexer.index.d,
+                        threshold=settings.semantic_cache_threshold,
+                        max_entries=settings.semantic_cache_size,
+                        db_path=str(settings.query_cache_db_path),
+                        ttl=settings.semantic_cache_ttl,
+                        index_version=st.session_state.indexer.index_version
+                    )
+                st.session_state.index_loaded = True
+                st.sidebar.success("✅ Index loaded successfully!")
 
-                # Load existing index
-                try:
-                    st.session_state.indexer.load_index()
-                    st.session_state.index_loaded = True
-                    st.sidebar.success("✅ Index loaded successfully!")
-                except FileNotFoundError:
-                    st.sidebar.warning("⚠️ No index found. Please build the index first.")
-                    st.session_state.index_loaded = False
-
-                # Initialize classifier
-                st.session_state.classifier = QueryClassifier(
-                    model=settings.llm_model
-                )
-
-                # Initialize response generator
-                st.session_state.generator = LegalResponseGenerator(
-                    model=settings.llm_model
-                )
+            except (FileNotFoundError, IndexNotFoundError):
+                st.sidebar.warning("⚠️ No index found. Please build the index first.")
+                st.session_state.index_loaded = False
 
             except Exception as e:
                 st.error(f"Error initializing components: {e}")
 
 
-def process_query(query: str) -> dict:
+async def process_query_async(query: str) -> dict:
     """
     Process a user query through the complete pipeline.
-    
+
+    Without a query cache, classification and query embedding run
+    concurrently, so the embedding round-trip is hidden under the classifier
+    call. With one, repeated and near-identical questions are answered from
+    the cache before the classifier is called.
+
     Args:
         query: User's question
-        
+
     Returns:
         Response dictionary
     """
-    # Step 1: Classify query
-    classification = st.session_state.classifier.classify_query(query)
-    
+    indexer = st.session_state.indexer
+    classifier = st.session_state.classifier
+    generator = st.session_state.generator
+
+    # Sidebar settings (filters are rebuilt only when their widgets change)
+    filters = st.session_state.search_filters
+    k = st.session_state.retrieval_k
+    retrieve_k = st.session_state.retrieve_k
+
+    # Cached answers are only valid for unfiltered searches
+    query_cache = None if filters else st.session_state.get("query_cache")
+
+    # Step 0: Verbatim repeats skip every API call
+    if query_cache is not None:
+        cached = query_cache.get_exact(query)
+        if cached is not None:
+            return cached
+
+    # Step 1: Classify query while speculatively embedding it. With a query
+    # cache the embedding is looked up first: asyncio.run() waits for worker
+    # threads, so a classifier call started alongside would delay the cache hit
+    classification_task = None
+    if query_cache is None:
+        classification_task = asyncio.ensure_future(
+            asyncio.to_thread(classifier.classify_query, query)
+        )
+    try:
+        query_vector = await asyncio.to_thread(indexer.embed_query, query)
+    except Exception as e:
+        query_vector = e
+
+    # Near-identical questions reuse the cached answer
+    if query_cache is not None and not isinstance(query_vector, BaseException):
+        cached = query_cache.get_similar(query_vector)
+        if cached is not None:
+            return cached
+
+    if classification_task is None:
+        classification = await asyncio.to_thread(classifier.classify_query, query)
+    else:
+        classification = await classification_task
+
     if not classification["relevant"]:
+        # Not cached: the classification may be the keyword fallback used
+        # while the LLM is unreachable
         return {
             "type": "rejection",
-            "answer": st.session_state.generator.format_rejection_response(
+            "answer": generator.format_rejection_response(
                 query,
                 classification["reason"]
             ),
             "classification": classification
         }
-    
+
     # Step 2: Retrieve relevant cases
     try:
-        # Get filters from sidebar if any
-        filters = {}
-        if st.session_state.get("filter_court"):
-            filters["court"] = st.session_state.filter_court
-        if st.session_state.get("filter_date_from"):
-            filters["date_filed"] = {"$gte": st.session_state.filter_date_from}
-        
-        retrieved_chunks = st.session_state.indexer.search(
+        if isinstance(query_vector, BaseException):
+            raise query_vector
+
+        retrieved_chunks = indexer.search(
             query=query,
-            k=st.session_state.retrieval_k,
-            filters=filters if filters else None,
-            retrieve_k=20
+            k=k,
+            filters=filters,
+            retrieve_k=max(retrieve_k, k),
+            query_vector=query_vector,
+            mmr_lambda=settings.mmr_lambda
         )
-        
+
         if not retrieved_chunks:
             return {
                 "type": "no_results",
                 "answer": "I couldn't find relevant case law to answer your question. Please try rephrasing or ask about a different topic.",
                 "classification": classification
             }
-        
+
         # Step 3: Generate response
-        response = st.session_state.generator.generate_response(
+        response = await asyncio.to_thread(
+            generator.generate_response,
             question=query,
             retrieved_chunks=retrieved_chunks,
-            include_sources=True
+            include_sources=True,
+            query_vector=query_vector
         )
-        
+
         response["type"] = "success"
         response["classification"] = classification
         response["retrieved_chunks"] = retrieved_chunks
-        
+
+        # Only generated answers are cached (as in chat_api)
+        if query_cache is not None and response.get("confidence") != "error":
+            query_cache.add(query, query_vector, response)
+
         return response
-        
+
     except Exception as e:
         return {
             "type": "error",
@@ -179,6 +298,43 @@ def process_query(query: str) -> dict:
         }
 
 
+def process_query(query: str) -> dict:
+    """
+    Process a user query from the (synchronous) Streamlit script.
+
+    Args:
+        query: User's question
+
+    Returns:
+        Response dictionary
+    """
+    return asyncio.run(process_query_async(query))
+
+
+def render_sources(sources: list) -> str:
+    """
+    Render source cards as one HTML string, escaping all case fields.
+
+    Args:
+        sources: Source dictionaries from format_sources
+
+    Returns:
+        HTML for all source cards
+    """
+    cards = []
+    for i, source in enumerate(sources, 1):
+        url = source.get("url")
+        cards.append(_SOURCE_CARD.format(
+            i=i,
+            case_name=html.escape(str(source["case_name"])),
+            court=html.escape(str(source["court"]).replace("-", " ").title()),
+            date_filed=html.escape(str(source["date_filed"])),
+            citation_count=html.escape(str(source["citation_count"])),
+            link=_SOURCE_LINK.format(url=html.escape(url)) if url else ""
+        ))
+    return "".join(cards)
+
+
 def display_message(role: str, content: dict):
     """Display a chat message with proper formatting."""
     with st.chat_message(role):
@@ -199,17 +355,43 @@ def display_message(role: str, content: dict):
             
             # Display sources in expandable section
             if content.get("sources"):
+                # Rendered once per message, then reused on every rerun
+                if "sources_html" not in content:
+                    content["sources_html"] = render_sources(content["sources"])
                 with st.expander("📚 View Source Cases", expanded=False):
-                    for i, source in enumerate(content["sources"], 1):
-                        st.markdown(f"""
-                        <div class="source-box">
-                            <strong>{i}. {source['case_name']}</strong><br>
-                            Court: {source['court'].replace('-', ' ').title()}<br>
-                            Date: {source['date_filed']}<br>
-                            Citations: {source['citation_count']}<br>
-                            {f'<a href="{source["url"]}" target="_blank">View Full Case →</a>' if source['url'] else ''}
-                        </div>
-                        """, unsafe_allow_html=True)
+                    st.markdown(content["sources_html"], unsafe_allow_html=True)
+
+
+def build_filters() -> Optional[dict]:
+    """
+    Build the search filter dictionary from the filter widgets.
+
+    Returns:
+        Filters for indexer.search, or None if no filter is set
+    """
+    filters = {}
+
+    court = st.session_state.get("filter_court")
+    if court and court != COURT_OPTIONS[0]:
+        filters["court"] = court
+
+    date_from = st.session_state.get("filter_date_from")
+    if date_from:
+        filters["date_filed_int"] = {"$gte": date_to_int(date_from)}
+
+    return filters or None
+
+
+def update_filters():
+    """Widget callback: rebuild the cached search filters."""
+    st.session_state.search_filters = build_filters()
+
+
+def clear_filters():
+    """Button callback: reset the filter widgets and cached filters."""
+    st.session_state.filter_court = COURT_OPTIONS[0]
+    st.session_state.filter_date_from = None
+    st.session_state.search_filters = None
 
 
 def main():
@@ -252,26 +434,29 @@ def main():
             help="Higher values provide more context but may include less relevant results"
         )
 
+        st.session_state.retrieve_k = st.slider(
+            "Candidates to search",
+            min_value=5,
+            max_value=100,
+            value=st.session_state.retrieve_k,
+            help="Nearest neighbours fetched before filtering and reranking"
+        )
+
         st.divider()
 
         # Search filters
         st.subheader("🔍 Search Filters")
 
-        court_options = ["All Courts", "delaware-supreme", "delaware-chancery"]
-        selected_court = st.selectbox("Court", court_options)
-        st.session_state.filter_court = None if selected_court == "All Courts" else selected_court
-        
-        date_from = st.date_input(
+        st.selectbox("Court", COURT_OPTIONS, key="filter_court", on_change=update_filters)
+
+        st.date_input(
             "Cases from",
-            value=None,
+            key="filter_date_from",
+            on_change=update_filters,
             help="Filter cases filed on or after this date"
         )
-        st.session_state.filter_date_from = date_from.isoformat() if date_from else None
-        
-        if st.button("Clear Filters"):
-            st.session_state.filter_court = None
-            st.session_state.filter_date_from = None
-            st.rerun()
+
+        st.button("Clear Filters", on_click=clear_filters)
         
         st.divider()
         
@@ -3,23 +3,27 @@
 Script to build FAISS index from extracted case law.
 """
 
-import os
-import sys
-from pathlib import Path
+import logging
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-
-from mantra import DelawareCaseLawIndexer
+from mantra import DelawareCaseLawIndexer, get_settings
+from mantra.indexer import LOG_FORMAT
 
 
 def main():
     """Build FAISS index."""
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+    settings = get_settings()
+
     # Initialize indexer
     indexer = DelawareCaseLawIndexer(
-        embedding_model=os.getenv("EMBEDDING_MODEL", "text-embedding-3-small"),
-        index_path=os.getenv("FAISS_INDEX_PATH", "./faiss_index"),
-        data_path=os.getenv("DATA_DIR", "./data/cases") + "/delaware_cases.json"
+        embedding_model=settings.embedding_model,
+        index_path=str(settings.faiss_index_path),
+        data_path=str(settings.data_path),
+        index_type=settings.faiss_index_type,
+        nprobe=settings.faiss_nprobe,
+        ef_search=settings.faiss_ef_search,
+        chunk_workers=settings.chunk_workers,
+        embed_concurrency=settings.embed_concurrency
     )
     
     # Build index
@@ -3,18 +3,17 @@
 Script to extract Delaware case law from CourtListener API.
 """
 
+import logging
 import os
-import sys
-from pathlib import Path
-
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from mantra import DelawareCaseLawExtractor
+from mantra.data_extractor import LOG_FORMAT
 
 
 def main():
     """Extract Delaware case law."""
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+
     # Get API token from environment
     api_token = os.getenv("COURTLISTENER_API_TOKEN")
     
@@ -1,34 +1,163 @@
 import os
+import math
+import hashlib
+import itertools
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
 import streamlit as st
 from langchain_community.document_loaders import PyPDFLoader, TextLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_community.vectorstores import FAISS
+from langchain_community.vectorstores.utils import DistanceStrategy
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_core.documents import Document
 from langchain_openai import OpenAIEmbeddings, ChatOpenAI
 from langchain.chains.retrieval_qa.base import RetrievalQA
 from dotenv import load_dotenv
+import numpy as np
+import faiss
+import httpx
 
 # Load environment variables
 load_dotenv()
 
+@st.cache_resource
+def get_http_client():
+    """Pooled keep-alive HTTP client shared by all OpenAI calls (survives reruns)."""
+    return httpx.Client(
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        timeout=httpx.Timeout(60.0, connect=10.0)
+    )
+
 # Initialize session state
 if "conversation" not in st.session_state:
     st.session_state.conversation = []
 if "vector_store" not in st.session_state:
     st.session_state.vector_store = None
 
+# Parallel ingest workers. On rotating disks concurrent reads can be slower
+# than sequential ones, so set INGEST_WORKERS=1 there.
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", max(1, (os.cpu_count() or 2) - 1)))
+
+def _load_one(file_path):
+    """Load a single document (module-level so it can run in a worker process)."""
+    if file_path.endswith('.pdf'):
+        loader = PyPDFLoader(file_path)
+    else:
+        loader = TextLoader(file_path)
+    return loader.load()
+
 def load_documents(file_paths):
     """Load and process documents from file paths."""
-    documents = []
+    supported = []
     for file_path in file_paths:
-        if file_path.endswith('.pdf'):
-            loader = PyPDFLoader(file_path)
-        elif file_path.endswith('.txt'):
-            loader = TextLoader(file_path)
+        if file_path.endswith(('.pdf', '.txt')):
+            supported.append(file_path)
         else:
             st.error(f"Unsupported file type: {file_path}")
-            continue
-        documents.extend(loader.load())
-    return documents
+
+    if len(supported) <= 1 or INGEST_WORKERS <= 1:
+        return list(itertools.chain.from_iterable(map(_load_one, supported)))
+
+    # PDF parsing is CPU-bound, so spread files across processes
+    with ProcessPoolExecutor(max_workers=min(INGEST_WORKERS, len(supported))) as pool:
+        return list(itertools.chain.from_iterable(pool.map(_load_one, supported)))
+
+class DiskEmbeddingCache:
+    """SQLite cache of chunk embeddings keyed by sha256(model + text)."""
+
+    def __init__(self, path="./data/embed_cache.sqlite3"):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache "
+            "(hash BLOB PRIMARY KEY, model TEXT, dim INT, vec BLOB)"
+        )
+
+    @staticmethod
+    def key(model, text):
+        return hashlib.sha256((model + text).encode("utf-8")).digest()
+
+    def get_many(self, keys):
+        """Return {hash: vector} for the keys present in the cache."""
+        found = {}
+        unique = list(set(keys))
+        for start in range(0, len(unique), 500):
+            batch = unique[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT hash, vec FROM cache WHERE hash IN ({','.join('?' * len(batch))})",
+                batch
+            )
+            for h, vec in rows:
+                found[h] = np.frombuffer(vec, dtype=np.float32).tolist()
+        return found
+
+    def put_many(self, model, keys, vectors):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO cache (hash, model, dim, vec) VALUES (?, ?, ?, ?)",
+            [
+                (h, model, len(vec), np.asarray(vec, dtype=np.float32).tobytes())
+                for h, vec in zip(keys, vectors)
+            ]
+        )
+        self.conn.commit()
+
+    def embed_documents(self, embeddings, model, texts):
+        """Embed texts, sending only cache misses to the API, in original order."""
+        keys = [self.key(model, text) for text in texts]
+        cached = self.get_many(keys)
+
+        # One API input per distinct missing text
+        missing = {}
+        for i, h in enumerate(keys):
+            if h not in cached and h not in missing:
+                missing[h] = texts[i]
+        if missing:
+            new_vectors = embeddings.embed_documents(list(missing.values()))
+            self.put_many(model, list(missing), new_vectors)
+            cached.update(zip(missing, new_vectors))
+
+        return [cached[h] for h in keys]
+
+# Vector index: "hnsw" (default), "ivf", "ivfpq", "sq8" or "flat"
+INDEX_TYPE = os.getenv("LEGACY_INDEX_TYPE", "hnsw").lower()
+IVF_NPROBE = int(os.getenv("FAISS_NPROBE", "8"))
+
+def build_faiss_index(vectors):
+    """Build a sublinear inner-product FAISS index over the normalized chunk vectors."""
+    vectors = np.ascontiguousarray(vectors, dtype="float32")
+    faiss.normalize_L2(vectors)
+    n, d = vectors.shape
+    nlist = min(4096, int(math.sqrt(n)))
+
+    if INDEX_TYPE == "ivf" and n >= 39 * nlist:
+        quantizer = faiss.IndexFlatIP(d)
+        index = faiss.IndexIVFFlat(quantizer, d, nlist, faiss.METRIC_INNER_PRODUCT)
+        index.train(vectors)
+        index.nprobe = IVF_NPROBE
+    elif INDEX_TYPE == "ivfpq" and n >= max(39 * nlist, 256) and d % 64 == 0:
+        # 64 sub-quantizers x 8 bits: ~24x smaller than float32 for 1536-d vectors
+        quantizer = faiss.IndexFlatIP(d)
+        index = faiss.IndexIVFPQ(quantizer, d, nlist, 64, 8, faiss.METRIC_INNER_PRODUCT)
+        index.train(vectors)
+        index.nprobe = IVF_NPROBE
+    elif INDEX_TYPE in ("sq8", "ivfpq"):
+        # 8-bit scalar quantization: 4x less memory bandwidth per search
+        index = faiss.IndexHNSWSQ(
+            d, faiss.ScalarQuantizer.QT_8bit, 32, faiss.METRIC_INNER_PRODUCT
+        )
+        index.train(vectors)
+        index.hnsw.efSearch = 64
+    elif INDEX_TYPE in ("hnsw", "ivf"):
+        # HNSW needs no training, so it also covers corpora too small for IVF
+        index = faiss.IndexHNSWFlat(d, 32, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = 200
+        index.hnsw.efSearch = 64
+    else:
+        index = faiss.IndexFlatIP(d)
+
+    index.add(vectors)
+    return index
 
 def create_vector_store(documents):
     """Create a vector store from documents using FAISS."""
@@ -40,23 +169,48 @@ def create_vector_store(documents):
     )
     chunks = text_splitter.split_documents(documents)
     
-    # Create embeddings and vector store with OpenAI
+    # Create embeddings with OpenAI, sending up to 1024 chunks per request
+    model = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
     embeddings = OpenAIEmbeddings(
-        model=os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
+        model=model,
+        chunk_size=1024,
+        request_timeout=30,
+        max_retries=6,
+        show_progress_bar=False,
+        http_client=get_http_client()
     )
-    vector_store = FAISS.from_documents(
-        documents=chunks,
-        embedding=embeddings
+    texts = [chunk.page_content for chunk in chunks]
+    metadatas = [chunk.metadata for chunk in chunks]
+    # Unchanged chunks are served from the on-disk cache
+    vectors = DiskEmbeddingCache().embed_documents(embeddings, model, texts)
+
+    docstore = InMemoryDocstore({
+        str(i): Document(page_content=text, metadata=metadata)
+        for i, (text, metadata) in enumerate(zip(texts, metadatas))
+    })
+    vector_store = FAISS(
+        embedding_function=embeddings,
+        index=build_faiss_index(vectors),
+        docstore=docstore,
+        index_to_docstore_id={i: str(i) for i in range(len(texts))},
+        normalize_L2=True,
+        distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT
     )
     return vector_store
 
+@st.cache_resource
+def get_llm(model: str) -> ChatOpenAI:
+    """Chat model shared by every session's QA chain (created once per model)."""
+    return ChatOpenAI(
+        model=model,
+        temperature=0,
+        http_client=get_http_client()
+    )
+
 def get_qa_chain(vector_store):
     """Create a QA chain for question answering with GPT-4."""
     # Use GPT-4 for high-quality legal analysis
-    llm = ChatOpenAI(
-        model=os.getenv("LLM_MODEL", "gpt-4"),
-        temperature=0
-    )
+    llm = get_llm(os.getenv("LLM_MODEL", "gpt-4"))
     
     # Create retriever
     retriever = vector_store.as_retriever(
@@ -132,8 +286,11 @@ def main():
                 })
         else:
             try:
-                # Get QA chain
-                qa_chain = get_qa_chain(st.session_state.vector_store)
+                # Get QA chain (rebuilt only when the vector store changes)
+                if st.session_state.get("qa_chain_for") is not st.session_state.vector_store:
+                    st.session_state.qa_chain = get_qa_chain(st.session_state.vector_store)
+                    st.session_state.qa_chain_for = st.session_state.vector_store
+                qa_chain = st.session_state.qa_chain
                 
                 # Get response
                 with st.spinner("Thinking..."):
@@ -141,12 +298,11 @@ def main():
                     answer = response["result"]
                     
                     # Add sources
-                    sources = []
-                    for doc in response["source_documents"]:
-                        if hasattr(doc, 'metadata') and 'source' in doc.metadata:
-                            source = doc.metadata['source']
-                            if source not in sources:
-                                sources.append(source)
+                    sources = list(dict.fromkeys(
+                        doc.metadata['source']
+                        for doc in response["source_documents"]
+                        if 'source' in getattr(doc, 'metadata', {})
+                    ))
                     
                     if sources:
                         answer += "\n\n**Sources:**\n"
@@ -41,7 +41,7 @@ echo ""
 
 # Install dependencies
 echo "📦 Installing dependencies..."
-pip3 install -r requirements.txt
+pip3 install -r requirements.txt && pip3 install -e .
 if [ $? -ne 0 ]; then
     echo "❌ Failed to install dependencies"
     exit 1
@@ -4,43 +4,61 @@ Mantra - Delaware Corporate Law AI Assistant
 A RAG-powered chatbot for Delaware corporate law research.
 """
 
+import importlib
+
 __version__ = "0.1.0"
 
-# Core components
-from .data_extractor import DelawareCaseLawExtractor
-from .indexer import DelawareCaseLawIndexer, LegalDocumentChunker
-from .query_classifier import QueryClassifier
-from .response_generator import LegalResponseGenerator
-
-# Configuration and utilities
-from .config import MantraSettings, get_settings, settings
-from .utils import format_sources, extract_case_name_from_url
-from .exceptions import (
-    MantraException,
-    IndexNotLoadedError,
-    EmbeddingGenerationError,
-    LLMGenerationError,
-    get_http_status_code
-)
-
-__all__ = [
+# Public names -> defining submodule. Submodules are imported on first
+# attribute access (PEP 562), so e.g. the extractors never pull in faiss.
+_LAZY_EXPORTS = {
     # Core components
-    "DelawareCaseLawExtractor",
-    "DelawareCaseLawIndexer",
-    "LegalDocumentChunker",
-    "QueryClassifier",
-    "LegalResponseGenerator",
+    "DelawareCaseLawExtractor": ".data_extractor",
+    "DelawareCaseLawIndexer": ".indexer",
+    "LegalDocumentChunker": ".indexer",
+    "QueryClassifier": ".query_classifier",
+    "LegalResponseGenerator": ".response_generator",
+    "SemanticCache": ".semantic_cache",
+    "ResponseCache": ".semantic_cache",
+    "EmbeddingCache": ".embedding_cache",
+    "MicroBatcher": ".batching",
+    "RelevanceGate": ".relevance_gate",
+    "Components": ".runtime",
+    "get_components": ".runtime",
+    "get_openai_client": ".clients",
+    "get_async_openai_client": ".clients",
+    "aclose_clients": ".clients",
     # Configuration
-    "MantraSettings",
-    "get_settings",
-    "settings",
+    "MantraSettings": ".config",
+    "get_settings": ".config",
+    "settings": ".config",
     # Utilities
-    "format_sources",
-    "extract_case_name_from_url",
+    "format_sources": ".utils",
+    "extract_case_name_from_url": ".utils",
+    "stream_cases": ".utils",
     # Exceptions
-    "MantraException",
-    "IndexNotLoadedError",
-    "EmbeddingGenerationError",
-    "LLMGenerationError",
-    "get_http_status_code",
-]
+    "MantraException": ".exceptions",
+    "IndexNotLoadedError": ".exceptions",
+    "EmbeddingGenerationError": ".exceptions",
+    "LLMGenerationError": ".exceptions",
+    "get_http_status_code": ".exceptions",
+}
+
+# Resolved on every access: config.settings follows reload_settings()
+_UNCACHED_EXPORTS = frozenset({"settings"})
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    if name not in _UNCACHED_EXPORTS:
+        globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
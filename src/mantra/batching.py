@@ -0,0 +1,162 @@
+"""
+Request coalescing for Mantra.
+Collects concurrent calls into batches so vectorized backends (FAISS, embeddings)
+are called once per batch instead of once per request.
+"""
+
+import asyncio
+import logging
+from typing import Any, Callable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent async submissions into batched calls of a sync function.
+
+    Items submitted within a short window are passed together to ``batch_fn``,
+    which runs in a worker thread and must return one result per item, in order.
+    Up to ``max_in_flight`` batches run at once, so one slow call does not hold
+    up the batches behind it.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Any]], List[Any]],
+        max_batch: int = 32,
+        max_wait: float = 0.01,
+        max_in_flight: int = 4
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            batch_fn: Function mapping a list of items to a list of results
+            max_batch: Maximum number of items per batch
+            max_wait: Seconds to wait for more items after the first one arrives
+            max_in_flight: Maximum number of batch_fn calls running concurrently
+        """
+        self.batch_fn = batch_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.max_in_flight = max_in_flight
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._in_flight: Set[asyncio.Task] = set()
+
+    def start(self):
+        """Start the background batching task (must be called inside a running loop)."""
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Stop the background batching task.
+
+        Submissions still queued or in flight fail with RuntimeError.
+        """
+        if self._worker is None:
+            return
+
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+
+        tasks = list(self._in_flight)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        # No await from here on, so nothing can be submitted behind the drain
+        self._worker = None
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            self._fail([future], RuntimeError("MicroBatcher stopped"))
+
+    async def submit(self, item: Any) -> Any:
+        """
+        Submit one item and wait for its result.
+
+        Args:
+            item: Item to process
+
+        Returns:
+            Result for this item from batch_fn
+        """
+        if self._worker is None:
+            raise RuntimeError("MicroBatcher not started. Call start() first.")
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    @staticmethod
+    def _fail(futures: List[asyncio.Future], error: BaseException):
+        for future in futures:
+            if not future.done():
+                future.set_exception(error)
+
+    async def _run(self):
+        """Pop items into batches and dispatch them until cancelled."""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            # Wait for a free slot first: meanwhile items queue up into a fuller batch
+            await self._slots.acquire()
+            try:
+                batch = [await self._queue.get()]
+            except asyncio.CancelledError:
+                self._slots.release()
+                raise
+            deadline = loop.time() + self.max_wait
+
+            # Keep collecting until the window closes or the batch is full
+            try:
+                while len(batch) < self.max_batch:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                self._slots.release()
+                self._fail([future for _, future in batch], RuntimeError("MicroBatcher stopped"))
+                raise
+
+            task = asyncio.create_task(self._dispatch(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _dispatch(self, batch: List[Tuple[Any, asyncio.Future]]):
+        """Run batch_fn on one batch and resolve its futures (releases a slot)."""
+        items = [item for item, _ in batch]
+        futures = [future for _, future in batch]
+
+        try:
+            results = await asyncio.to_thread(self.batch_fn, items)
+            if len(results) != len(items):
+                raise RuntimeError(
+                    f"batch_fn returned {len(results)} results for {len(items)} items"
+                )
+        except asyncio.CancelledError:
+            self._fail(futures, RuntimeError("MicroBatcher stopped"))
+            raise
+        except Exception as e:
+            logger.error(f"Batch of {len(items)} failed: {e}")
+            self._fail(futures, e)
+            return
+        finally:
+            self._slots.release()
+
+        for future, result in zip(futures, results):
+            if not future.done():
+                future.set_result(result)
@@ -10,21 +10,85 @@ AUTHENTICATION REQUIRED:
 - Limit: 500 cases per day for full text access
 """
 
-import requests
-import json
+import asyncio
 import os
-import time
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+import httpx
+import orjson
+
+from .http_utils import AsyncRateLimiter, create_async_client, get_with_retries
+from .utils import calculate_word_count, date_to_int
+
 logger = logging.getLogger(__name__)
 
+# Root logging for the command-line entry point
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+
+@dataclass
+class CAPCaseMetadata:
+    """Reporter metadata for a CAP case."""
+
+    __slots__ = ('jurisdiction', 'citations', 'volume', 'reporter', 'first_page', 'last_page')
+
+    jurisdiction: str
+    citations: List[Dict]
+    volume: str
+    reporter: str
+    first_page: str
+    last_page: str
+
+    def to_dict(self) -> Dict:
+        """Convert to a plain dictionary."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+@dataclass
+class CAPCase:
+    """
+    A processed CAP case.
+
+    Uses __slots__ (no per-instance __dict__) to keep tens of thousands of
+    cases compact in memory; serialized with to_dict() in the same schema as
+    the other extractors.
+    """
+
+    __slots__ = (
+        'id', 'case_name', 'case_name_full', 'docket_number', 'date_filed', 'date_filed_int',
+        'court', 'plain_text', 'html', 'absolute_url', 'frontend_url', 'citation_count',
+        'author_str', 'source', 'metadata', 'text_length', 'word_count'
+    )
+
+    id: Optional[int]
+    case_name: str
+    case_name_full: str
+    docket_number: str
+    date_filed: str
+    date_filed_int: int
+    court: str
+    plain_text: str
+    html: str
+    absolute_url: str
+    frontend_url: str
+    citation_count: int
+    author_str: str
+    source: str
+    metadata: CAPCaseMetadata
+    text_length: int
+    word_count: int
+
+    def to_dict(self) -> Dict:
+        """Convert to the case dictionary format consumed by the indexer."""
+        case = {name: getattr(self, name) for name in self.__slots__}
+        case['metadata'] = self.metadata.to_dict()
+        return case
+
 
 class CAPDelawareExtractor:
     """
@@ -32,17 +96,32 @@ class CAPDelawareExtractor:
     API from Harvard Law School - requires free registration for API token.
     """
 
-    def __init__(self, api_token: Optional[str] = None, output_dir: str = "./data/cases"):
+    # Concurrency and rate limits for API pulls
+    MAX_CONCURRENT_REQUESTS = 5
+    REQUESTS_PER_SECOND = 5
+
+    def __init__(
+        self,
+        api_token: Optional[str] = None,
+        output_dir: str = "./data/cases",
+        min_words: Optional[int] = None
+    ):
         """
         Initialize the extractor.
 
         Args:
             api_token: CAP API token (or set CAP_API_TOKEN env variable)
             output_dir: Directory to save extracted cases
+            min_words: Cases with fewer words are not kept (default: MANTRA_MIN_WORDS
+                env variable, or 200)
         """
         self.base_url = "https://api.case.law/v1"
         self.output_dir = output_dir
 
+        if min_words is None:
+            min_words = int(os.environ.get('MANTRA_MIN_WORDS', '200'))
+        self.min_words = min_words
+
         # Get API token from parameter or environment
         self.api_token = api_token or os.environ.get('CAP_API_TOKEN')
 
@@ -62,14 +141,18 @@ class CAPDelawareExtractor:
         # Create output directory
         os.makedirs(output_dir, exist_ok=True)
 
-    def fetch_cases(self,
+    async def fetch_cases(self,
                    jurisdiction: str = "del",
                    start_year: int = 2005,
                    end_year: int = 2020,
-                   max_cases: Optional[int] = None) -> List[Dict]:
+                   max_cases: Optional[int] = None) -> List[CAPCase]:
         """
         Fetch all Delaware cases from CAP API.
 
+        CAP paginates with opaque cursors, so each year is paged through on its
+        own and years are fetched concurrently (MAX_CONCURRENT_REQUESTS at a
+        time, at most REQUESTS_PER_SECOND overall).
+
         Args:
             jurisdiction: Jurisdiction code (del for Delaware)
             start_year: Starting year
@@ -77,78 +160,139 @@ class CAPDelawareExtractor:
             max_cases: Maximum number of cases to fetch
 
         Returns:
-            List of case dictionaries
+            List of processed cases, most recent first
         """
         logger.info(f"Fetching Delaware cases from {start_year} to {end_year}")
         logger.info("Using Caselaw Access Project API (Harvard Law School)")
 
-        all_cases = []
         url = f"{self.base_url}/cases/"
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+        limiter = AsyncRateLimiter(rate=self.REQUESTS_PER_SECOND, period=1)
+        state = {"total": 0, "stop": False}
 
-        # CAP API parameters
-        params = {
-            'jurisdiction': jurisdiction,
-            'decision_date_min': f'{start_year}-01-01',
-            'decision_date_max': f'{end_year}-12-31',
-            'page_size': 100,  # Max allowed by CAP
-            'ordering': '-decision_date',  # Most recent first
-            'full_case': 'true'  # Get full case text
-        }
+        async def get_page(client: httpx.AsyncClient, page_url: str, params: Optional[Dict]):
+            async with semaphore, limiter:
+                response = await get_with_retries(client, page_url, params)
 
-        page = 1
-        while url:
+            # Check for authentication errors
+            if response.status_code == 401:
+                logger.error("Authentication failed. Check your API token.")
+                logger.error("Get your token at: https://case.law/")
+                state["stop"] = True
+                return None
+
+            response.raise_for_status()
+
+            # Try to parse JSON
             try:
-                logger.info(f"Fetching page {page}...")
-                response = requests.get(url, params=params, headers=self.headers, timeout=30)
+                return orjson.loads(response.content)
+            except orjson.JSONDecodeError as e:
+                logger.error("Failed to parse JSON response: %s", e)
+                logger.error("Response status: %d", response.status_code)
+                logger.error("Response content (first 500 chars): %s", response.text[:500])
+                return None
+
+        async def fetch_year(client: httpx.AsyncClient, year: int) -> List[CAPCase]:
+            year_cases = []
+            page_url = url
+
+            # CAP API parameters
+            params = {
+                'jurisdiction': jurisdiction,
+                'decision_date_min': f'{year}-01-01',
+                'decision_date_max': f'{year}-12-31',
+                'page_size': 100,  # Max allowed by CAP
+                'ordering': '-decision_date',  # Most recent first
+                'full_case': 'true'  # Get full case text
+            }
 
-                # Check for authentication errors
-                if response.status_code == 401:
-                    logger.error("Authentication failed. Check your API token.")
-                    logger.error("Get your token at: https://case.law/")
-                    break
+            def collect(processed: List[CAPCase], n_fetched: int):
+                year_cases.extend(processed)
+                state["total"] += len(processed)
 
-                response.raise_for_status()
+                logger.info("Fetched %d %d cases (Total: %d)", len(processed), year, state['total'])
+                if len(processed) < n_fetched:
+                    logger.info(
+                        "Dropped %d cases under %d words", n_fetched - len(processed), self.min_words
+                    )
 
-                # Try to parse JSON
-                try:
-                    data = response.json()
-                except json.JSONDecodeError as e:
-                    logger.error(f"Failed to parse JSON response: {e}")
-                    logger.error(f"Response status: {response.status_code}")
-                    logger.error(f"Response content (first 500 chars): {response.text[:500]}")
+            # Processing of the previous page runs in a worker thread while the
+            # next page is fetched
+            pending = None
+
+            page = 1
+            while page_url and not state["stop"]:
+                # Stop requesting once enough cases have been collected
+                if max_cases and state["total"] >= max_cases:
                     break
-                page_cases = data.get('results', [])
 
-                logger.info(f"Fetched {len(page_cases)} cases (Total: {len(all_cases)})")
+                try:
+                    logger.info("Fetching %d page %d...", year, page)
+                    data = await get_page(client, page_url, params)
+                except httpx.HTTPError as e:
+                    logger.error("Error fetching %d cases: %s", year, e)
+                    break
 
-                # Process each case
-                for case in page_cases:
-                    processed_case = self.process_case(case)
-                    if processed_case:
-                        all_cases.append(processed_case)
+                if pending is not None:
+                    collect(*await pending)
+                    pending = None
 
-                # Check limits
-                if max_cases and len(all_cases) >= max_cases:
-                    all_cases = all_cases[:max_cases]
-                    logger.info(f"Reached max_cases limit: {max_cases}")
+                if data is None:
                     break
 
+                pending = loop.run_in_executor(pool, self._process_page, data.get('results', []))
+                if max_cases:
+                    # The limit check needs this page's count before the next request
+                    collect(*await pending)
+                    pending = None
+
                 # Get next page
-                url = data.get('next')
+                page_url = data.get('next')
                 params = None  # Next URL has all params
                 page += 1
 
-                # Rate limiting - be respectful
-                time.sleep(1)
+            if pending is not None:
+                collect(*await pending)
+
+            return year_cases
+
+        # Most recent years first, so they are requested first
+        years = range(end_year, start_year - 1, -1)
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            async with create_async_client(
+                headers=self.headers, timeout=30, max_connections=self.MAX_CONCURRENT_REQUESTS
+            ) as client:
+                per_year = await asyncio.gather(*[fetch_year(client, year) for year in years])
+
+        all_cases = [case for year_cases in per_year for case in year_cases]
 
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Error fetching cases: {e}")
-                break
+        # Check limits
+        if max_cases and len(all_cases) > max_cases:
+            all_cases = all_cases[:max_cases]
+            logger.info(f"Reached max_cases limit: {max_cases}")
 
         logger.info(f"Total cases fetched: {len(all_cases)}")
         return all_cases
 
-    def process_case(self, case: Dict) -> Optional[Dict]:
+    def _process_page(self, page_cases: List[Dict]) -> Tuple[List[CAPCase], int]:
+        """
+        Process one API page, dropping stubs (orders, one-line dispositions).
+
+        Args:
+            page_cases: Raw cases from one CAP results page
+
+        Returns:
+            Tuple of (kept cases, number of raw cases on the page)
+        """
+        processed = []
+        for case in page_cases:
+            processed_case = self.process_case(case)
+            if processed_case and processed_case.word_count >= self.min_words:
+                processed.append(processed_case)
+        return processed, len(page_cases)
+
+    def process_case(self, case: Dict) -> Optional[CAPCase]:
         """
         Process and extract relevant fields from a CAP case.
 
@@ -156,7 +300,7 @@ class CAPDelawareExtractor:
             case: Raw case data from CAP API
 
         Returns:
-            Processed case dictionary
+            Processed case
         """
         try:
             # Extract case text
@@ -166,14 +310,16 @@ class CAPDelawareExtractor:
 
             # For full_case=true, CAP returns structured text
             # Extract opinions text
-            opinions_text = ""
+            # Collect parts and join once (repeated += is quadratic)
+            parts = []
             if isinstance(case_text, dict):
                 opinions = case_text.get('opinions', [])
                 for opinion in opinions:
                     if isinstance(opinion, dict):
                         text = opinion.get('text', '')
                         if text:
-                            opinions_text += text + "\n\n"
+                            parts.append(text)
+            opinions_text = "\n\n".join(parts)
 
             # If no structured text, try plain text
             if not opinions_text:
@@ -184,61 +330,64 @@ class CAPDelawareExtractor:
             court_name = court_info.get('name', 'Unknown Court')
 
             # Create processed case
-            processed = {
-                'id': case.get('id'),
-                'case_name': case.get('name', 'Unknown Case'),
-                'case_name_full': case.get('name_abbreviation', ''),
-                'docket_number': case.get('docket_number', ''),
-                'date_filed': case.get('decision_date', ''),
-                'court': court_name,
-                'plain_text': opinions_text,
-                'html': '',
-                'absolute_url': case.get('url', ''),
-                'frontend_url': case.get('frontend_url', ''),
-                'citation_count': len(case.get('citations', [])),
-                'author_str': '',
-                'source': 'cap',
-                'metadata': {
-                    'jurisdiction': case.get('jurisdiction', {}).get('name', ''),
-                    'citations': case.get('citations', []),
-                    'volume': case.get('volume', {}).get('volume_number', ''),
-                    'reporter': case.get('reporter', {}).get('full_name', ''),
-                    'first_page': case.get('first_page', ''),
-                    'last_page': case.get('last_page', ''),
-                }
-            }
-
-            # Calculate text statistics
-            processed['text_length'] = len(opinions_text)
-            processed['word_count'] = len(opinions_text.split()) if opinions_text else 0
+            processed = CAPCase(
+                id=case.get('id'),
+                case_name=case.get('name', 'Unknown Case'),
+                case_name_full=case.get('name_abbreviation', ''),
+                docket_number=case.get('docket_number', ''),
+                date_filed=case.get('decision_date', ''),
+                date_filed_int=date_to_int(case.get('decision_date')),
+                court=court_name,
+                plain_text=opinions_text,
+                html='',
+                absolute_url=case.get('url', ''),
+                frontend_url=case.get('frontend_url', ''),
+                citation_count=len(case.get('citations', [])),
+                author_str='',
+                source='cap',
+                metadata=CAPCaseMetadata(
+                    jurisdiction=case.get('jurisdiction', {}).get('name', ''),
+                    citations=case.get('citations', []),
+                    volume=case.get('volume', {}).get('volume_number', ''),
+                    reporter=case.get('reporter', {}).get('full_name', ''),
+                    first_page=case.get('first_page', ''),
+                    last_page=case.get('last_page', ''),
+                ),
+                # Calculate text statistics
+                text_length=len(opinions_text),
+                word_count=calculate_word_count(opinions_text)
+            )
 
             return processed
 
         except Exception as e:
-            logger.error(f"Error processing case: {e}")
+            logger.error("Error processing case %s: %s", case.get('id'), e)
             return None
 
-    def save_to_json(self, cases: List[Dict], filename: str = "delaware_cases.json"):
+    def save_to_json(self, cases: List[CAPCase], filename: str = "delaware_cases.json"):
         """
-        Save cases to JSON file.
+        Save cases as line-delimited JSON (one case per line).
 
         Args:
-            cases: List of case dictionaries
+            cases: List of processed cases
             filename: Output filename
         """
         filepath = os.path.join(self.output_dir, filename)
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(cases, f, indent=2, ensure_ascii=False)
+        with open(filepath, 'wb') as f:
+            for case in cases:
+                # orjson serializes (slotted) dataclasses natively
+                f.write(orjson.dumps(case))
+                f.write(b'\n')
 
         logger.info(f"Saved {len(cases)} cases to {filepath}")
 
-    def generate_summary_stats(self, cases: List[Dict]) -> Dict:
+    def generate_summary_stats(self, cases: List[CAPCase]) -> Dict:
         """
         Generate summary statistics.
 
         Args:
-            cases: List of case dictionaries
+            cases: List of processed cases
 
         Returns:
             Statistics dictionary
@@ -246,26 +395,46 @@ class CAPDelawareExtractor:
         if not cases:
             return {}
 
-        valid_dates = [c.get('date_filed', '') for c in cases if c.get('date_filed')]
+        # Single pass over the cases for every accumulator
+        total_words = 0
+        cases_with_citations = 0
+        total_citations = 0
+        earliest = latest = None
+        courts = {}
+
+        for case in cases:
+            total_words += case.word_count
+
+            citation_count = case.citation_count
+            total_citations += citation_count
+            if citation_count > 0:
+                cases_with_citations += 1
+
+            # Compare integer dates; report the original strings
+            date_int = case.date_filed_int
+            if date_int:
+                if earliest is None or date_int < earliest[0]:
+                    earliest = (date_int, case.date_filed)
+                if latest is None or date_int > latest[0]:
+                    latest = (date_int, case.date_filed)
+
+            # Count by court
+            court = case.court or 'Unknown'
+            courts[court] = courts.get(court, 0) + 1
 
         stats = {
             'total_cases': len(cases),
             'date_range': {
-                'earliest': min(valid_dates) if valid_dates else 'N/A',
-                'latest': max(valid_dates) if valid_dates else 'N/A'
+                'earliest': earliest[1] if earliest else 'N/A',
+                'latest': latest[1] if latest else 'N/A'
             },
-            'total_words': sum(c.get('word_count', 0) for c in cases),
-            'avg_words_per_case': sum(c.get('word_count', 0) for c in cases) / len(cases) if cases else 0,
-            'cases_with_citations': sum(1 for c in cases if c.get('citation_count', 0) > 0),
-            'total_citations': sum(c.get('citation_count', 0) for c in cases),
-            'courts': {}
+            'total_words': total_words,
+            'avg_words_per_case': total_words / len(cases),
+            'cases_with_citations': cases_with_citations,
+            'total_citations': total_citations,
+            'courts': courts
         }
 
-        # Count by court
-        for case in cases:
-            court = case.get('court', 'Unknown')
-            stats['courts'][court] = stats['courts'].get(court, 0) + 1
-
         return stats
 
     def run(self, start_year: int = 2005, end_year: int = 2020, max_cases: Optional[int] = None):
@@ -285,12 +454,12 @@ class CAPDelawareExtractor:
         logger.info("=" * 80)
 
         # Fetch cases
-        cases = self.fetch_cases(
+        cases = asyncio.run(self.fetch_cases(
             jurisdiction='del',
             start_year=start_year,
             end_year=min(end_year, 2020),  # CAP only has through 2020
             max_cases=max_cases
-        )
+        ))
 
         if not cases:
             logger.warning("No cases fetched. Exiting.")
@@ -302,8 +471,8 @@ class CAPDelawareExtractor:
         # Generate statistics
         stats = self.generate_summary_stats(cases)
         stats_file = os.path.join(self.output_dir, "summary_stats.json")
-        with open(stats_file, 'w', encoding='utf-8') as f:
-            json.dump(stats, f, indent=2)
+        with open(stats_file, 'wb') as f:
+            f.write(orjson.dumps(stats, option=orjson.OPT_INDENT_2))
 
         logger.info("=" * 80)
         logger.info("EXTRACTION COMPLETE")
@@ -324,6 +493,15 @@ def main():
     """
     Main function to run the extractor.
     """
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+
+    # This module's per-page/per-case records are skipped entirely below
+    # this level (MANTRA_LOG_LEVEL, or -v for INFO)
+    if '-v' in sys.argv[1:] or '--verbose' in sys.argv[1:]:
+        logger.setLevel(logging.INFO)
+    else:
+        logger.setLevel(os.environ.get('MANTRA_LOG_LEVEL', 'WARNING').upper())
+
     extractor = CAPDelawareExtractor(output_dir="./data/cases")
 
     # Run extraction for 2005-2020
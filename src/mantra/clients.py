@@ -0,0 +1,201 @@
+"""
+Shared OpenAI clients for Mantra.
+One pooled, keep-alive HTTP client per process so components reuse TCP/TLS
+connections (and HTTP/2 multiplexing when available) instead of each
+opening their own. Transient API failures are retried by the SDK with
+exponential backoff; CircuitBreaker fails fast while the API stays down.
+"""
+
+import os
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+import httpx
+import openai
+from openai import AsyncOpenAI, OpenAI
+from dotenv import load_dotenv
+
+from .exceptions import LLMUnavailableError
+from .http_utils import http2_available
+
+logger = logging.getLogger(__name__)
+
+# Connection pool limits shared by the sync and async clients
+POOL_LIMITS = httpx.Limits(max_connections=200, max_keepalive_connections=100)
+TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+# SDK retries (exponential backoff, honours Retry-After) for 408/409/429/5xx
+# responses and connection errors
+MAX_RETRIES = 2
+
+# Failures that mean the API is degraded rather than the request being bad
+TRANSIENT_ERRORS = (
+    openai.APIConnectionError,  # Includes APITimeoutError
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+_lock = threading.Lock()
+_client: Optional[OpenAI] = None
+_async_client: Optional[AsyncOpenAI] = None
+_dotenv_loaded = False
+
+
+def _load_dotenv():
+    """Load .env into the environment once, on first client creation (call under _lock)."""
+    global _dotenv_loaded
+    if not _dotenv_loaded:
+        load_dotenv()
+        _dotenv_loaded = True
+
+
+def get_openai_client() -> OpenAI:
+    """
+    Get the process-wide synchronous OpenAI client.
+
+    Returns:
+        OpenAI client backed by a pooled httpx.Client
+    """
+    global _client
+    with _lock:
+        if _client is None:
+            _load_dotenv()
+            http_client = httpx.Client(
+                http2=http2_available(), limits=POOL_LIMITS, timeout=TIMEOUT
+            )
+            _client = OpenAI(
+                api_key=os.getenv("OPENAI_API_KEY"),
+                http_client=http_client,
+                timeout=TIMEOUT,
+                max_retries=MAX_RETRIES
+            )
+            logger.info("Created shared OpenAI client")
+        return _client
+
+
+def get_async_openai_client() -> AsyncOpenAI:
+    """
+    Get the process-wide asynchronous OpenAI client.
+
+    Returns:
+        AsyncOpenAI client backed by a pooled httpx.AsyncClient
+    """
+    global _async_client
+    with _lock:
+        if _async_client is None:
+            _load_dotenv()
+            http_client = httpx.AsyncClient(
+                http2=http2_available(), limits=POOL_LIMITS, timeout=TIMEOUT
+            )
+            _async_client = AsyncOpenAI(
+                api_key=os.getenv("OPENAI_API_KEY"),
+                http_client=http_client,
+                timeout=TIMEOUT,
+                max_retries=MAX_RETRIES
+            )
+            logger.info("Created shared async OpenAI client")
+        return _async_client
+
+
+async def aclose_clients():
+    """Close the shared clients (call on application shutdown)."""
+    global _client, _async_client
+    with _lock:
+        client, async_client = _client, _async_client
+        _client = _async_client = None
+
+    if client is not None:
+        client.close()
+    if async_client is not None:
+        await async_client.close()
+
+
+class CircuitBreaker:
+    """
+    Fail fast after repeated transient API failures.
+
+    Wrap each API call in ``with breaker.call():``. After failure_threshold
+    consecutive transient failures (each already retried by the SDK), calls
+    raise LLMUnavailableError without touching the network for reset_timeout
+    seconds. Then exactly one trial call is let through (half-open) while
+    the others keep failing fast; its success closes the circuit, its
+    failure opens it for another reset_timeout. Thread-safe, and usable
+    around awaits and yields in async code and generators.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Create a closed circuit.
+
+        Args:
+            failure_threshold: Consecutive transient failures that open the circuit
+            reset_timeout: Seconds to fail fast before allowing a trial call
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        """Whether a call made now would be short-circuited."""
+        with self._lock:
+            return self._failures >= self.failure_threshold and (
+                self._trial_in_flight
+                or time.monotonic() - self._opened_at < self.reset_timeout
+            )
+
+    @contextmanager
+    def call(self) -> Iterator[None]:
+        """
+        Guard one API call (including iterating its stream).
+
+        Raises:
+            LLMUnavailableError: If the circuit is open
+        """
+        with self._lock:
+            trial = self._failures >= self.failure_threshold
+            if trial and (
+                self._trial_in_flight
+                or time.monotonic() - self._opened_at < self.reset_timeout
+            ):
+                raise LLMUnavailableError(retry_after=self.reset_timeout)
+            if trial:
+                self._trial_in_flight = True
+
+        try:
+            yield
+        except TRANSIENT_ERRORS:
+            self._record(failed=True, trial=trial)
+            raise
+        except BaseException:
+            # Says nothing about the API's health (bad request, caller gone)
+            if trial:
+                with self._lock:
+                    self._trial_in_flight = False
+            raise
+        else:
+            self._record(failed=False, trial=trial)
+
+    def _record(self, failed: bool, trial: bool):
+        with self._lock:
+            if trial:
+                self._trial_in_flight = False
+            if not failed:
+                if self._failures >= self.failure_threshold:
+                    logger.info("OpenAI API recovered, closing circuit")
+                self._failures = 0
+                return
+
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                if self._failures == self.failure_threshold or trial:
+                    logger.warning(
+                        f"OpenAI API failing, short-circuiting calls for {self.reset_timeout:.0f}s"
+                    )
+                self._opened_at = time.monotonic()
@@ -3,9 +3,10 @@ Configuration management for Mantra using Pydantic Settings.
 Centralizes all environment variables with validation and type checking.
 """
 
+from functools import lru_cache
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import Field, field_validator
-from typing import Optional
+from pydantic import AliasChoices, Field, field_validator
+from typing import ClassVar, Optional, Set
 from pathlib import Path
 
 
@@ -14,15 +15,22 @@ class MantraSettings(BaseSettings):
     Centralized configuration for Mantra application.
 
     All settings can be configured via environment variables or .env file.
+    Instances are immutable; use reload_settings() to pick up changes.
     """
 
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
         case_sensitive=False,
-        extra="ignore"
+        extra="ignore",
+        frozen=True,
+        # Build the validator on first instantiation instead of at import
+        defer_build=True
     )
 
+    # Directories already created by ensure_path_exists in this process
+    _ensured_paths: ClassVar[Set[Path]] = set()
+
     # OpenAI Configuration
     openai_api_key: str = Field(
         ...,
@@ -39,12 +47,70 @@ class MantraSettings(BaseSettings):
         description="OpenAI LLM model for response generation"
     )
 
+    classifier_model: str = Field(
+        default="gpt-4o-mini",
+        validation_alias=AliasChoices("classifier_model", "mantra_classifier_model"),
+        description="OpenAI model deciding ambiguous query relevance (small and fast is enough)"
+    )
+
     # FAISS Index Configuration
     faiss_index_path: Path = Field(
         default=Path("./faiss_index"),
         description="Path to FAISS index directory"
     )
 
+    faiss_index_type: str = Field(
+        default="flat",
+        description="FAISS index built by the indexer: flat, fp16 (half precision), sq8 (8-bit), ivfpq or hnsw"
+    )
+
+    faiss_nprobe: int = Field(
+        default=16,
+        ge=1,
+        description="IVF lists probed per query (ivfpq indexes only)"
+    )
+
+    faiss_ef_search: int = Field(
+        default=64,
+        ge=1,
+        description="HNSW search beam width; higher trades speed for recall (hnsw indexes only)"
+    )
+
+    faiss_mmap: bool = Field(
+        default=True,
+        validation_alias=AliasChoices("faiss_mmap", "mantra_mmap"),
+        description="Memory-map the FAISS index read-only (shared across worker processes; disable on NFS)"
+    )
+
+    faiss_prefetch: bool = Field(
+        default=True,
+        description="Read a memory-mapped index into the page cache ahead of the first search"
+    )
+
+    use_gpu: bool = Field(
+        default=False,
+        description="Serve FAISS searches from a GPU (requires a GPU build of FAISS)"
+    )
+
+    gpu_device: int = Field(
+        default=0,
+        ge=0,
+        description="CUDA device used when use_gpu is enabled"
+    )
+
+    # Index Build Configuration
+    chunk_workers: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Processes used to chunk cases during index builds (1 = in-process; default: CPU count - 1)"
+    )
+
+    embed_concurrency: int = Field(
+        default=8,
+        ge=1,
+        description="Embedding API requests kept in flight during index builds"
+    )
+
     # Data Configuration
     data_dir: Path = Field(
         default=Path("./data/cases"),
@@ -82,6 +148,13 @@ class MantraSettings(BaseSettings):
         description="Minimum similarity score for automatic answers"
     )
 
+    mmr_lambda: Optional[float] = Field(
+        default=None,
+        ge=0.0,
+        le=1.0,
+        description="Relevance/diversity trade-off for MMR reranking (unset = plain top-k)"
+    )
+
     chunk_size: int = Field(
         default=1000,
         ge=100,
@@ -96,6 +169,86 @@ class MantraSettings(BaseSettings):
         description="Overlap between document chunks"
     )
 
+    max_context_tokens: int = Field(
+        default=6000,
+        ge=500,
+        description="Token budget for retrieved excerpts in the generation prompt"
+    )
+
+    search_batch_size: int = Field(
+        default=32,
+        ge=1,
+        description="Maximum number of concurrent queries coalesced into one embedding call or FAISS search"
+    )
+
+    search_batch_wait_ms: float = Field(
+        default=10.0,
+        ge=0.0,
+        description="Milliseconds to wait for concurrent queries before searching"
+    )
+
+    # Relevance Gate Configuration
+    relevance_gate_enabled: bool = Field(
+        default=True,
+        description="Decide clear-cut query relevance by similarity to prototype phrases"
+    )
+
+    relevance_gate_relevant_threshold: float = Field(
+        default=0.75,
+        ge=0.0,
+        le=1.0,
+        description="Prototype similarity above which the gate decides without the LLM"
+    )
+
+    relevance_gate_irrelevant_threshold: float = Field(
+        default=0.35,
+        ge=0.0,
+        le=1.0,
+        description="Legal-prototype similarity below which queries are rejected"
+    )
+
+    # Query Cache Configuration
+    semantic_cache_enabled: bool = Field(
+        default=True,
+        description="Serve repeated or near-identical queries from the query cache"
+    )
+
+    semantic_cache_threshold: float = Field(
+        default=0.95,
+        ge=0.0,
+        le=1.0,
+        description="Minimum cosine similarity between queries for a cache hit"
+    )
+
+    semantic_cache_size: int = Field(
+        default=1024,
+        ge=1,
+        description="Maximum number of cached responses"
+    )
+
+    semantic_cache_ttl: Optional[float] = Field(
+        default=3600.0,
+        gt=0,
+        description="Seconds a cached query response stays valid (None for no expiry)"
+    )
+
+    response_cache_enabled: bool = Field(
+        default=True,
+        description="Reuse generated answers for the same question and retrieved cases"
+    )
+
+    response_cache_size: int = Field(
+        default=1024,
+        ge=1,
+        description="Maximum number of cached generated answers"
+    )
+
+    response_cache_ttl: float = Field(
+        default=3600.0,
+        gt=0,
+        description="Seconds a cached generated answer stays valid"
+    )
+
     # Server Configuration
     api_host: str = Field(
         default="0.0.0.0",
@@ -109,6 +262,11 @@ class MantraSettings(BaseSettings):
         description="FastAPI server port"
     )
 
+    api_docs_enabled: bool = Field(
+        default=True,
+        description="Serve the OpenAPI schema and docs (disable in production)"
+    )
+
     # Logging Configuration
     log_level: str = Field(
         default="INFO",
@@ -120,9 +278,22 @@ class MantraSettings(BaseSettings):
     def ensure_path_exists(cls, v: Path) -> Path:
         """Ensure directory paths exist or can be created."""
         v = Path(v)
-        v.mkdir(parents=True, exist_ok=True)
+        key = v.absolute()  # Relative paths move with the working directory
+        if key not in cls._ensured_paths:
+            v.mkdir(parents=True, exist_ok=True)
+            cls._ensured_paths.add(key)
         return v
 
+    @field_validator("faiss_index_type")
+    @classmethod
+    def validate_faiss_index_type(cls, v: str) -> str:
+        """Validate FAISS index type is supported."""
+        valid_types = ["flat", "fp16", "sq8", "ivfpq", "hnsw"]
+        v_lower = v.lower()
+        if v_lower not in valid_types:
+            raise ValueError(f"faiss_index_type must be one of {valid_types}")
+        return v_lower
+
     @field_validator("log_level")
     @classmethod
     def validate_log_level(cls, v: str) -> str:
@@ -138,6 +309,34 @@ class MantraSettings(BaseSettings):
         """Get full path to data file."""
         return self.data_dir / self.data_file
 
+    @property
+    def query_cache_path(self) -> Path:
+        """Get directory for the persisted query cache."""
+        return self.faiss_index_path / "query_cache"
+
+    @property
+    def query_cache_db_path(self) -> Path:
+        """Get the SQLite store shared by every process's query cache."""
+        return self.query_cache_path / "query_cache.sqlite3"
+
+    @classmethod
+    def from_dict_unchecked(cls, data: dict) -> "MantraSettings":
+        """
+        Build settings from trusted values without validation.
+
+        Skips the environment, .env file and all field validators, so callers
+        must pass already-normalized values (existing directories as Paths,
+        upper-case log_level, lower-case faiss_index_type). Unset fields take
+        their defaults. Intended for tests that create many instances.
+
+        Args:
+            data: Field values keyed by field name
+
+        Returns:
+            MantraSettings instance
+        """
+        return cls.model_construct(**data)
+
     def __repr__(self) -> str:
         """String representation (hiding sensitive data)."""
         return (
@@ -149,22 +348,16 @@ class MantraSettings(BaseSettings):
         )
 
 
-# Global settings instance
-_settings: Optional[MantraSettings] = None
-
-
+@lru_cache(maxsize=1)
 def get_settings() -> MantraSettings:
     """
     Get the global settings instance.
-    Creates it if it doesn't exist (lazy initialization).
+    Creates it on first call (lazy initialization).
 
     Returns:
         MantraSettings instance
     """
-    global _settings
-    if _settings is None:
-        _settings = MantraSettings()
-    return _settings
+    return MantraSettings()
 
 
 def reload_settings() -> MantraSettings:
@@ -175,10 +368,13 @@ def reload_settings() -> MantraSettings:
     Returns:
         New MantraSettings instance
     """
-    global _settings
-    _settings = MantraSettings()
-    return _settings
+    get_settings.cache_clear()
+    return get_settings()
 
 
-# Convenience accessor
-settings = get_settings()
+def __getattr__(name: str):
+    # Convenience accessor: ``config.settings`` is resolved on first use so
+    # importing this module doesn't read .env or require the API key
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,18 +1,109 @@
-import requests
-import json
+import asyncio
+import hashlib
+import io
 import os
+import sys
+import tarfile
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from pathlib import Path
 from typing import List, Dict, Optional
 import logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+import httpx
+import orjson
+
+from .http_utils import AsyncRateLimiter, create_async_client, get_with_retries
+from .utils import calculate_word_count
+
 logger = logging.getLogger(__name__)
 
+# Root logging for the command-line entry point
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+COURTLISTENER_API_URL = "https://www.courtlistener.com/api/rest"
+
+# Opinion fields kept by process_opinion, with their defaults
+_OPINION_FIELDS = (
+    ("id", None),
+    ("case_name", "Unknown Case"),
+    ("case_name_full", ""),
+    ("date_filed", None),
+    ("court", ""),
+    ("plain_text", ""),
+    ("html", ""),
+    ("absolute_url", ""),
+    ("citation_count", 0),
+    ("author_str", ""),
+    ("type", ""),
+    ("download_url", ""),
+    ("local_path", ""),
+    ("extracted_by_ocr", False),
+)
+
+# Fields nested under "metadata" (defaults must be literals; see below)
+_OPINION_METADATA_FIELDS = (
+    ("cluster", ""),
+    ("per_curiam", False),
+    ("joined_by", []),
+)
+
+
+def _compile_opinion_processor():
+    """
+    Generate the in-place opinion projection as straight-line code.
+
+    The field list is fixed, so the function is built once from source: one
+    ``setdefault`` per kept field with interned literal keys, the metadata
+    fields popped into a nested dict, and every other field dropped. The raw
+    dict is reused rather than copied. Defaults are written as literals, so
+    mutable ones (``[]``) are fresh for every opinion.
+
+    Returns:
+        Function turning a raw opinion dict into a processed one (in place)
+    """
+    def calls(method, fields, indent):
+        return "".join(
+            f"{indent}{method}({sys.intern(field)!r}, {default!r})\n"
+            for field, default in fields
+        )
+
+    source = (
+        "def _process_opinion_fast(opinion):\n"
+        "    setdefault = opinion.setdefault\n"
+        f"{calls('setdefault', _OPINION_FIELDS, '    ')}"
+        "    pop = opinion.pop\n"
+        "    metadata = {\n"
+        + "".join(
+            f"        {field!r}: pop({field!r}, {default!r}),\n"
+            for field, default in _OPINION_METADATA_FIELDS
+        )
+        + "    }\n"
+        "    for key in opinion.keys() - kept_fields:\n"
+        "        del opinion[key]\n"
+        "    opinion['metadata'] = metadata\n"
+        "    text = opinion['plain_text']\n"
+        "    opinion['text_length'] = len(text)\n"
+        "    opinion['word_count'] = calculate_word_count(text)\n"
+        "    return opinion\n"
+    )
+    namespace = {
+        "calculate_word_count": calculate_word_count,
+        "kept_fields": frozenset(field for field, _ in _OPINION_FIELDS),
+    }
+    exec(compile(source, f"<{__name__}.process_opinion>", "exec"), namespace)
+    return namespace["_process_opinion_fast"]
+
+
+_process_opinion_fast = _compile_opinion_processor()
+
+# (court_ids key, log label, substrings that must all appear in the court name)
+_COURT_PATTERNS = (
+    ("supreme", "Delaware Supreme Court", ("supreme court of delaware",)),
+    ("chancery", "Delaware Court of Chancery", ("court of chancery", "delaware")),
+)
+
 
 class DelawareCaseLawExtractor:
     """
@@ -20,18 +111,61 @@ class DelawareCaseLawExtractor:
     Focuses on key corporate governance topics.
     """
 
-    def __init__(self, api_token: Optional[str] = None, output_dir: str = "./data/cases"):
+    # Concurrency and rate limits for API pulls
+    MAX_CONCURRENT_REQUESTS = 5
+    REQUESTS_PER_SECOND = 5
+
+    # Threads used to write individual case files
+    MAX_WRITE_WORKERS = 32
+
+    # zstd level for compressed output (compress=True)
+    ZSTD_LEVEL = 6
+
+    # Court IDs are cached on disk and refreshed after this many seconds
+    COURT_IDS_CACHE_FILE = ".court_ids.json"
+    COURT_IDS_TTL = 30 * 86400
+
+    # ETag/Last-Modified validators per page URL, and the cached page bodies
+    HTTP_CACHE_FILE = ".court_etags.json"
+    HTTP_CACHE_DIR = ".http_cache"
+
+    # Used when the courts API cannot be reached (never cached)
+    FALLBACK_COURT_IDS = {
+        "supreme": {"id": "del", "slug": "del", "name": "Delaware Supreme Court"},
+        "chancery": {"id": "delch", "slug": "delch", "name": "Delaware Court of Chancery"}
+    }
+
+    def __init__(
+        self,
+        api_token: Optional[str] = None,
+        output_dir: str = "./data/cases",
+        force_refresh: bool = False,
+        api_version: str = "v4",
+        compress: bool = False
+    ):
         """
         Initialize the extractor.
 
         Args:
             api_token: CourtListener API token (optional but recommended for higher rate limits)
             output_dir: Directory to save extracted cases
+            force_refresh: Re-fetch court IDs even if a fresh cached copy exists
+            api_version: CourtListener REST API version
+            compress: Write zstd-compressed output (delaware_cases.json.zst and
+                an individual.tar.zst archive); requires zstandard
         """
-        self.base_url = "https://www.courtlistener.com/api/rest/v4"
+        self.base_url = f"{COURTLISTENER_API_URL}/{api_version}"
         self.api_token = api_token
         self.output_dir = output_dir
         self.headers = {}
+        self.compress = compress
+
+        if compress:
+            try:
+                import zstandard  # noqa: F401
+            except ImportError:
+                logger.warning("zstandard not installed; writing uncompressed output (pip install mantra[zstd])")
+                self.compress = False
 
         if api_token:
             self.headers["Authorization"] = f"Token {api_token}"
@@ -40,7 +174,38 @@ class DelawareCaseLawExtractor:
         os.makedirs(output_dir, exist_ok=True)
 
         # Fetch and cache Delaware court IDs
-        self.court_ids = self.get_delaware_court_ids()
+        self.court_ids = self.load_court_ids(force_refresh=force_refresh)
+
+    def load_court_ids(self, force_refresh: bool = False) -> Dict[str, Dict]:
+        """
+        Get Delaware court IDs, preferring the on-disk cache over the API.
+
+        Args:
+            force_refresh: Ignore the cache and query the API
+
+        Returns:
+            Dictionary mapping court names to their IDs and slugs
+        """
+        cache_path = Path(self.output_dir) / self.COURT_IDS_CACHE_FILE
+
+        if not force_refresh:
+            try:
+                if cache_path.stat().st_mtime > time.time() - self.COURT_IDS_TTL:
+                    court_ids = orjson.loads(cache_path.read_bytes())
+                    logger.info(f"Loaded Delaware court identifiers from {cache_path}")
+                    return court_ids
+            except (OSError, orjson.JSONDecodeError):
+                pass  # Missing or unreadable cache: fetch from the API
+
+        court_ids = self.get_delaware_court_ids()
+
+        if court_ids != self.FALLBACK_COURT_IDS:
+            try:
+                cache_path.write_bytes(orjson.dumps(court_ids))
+            except OSError as e:
+                logger.warning(f"Could not cache court IDs to {cache_path}: {e}")
+
+        return court_ids
 
     def get_delaware_court_ids(self) -> Dict[str, Dict]:
         """
@@ -55,47 +220,25 @@ class DelawareCaseLawExtractor:
         url = f"{self.base_url}/courts/"
         params = {"jurisdiction": "del", "page_size": 100}
 
-        while url:
-            try:
-                response = requests.get(url, params=params, headers=self.headers)
-                response.raise_for_status()
-                data = response.json()
-
-                for court in data.get("results", []):
-                    name = (court.get("full_name") or court.get("name") or "").lower()
-
-                    # Identify Delaware Supreme Court
-                    if "supreme court of delaware" in name:
-                        court_ids["supreme"] = {
-                            "id": court["id"],
-                            "slug": court.get("id"),
-                            "name": court.get("full_name")
-                        }
-                        logger.info(f"Found Delaware Supreme Court: ID={court['id']}")
-
-                    # Identify Delaware Court of Chancery
-                    if "court of chancery" in name and "delaware" in name:
-                        court_ids["chancery"] = {
-                            "id": court["id"],
-                            "slug": court.get("id"),
-                            "name": court.get("full_name")
-                        }
-                        logger.info(f"Found Delaware Court of Chancery: ID={court['id']}")
-
-                url = data.get("next")
-                params = None  # Next URL includes all params
-
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Error fetching court IDs: {e}")
-                break
+        for court in asyncio.run(self._paginate(url, params)):
+            get = court.get
+            name = (get("full_name") or get("name") or "").lower()
+
+            # Identify the Delaware Supreme Court / Court of Chancery
+            for key, label, needles in _COURT_PATTERNS:
+                if all(needle in name for needle in needles):
+                    court_ids[key] = {
+                        "id": court["id"],
+                        "slug": get("id"),
+                        "name": get("full_name")
+                    }
+                    logger.info(f"Found {label}: ID={court['id']}")
+                    break
 
         if not court_ids:
             logger.warning("No Delaware courts found! Using fallback identifiers.")
             # Fallback to common identifiers if API fails
-            court_ids = {
-                "supreme": {"id": "del", "slug": "del", "name": "Delaware Supreme Court"},
-                "chancery": {"id": "delch", "slug": "delch", "name": "Delaware Court of Chancery"}
-            }
+            court_ids = dict(self.FALLBACK_COURT_IDS)
 
         return court_ids
 
@@ -132,100 +275,208 @@ class DelawareCaseLawExtractor:
         Returns:
             List of opinion dictionaries
         """
-        results = []
+        return asyncio.run(self._fetch_opinions_async(max_results=max_results))
+
+    async def _fetch_opinions_async(self, max_results: Optional[int] = None) -> List[Dict]:
+        """
+        Fetch opinion pages concurrently.
+
+        Args:
+            max_results: Maximum number of results to fetch (None for all)
+
+        Returns:
+            List of opinion dictionaries, in API order
+        """
         params = self.build_search_params()
         url = f"{self.base_url}/opinions/"
-        page = 1
 
         logger.info("Starting to fetch Delaware corporate law cases...")
         logger.info(f"Target courts: {self.court_ids['supreme']['name']}, {self.court_ids['chancery']['name']}")
 
-        while True:
+        results = await self._paginate(url, params, max_results=max_results)
+
+        # Check if we've reached max_results
+        if max_results and len(results) >= max_results:
+            results = results[:max_results]
+            logger.info(f"Reached max_results limit: {max_results}")
+
+        logger.info(f"Total opinions fetched: {len(results)}")
+        return results
+
+    async def _paginate(
+        self,
+        url: str,
+        params: Dict,
+        max_results: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Collect the results of every page of a CourtListener list endpoint.
+
+        The first page reports the total count, so the remaining pages are
+        requested together with explicit ``page`` parameters
+        (MAX_CONCURRENT_REQUESTS at a time, at most REQUESTS_PER_SECOND
+        overall). Falls back to following ``next`` links when the API does not
+        return a numeric count. Pages that fail are logged and skipped.
+
+        Pages are requested conditionally (If-None-Match / If-Modified-Since)
+        when a validated copy from an earlier run is on disk; a 304 response
+        reuses that copy instead of downloading the page again.
+
+        Args:
+            url: Endpoint URL
+            params: Query parameters, including page_size
+            max_results: Stop requesting pages once this many results are
+                covered (None for all)
+
+        Returns:
+            List of result dictionaries, in API order
+        """
+        page_size = params["page_size"]
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+        limiter = AsyncRateLimiter(rate=self.REQUESTS_PER_SECOND, period=1)
+        validators, cache_dir = self._load_http_cache()
+
+        async def get_page(client: httpx.AsyncClient, page_url: str, page_params: Optional[Dict], page: int) -> Optional[Dict]:
+            key = str(httpx.URL(page_url, params=page_params))
+            body_path = cache_dir / f"{hashlib.blake2b(key.encode(), digest_size=16).hexdigest()}.json"
+
+            # Conditional request if we hold a copy of this page
+            headers = {}
+            cached = validators.get(key)
+            if cached and body_path.exists():
+                if cached.get("etag"):
+                    headers["If-None-Match"] = cached["etag"]
+                if cached.get("last_modified"):
+                    headers["If-Modified-Since"] = cached["last_modified"]
+
             try:
                 logger.info(f"Fetching page {page}...")
-                response = requests.get(url, params=params, headers=self.headers)
-                response.raise_for_status()
-
-                data = response.json()
-                page_results = data.get("results", [])
-                results.extend(page_results)
+                async with semaphore, limiter:
+                    response = await get_with_retries(client, page_url, page_params, headers=headers)
 
-                # Log sample court to verify we're getting Delaware cases
-                if page_results:
-                    sample_court = page_results[0].get("court", "Unknown")
-                    logger.info(f"Fetched {len(page_results)} opinions (Total: {len(results)}) - Sample court: {sample_court}")
+                if response.status_code == 304:
+                    logger.info(f"Page {page} not modified, using cached copy")
+                    content = await asyncio.to_thread(body_path.read_bytes)
                 else:
-                    logger.info(f"Fetched {len(page_results)} opinions (Total: {len(results)})")
+                    response.raise_for_status()
+                    content = response.content
+
+                    etag = response.headers.get("ETag")
+                    last_modified = response.headers.get("Last-Modified")
+                    if etag or last_modified:
+                        await asyncio.to_thread(body_path.write_bytes, content)
+                        validators[key] = {"etag": etag, "last_modified": last_modified}
+
+                data = orjson.loads(content)
+            except (httpx.HTTPError, OSError, orjson.JSONDecodeError) as e:
+                logger.error(f"Error fetching page {page}: {e}")
+                return None
+
+            page_results = data.get("results", [])
+
+            # Log sample court to verify we're getting Delaware cases
+            if page_results and "court" in page_results[0]:
+                sample_court = page_results[0]["court"]
+                logger.info(f"Fetched {len(page_results)} results on page {page} - Sample court: {sample_court}")
+            else:
+                logger.info(f"Fetched {len(page_results)} results on page {page}")
+
+            return data
+
+        async with create_async_client(
+            headers=self.headers,
+            timeout=30,
+            max_connections=self.MAX_CONCURRENT_REQUESTS,
+            http2=True
+        ) as client:
+            first = await get_page(client, url, params, 1)
+            if first is None:
+                return []
+
+            results = list(first.get("results", []))
+            count = first.get("count")
+
+            if first.get("next") and isinstance(count, int):
+                # Request every remaining page at once
+                total_pages = -(-count // page_size)
+                if max_results:
+                    total_pages = min(total_pages, -(-max_results // page_size))
+
+                pages = await asyncio.gather(*[
+                    get_page(client, url, {**params, "page": page}, page)
+                    for page in range(2, total_pages + 1)
+                ])
+                for data in pages:
+                    if data is not None:
+                        results.extend(data.get("results", []))
+
+            else:
+                # No usable count (e.g. cursor pagination): follow next links
+                data, page = first, 1
+                while data.get("next") and not (max_results and len(results) >= max_results):
+                    page += 1
+                    data = await get_page(client, data["next"], None, page)
+                    if data is None:
+                        break
+                    results.extend(data.get("results", []))
+
+        self._save_http_cache(validators)
+        return results
 
-                # Check if we've reached max_results
-                if max_results and len(results) >= max_results:
-                    results = results[:max_results]
-                    logger.info(f"Reached max_results limit: {max_results}")
-                    break
+    def _load_http_cache(self) -> tuple:
+        """
+        Load the conditional-GET validators saved by earlier runs.
 
-                # Check for next page
-                next_url = data.get("next")
-                if not next_url:
-                    logger.info("No more pages to fetch")
-                    break
+        Returns:
+            Tuple of (validators keyed by page URL, directory of cached bodies)
+        """
+        cache_dir = Path(self.output_dir) / self.HTTP_CACHE_DIR
+        cache_dir.mkdir(parents=True, exist_ok=True)
 
-                url = next_url
-                params = None  # Params are included in next_url
-                page += 1
+        try:
+            validators = orjson.loads((Path(self.output_dir) / self.HTTP_CACHE_FILE).read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            validators = {}
 
-                # Rate limiting - be nice to the API
-                time.sleep(1)
+        return validators, cache_dir
 
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Error fetching data: {e}")
-                logger.error(f"Response content: {response.text[:500] if 'response' in locals() else 'N/A'}")
-                break
+    def _save_http_cache(self, validators: Dict[str, Dict]):
+        """
+        Persist conditional-GET validators for the next run.
+
+        Args:
+            validators: ETag/Last-Modified values keyed by page URL
+        """
+        cache_file = Path(self.output_dir) / self.HTTP_CACHE_FILE
+        try:
+            cache_file.write_bytes(orjson.dumps(validators))
+        except OSError as e:
+            logger.warning(f"Could not save HTTP cache validators to {cache_file}: {e}")
 
-        logger.info(f"Total opinions fetched: {len(results)}")
-        return results
-    
     def process_opinion(self, opinion: Dict) -> Dict:
         """
         Process and extract relevant fields from an opinion.
+
+        The raw dict is updated in place (missing fields defaulted, metadata
+        nested, other fields dropped) instead of being copied.
         
         Args:
-            opinion: Raw opinion data from API
+            opinion: Raw opinion data from API (modified)
             
         Returns:
-            Processed opinion dictionary
-        """
-        processed = {
-            "id": opinion.get("id"),
-            "case_name": opinion.get("case_name", "Unknown Case"),
-            "case_name_full": opinion.get("case_name_full", ""),
-            "date_filed": opinion.get("date_filed"),
-            "court": opinion.get("court", ""),
-            "plain_text": opinion.get("plain_text", ""),
-            "html": opinion.get("html", ""),
-            "absolute_url": opinion.get("absolute_url", ""),
-            "citation_count": opinion.get("citation_count", 0),
-            "author_str": opinion.get("author_str", ""),
-            "type": opinion.get("type", ""),
-            "download_url": opinion.get("download_url", ""),
-            "local_path": opinion.get("local_path", ""),
-            "extracted_by_ocr": opinion.get("extracted_by_ocr", False),
-            "metadata": {
-                "cluster": opinion.get("cluster", ""),
-                "per_curiam": opinion.get("per_curiam", False),
-                "joined_by": opinion.get("joined_by", []),
-            }
-        }
-        
-        # Calculate text statistics
-        text = processed["plain_text"]
-        processed["text_length"] = len(text)
-        processed["word_count"] = len(text.split()) if text else 0
-        
-        return processed
+            Processed opinion dictionary (the same object)
+        """
+        # Projection and text statistics (word count, length) are generated
+        # from _OPINION_FIELDS at import time
+        return _process_opinion_fast(opinion)
     
     def save_to_json(self, opinions: List[Dict], filename: str = "delaware_cases.json"):
         """
-        Save processed opinions to JSON file.
+        Save processed opinions to JSON file, plus a columnar Parquet copy.
+
+        The JSON file is kept for backwards compatibility (the indexer reads
+        it) and is deprecated in favour of the Parquet file, which lets
+        loaders read just the columns they need.
         
         Args:
             opinions: List of processed opinions
@@ -233,31 +484,140 @@ class DelawareCaseLawExtractor:
         """
         filepath = os.path.join(self.output_dir, filename)
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(opinions, f, indent=2, ensure_ascii=False)
+        # Compact JSON: the file is read by the indexer, not by people
+        data = orjson.dumps(opinions, option=orjson.OPT_NON_STR_KEYS)
+
+        if self.compress:
+            import zstandard
+
+            # The legal prose compresses several-fold
+            filepath += ".zst"
+            compressor = zstandard.ZstdCompressor(level=self.ZSTD_LEVEL, threads=-1)
+            with open(filepath, 'wb') as raw, compressor.stream_writer(raw) as f:
+                f.write(data)
+        else:
+            with open(filepath, 'wb') as f:
+                f.write(data)
         
         logger.info(f"Saved {len(opinions)} opinions to {filepath}")
+
+        self.save_to_parquet(opinions, str(Path(filename).with_suffix(".parquet")))
+
+    def save_to_parquet(self, opinions: List[Dict], filename: str = "delaware_cases.parquet"):
+        """
+        Save processed opinions as a zstd-compressed Parquet table.
+
+        One column per field (``metadata`` becomes a struct column), so e.g.
+        ``pq.read_table(path, columns=["id", "plain_text"])`` skips the rest.
+        Skipped with a warning if pyarrow is not installed.
+
+        Args:
+            opinions: List of processed opinions
+            filename: Output filename
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            logger.warning("pyarrow not installed; skipping Parquet output (pip install mantra[parquet])")
+            return
+
+        if not opinions:
+            return
+
+        filepath = os.path.join(self.output_dir, filename)
+
+        # Array of dicts -> one list per field
+        columns = {key: [op.get(key) for op in opinions] for key in opinions[0]}
+
+        try:
+            pq.write_table(pa.table(columns), filepath, compression="zstd")
+        except (pa.ArrowException, OSError) as e:
+            logger.error(f"Error writing {filepath}: {e}")
+            return
+
+        logger.info(f"Saved {len(opinions)} opinions to {filepath}")
         
     def save_individual_cases(self, opinions: List[Dict]):
         """
         Save each case as an individual JSON file.
         Useful for incremental processing.
+
+        Content hashes of the files written are kept in a ``.manifest.json``
+        sidecar, so cases unchanged since the last run are not rewritten.
         
         Args:
             opinions: List of processed opinions
         """
-        individual_dir = os.path.join(self.output_dir, "individual")
-        os.makedirs(individual_dir, exist_ok=True)
+        if self.compress:
+            self._save_individual_archive(opinions)
+            return
+
+        individual_dir = Path(self.output_dir) / "individual"
+        individual_dir.mkdir(parents=True, exist_ok=True)
+
+        # Per-case paths are formatted onto this prefix; Path / and
+        # os.path.join both re-parse the directory for every file
+        file_prefix = f"{individual_dir}{os.sep}case_"
+
+        manifest_path = individual_dir / ".manifest.json"
+        try:
+            manifest = orjson.loads(manifest_path.read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            manifest = {}
         
-        for opinion in opinions:
-            case_id = opinion.get("id", "unknown")
-            filename = f"case_{case_id}.json"
-            filepath = os.path.join(individual_dir, filename)
+        def write_one(opinion: Dict) -> Optional[tuple]:
+            case_id = str(opinion.get("id", "unknown"))
+            filepath = f"{file_prefix}{case_id}.json"
+
+            payload = orjson.dumps(opinion, option=orjson.OPT_NON_STR_KEYS)
+            digest = hashlib.blake2b(payload, digest_size=16).hexdigest()
+            if manifest.get(case_id) == digest and os.path.exists(filepath):
+                return None  # Unchanged since the last run
             
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(opinion, f, indent=2, ensure_ascii=False)
+            with open(filepath, 'wb') as f:
+                f.write(payload)
+            return case_id, digest
         
-        logger.info(f"Saved {len(opinions)} individual case files to {individual_dir}")
+        # File writes are syscall-bound and release the GIL, so overlap them
+        with ThreadPoolExecutor(max_workers=self.MAX_WRITE_WORKERS) as pool:
+            written = [entry for entry in pool.map(write_one, opinions) if entry]
+
+        if written:
+            manifest.update(written)
+            manifest_path.write_bytes(orjson.dumps(manifest))
+        
+        logger.info(
+            f"Saved {len(written)} individual case files to {individual_dir} "
+            f"({len(opinions) - len(written)} unchanged)"
+        )
+
+    def _save_individual_archive(self, opinions: List[Dict]):
+        """
+        Save each case as a JSON member of one zstd-compressed tar archive.
+
+        A single streamed archive avoids per-file open/write syscalls and
+        compresses across cases.
+
+        Args:
+            opinions: List of processed opinions
+        """
+        import zstandard
+
+        filepath = os.path.join(self.output_dir, "individual.tar.zst")
+        compressor = zstandard.ZstdCompressor(level=self.ZSTD_LEVEL, threads=-1)
+        mtime = time.time()
+
+        with open(filepath, 'wb') as raw, compressor.stream_writer(raw) as zf, \
+                tarfile.open(fileobj=zf, mode='w|') as tar:
+            for opinion in opinions:
+                data = orjson.dumps(opinion, option=orjson.OPT_NON_STR_KEYS)
+                info = tarfile.TarInfo(f"individual/case_{opinion.get('id', 'unknown')}.json")
+                info.size = len(data)
+                info.mtime = mtime
+                tar.addfile(info, io.BytesIO(data))
+
+        logger.info(f"Saved {len(opinions)} individual cases to {filepath}")
     
     def generate_summary_stats(self, opinions: List[Dict]) -> Dict:
         """
@@ -272,24 +632,48 @@ class DelawareCaseLawExtractor:
         if not opinions:
             return {}
         
+        # Single pass over the opinions for every accumulator
+        total_words = 0
+        total_citations = 0
+        cases_with_citations = 0
+        earliest = latest = None
+        courts = {}
+        courts_get = courts.get
+
+        for op in opinions:
+            get = op.get
+            total_words += get("word_count", 0)
+
+            citation_count = get("citation_count", 0)
+            total_citations += citation_count
+            if citation_count > 0:
+                cases_with_citations += 1
+
+            date_filed = get("date_filed")
+            if date_filed:
+                if earliest is None or date_filed < earliest:
+                    earliest = date_filed
+                if latest is None or date_filed > latest:
+                    latest = date_filed
+
+            # Count cases by court
+            court = get("court", "Unknown")
+            courts[court] = courts_get(court, 0) + 1
+
+        n = len(opinions)
         stats = {
-            "total_cases": len(opinions),
+            "total_cases": n,
             "date_range": {
-                "earliest": min(op.get("date_filed", "") for op in opinions if op.get("date_filed")),
-                "latest": max(op.get("date_filed", "") for op in opinions if op.get("date_filed"))
+                "earliest": earliest or "N/A",
+                "latest": latest or "N/A"
             },
-            "total_words": sum(op.get("word_count", 0) for op in opinions),
-            "avg_words_per_case": sum(op.get("word_count", 0) for op in opinions) / len(opinions),
-            "cases_with_citations": sum(1 for op in opinions if op.get("citation_count", 0) > 0),
-            "total_citations": sum(op.get("citation_count", 0) for op in opinions),
-            "courts": {}
+            "total_words": total_words,
+            "avg_words_per_case": total_words / n,
+            "cases_with_citations": cases_with_citations,
+            "total_citations": total_citations,
+            "courts": courts
         }
         
-        # Count cases by court
-        for opinion in opinions:
-            court = opinion.get("court", "Unknown")
-            stats["courts"][court] = stats["courts"].get(court, 0) + 1
-        
         return stats
     
     def run(self, max_results: Optional[int] = None, save_individual: bool = True):
@@ -325,8 +709,8 @@ class DelawareCaseLawExtractor:
         # Generate and save statistics
         stats = self.generate_summary_stats(processed_opinions)
         stats_file = os.path.join(self.output_dir, "summary_stats.json")
-        with open(stats_file, 'w', encoding='utf-8') as f:
-            json.dump(stats, f, indent=2)
+        with open(stats_file, 'wb') as f:
+            f.write(orjson.dumps(stats, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
         
         logger.info("=" * 80)
         logger.info("EXTRACTION COMPLETE")
@@ -345,6 +729,8 @@ def main():
     """
     Main function to run the extractor.
     """
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+
     # Get API token from environment variable (optional)
     api_token = os.getenv("COURTLISTENER_API_TOKEN")
     
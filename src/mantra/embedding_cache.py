@@ -0,0 +1,100 @@
+"""
+Persistent chunk embedding cache for Mantra.
+Index rebuilds only send new or changed chunk texts to the embedding API.
+"""
+
+import os
+import sqlite3
+import hashlib
+import logging
+from typing import Dict, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Keep IN (...) lists under SQLite's bound-parameter limit
+_QUERY_BATCH = 500
+
+
+class EmbeddingCache:
+    """
+    SQLite store of chunk embeddings keyed by a hash of (model, text).
+
+    Vectors are stored as float16, halving the file size; they are
+    normalized before indexing, so the lost precision does not matter
+    for retrieval.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Open (or create) the cache.
+
+        Args:
+            db_path: SQLite file holding the cache
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+        self.db_path = db_path
+        self._db = sqlite3.connect(db_path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (hash BLOB PRIMARY KEY, vec BLOB NOT NULL)"
+        )
+        self._db.commit()
+
+    @staticmethod
+    def key(model: str, text: str) -> bytes:
+        """
+        Cache key for a text embedded with a model.
+
+        Args:
+            model: Embedding model name
+            text: Embedded text
+
+        Returns:
+            16-byte BLAKE2b digest
+        """
+        return hashlib.blake2b(f"{model}\0{text}".encode("utf-8"), digest_size=16).digest()
+
+    def get_many(self, keys: Sequence[bytes]) -> Dict[bytes, np.ndarray]:
+        """
+        Look up cached embeddings.
+
+        Args:
+            keys: Cache keys (duplicates allowed)
+
+        Returns:
+            Dict of key -> float32 vector for the keys present in the cache
+        """
+        found = {}
+        unique = list(set(keys))
+        for start in range(0, len(unique), _QUERY_BATCH):
+            batch = unique[start:start + _QUERY_BATCH]
+            rows = self._db.execute(
+                f"SELECT hash, vec FROM embeddings WHERE hash IN ({','.join('?' * len(batch))})",
+                batch
+            )
+            for key, vec in rows:
+                found[key] = np.frombuffer(vec, dtype=np.float16).astype(np.float32)
+        return found
+
+    def put_many(self, keys: Sequence[bytes], vectors: np.ndarray):
+        """
+        Store embeddings (existing keys are left untouched).
+
+        Args:
+            keys: Cache keys, one per row of vectors
+            vectors: Embeddings of shape (len(keys), dimension)
+        """
+        self._db.executemany(
+            "INSERT OR IGNORE INTO embeddings (hash, vec) VALUES (?, ?)",
+            zip(keys, (vector.tobytes() for vector in np.asarray(vectors, dtype=np.float16)))
+        )
+        self._db.commit()
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def close(self):
+        """Close the underlying database."""
+        self._db.close()
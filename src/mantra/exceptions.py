@@ -3,6 +3,8 @@ Custom exceptions for Mantra application.
 Provides specific error types for better error handling and debugging.
 """
 
+from functools import cached_property
+
 
 class MantraException(Exception):
     """Base exception for all Mantra-specific errors."""
@@ -13,6 +15,11 @@ class MantraException(Exception):
         super().__init__(self.message)
 
     def __str__(self) -> str:
+        return self._formatted
+
+    @cached_property
+    def _formatted(self) -> str:
+        # Formatted on first str() and reused (logging stringifies repeatedly)
         if self.details:
             details_str = ", ".join(f"{k}={v}" for k, v in self.details.items())
             return f"{self.message} ({details_str})"
@@ -97,6 +104,15 @@ class LLMRateLimitError(LLMError):
         super().__init__(message, details)
 
 
+class LLMUnavailableError(LLMError):
+    """Raised when LLM calls are short-circuited after repeated API failures."""
+
+    def __init__(self, retry_after: float = None):
+        message = "LLM API temporarily unavailable"
+        details = {"retry_after_seconds": retry_after} if retry_after else {}
+        super().__init__(message, details)
+
+
 class DataError(MantraException):
     """Base exception for data-related errors."""
     pass
@@ -146,6 +162,7 @@ ERROR_STATUS_CODES = {
     EmbeddingGenerationError: 500,
     LLMGenerationError: 500,
     LLMRateLimitError: 429,  # Too Many Requests
+    LLMUnavailableError: 503,
     DataNotFoundError: 404,  # Not Found
     DataValidationError: 400,  # Bad Request
     ConfigurationError: 500,
@@ -153,14 +170,30 @@ ERROR_STATUS_CODES = {
 }
 
 
+# Status per concrete exception class: seeded with the mapped classes at
+# import, and filled in for other classes on first lookup
+_STATUS_BY_TYPE = dict(ERROR_STATUS_CODES)
+
+
 def get_http_status_code(exception: Exception) -> int:
     """
     Get appropriate HTTP status code for an exception.
 
+    Subclasses of a mapped exception inherit its status code.
+
     Args:
         exception: Exception instance
 
     Returns:
         HTTP status code (defaults to 500 for unknown errors)
     """
-    return ERROR_STATUS_CODES.get(type(exception), 500)
+    exception_type = type(exception)
+    status = _STATUS_BY_TYPE.get(exception_type)
+    if status is None:
+        # Unmapped class: take the nearest mapped base (runs once per class)
+        status = next(
+            (ERROR_STATUS_CODES[cls] for cls in exception_type.__mro__ if cls in ERROR_STATUS_CODES),
+            500
+        )
+        _STATUS_BY_TYPE[exception_type] = status
+    return status
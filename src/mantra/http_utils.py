@@ -0,0 +1,178 @@
+"""
+HTTP helpers for the Mantra data extractors.
+Shared connection pooling, retries and rate limiting for concurrent API pulls.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Transient statuses worth retrying with backoff
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def http2_available() -> bool:
+    """HTTP/2 needs the optional h2 package (httpx[http2])."""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def create_async_client(
+    headers: Optional[Dict[str, str]] = None,
+    timeout: float = 30.0,
+    max_connections: int = 10,
+    retries: int = 3,
+    http2: bool = False
+) -> httpx.AsyncClient:
+    """
+    Create a keep-alive async client for API pulls.
+
+    Connections are pooled and reused across requests, responses are requested
+    gzip-compressed, and failed connection attempts are retried.
+
+    Args:
+        headers: Default request headers
+        timeout: Request timeout in seconds
+        max_connections: Connection pool size
+        retries: Retries for failed connection attempts
+        http2: Multiplex requests over HTTP/2 (if h2 is installed)
+
+    Returns:
+        httpx.AsyncClient (use as an async context manager)
+    """
+    limits = httpx.Limits(
+        max_connections=max_connections, max_keepalive_connections=max_connections
+    )
+    return httpx.AsyncClient(
+        headers={"Accept-Encoding": "gzip, deflate", **(headers or {})},
+        timeout=timeout,
+        limits=limits,
+        transport=httpx.AsyncHTTPTransport(
+            retries=retries, limits=limits, http2=http2 and http2_available()
+        )
+    )
+
+
+async def get_with_retries(
+    client: httpx.AsyncClient,
+    url: str,
+    params: Optional[Dict] = None,
+    retries: int = 3,
+    backoff_factor: float = 0.5,
+    headers: Optional[Dict[str, str]] = None,
+    stream: bool = False
+) -> httpx.Response:
+    """
+    GET a URL, retrying transient (429/5xx) responses with exponential backoff.
+
+    Args:
+        client: Client to send the request with
+        url: URL to fetch
+        params: Query parameters
+        retries: Maximum number of retries
+        backoff_factor: Base delay in seconds (doubled on each retry)
+        headers: Extra request headers (e.g. conditional GET validators)
+        stream: Return before the body is read (read it with read_capped()
+            or aiter_bytes(), then close the response)
+
+    Returns:
+        The final response (check its status as usual)
+    """
+    for attempt in range(retries + 1):
+        request = client.build_request("GET", url, params=params, headers=headers)
+        response = await client.send(request, stream=stream)
+        if response.status_code not in RETRY_STATUSES or attempt == retries:
+            return response
+        await response.aclose()
+
+        # Honour Retry-After (seconds) when the server sends it
+        retry_after = response.headers.get("Retry-After", "")
+        delay = (
+            float(retry_after) if retry_after.isdigit()
+            else backoff_factor * 2 ** attempt
+        )
+        logger.warning(f"HTTP {response.status_code} from {url}, retrying in {delay:.1f}s")
+        await asyncio.sleep(delay)
+
+    return response
+
+
+async def read_capped(response: httpx.Response, max_bytes: int, chunk_size: int = 65536) -> bytes:
+    """
+    Read a streamed response body, stopping after max_bytes.
+
+    The cap applies to the decoded (decompressed) body, so it bounds the
+    memory one page can take however well it compresses.
+
+    Args:
+        response: Response from a streaming request
+        max_bytes: Largest body to keep; the rest is not downloaded
+        chunk_size: Read size in bytes
+
+    Returns:
+        The body, truncated to at most max_bytes
+    """
+    chunks = []
+    total = 0
+    async for chunk in response.aiter_bytes(chunk_size):
+        chunks.append(chunk)
+        total += len(chunk)
+        if total >= max_bytes:
+            logger.warning(f"Response from {response.url} exceeds {max_bytes} bytes; truncating")
+            break
+    return b"".join(chunks)[:max_bytes]
+
+
+class AsyncRateLimiter:
+    """
+    Token-bucket rate limiter for asyncio code.
+
+    Allows bursts of up to ``rate`` acquisitions, refilled continuously at
+    ``rate`` tokens per ``period`` seconds. Use as ``async with limiter:``.
+    """
+
+    def __init__(self, rate: float = 5, period: float = 1.0):
+        """
+        Initialize the limiter.
+
+        Args:
+            rate: Number of acquisitions allowed per period
+            period: Length of the period in seconds
+        """
+        self.rate = rate
+        self.period = period
+
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a token is available and consume it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.rate, self._tokens + (now - self._updated) * self.rate / self.period
+                )
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) * self.period / self.rate)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
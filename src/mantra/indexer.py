@@ -1,25 +1,142 @@
 import os
 import json
+import base64
 import pickle
 import logging
-from typing import List, Dict, Optional, Tuple
+import itertools
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, List, Dict, Iterable, Iterator, Optional, Sequence, Tuple
 from datetime import datetime
 
 import faiss
 import numpy as np
+import orjson
 from openai import OpenAI
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+from .clients import get_openai_client
+from .embedding_cache import EmbeddingCache
+from .metadata_columns import MetadataColumns
+from .metadata_table import METADATA_ARROW_FILE, ArrowMetadata, read_metadata_arrow, write_metadata_arrow
+from .text_store import ChunkTexts
+from .utils import LRUCache, date_to_int, stream_cases
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+# Root logging for the command-line entry points
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# Default processes used to chunk cases during index builds (1 = chunk in-process)
+CHUNK_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+
+# Cases handed to a worker per task, and per worker between pool.map calls
+# (bounds how many unchunked cases are held in memory at once)
+CHUNK_TASK_SIZE = 32
+CHUNK_TASKS_PER_WORKER = 4
+
+# Default embedding API requests kept in flight during index builds
+EMBED_CONCURRENCY = 8
+
+# Repeated queries: cached embeddings, and cached search results (seconds)
+QUERY_VECTOR_CACHE_SIZE = 1024
+SEARCH_CACHE_SIZE = 512
+SEARCH_CACHE_TTL = 300.0
+
+
+def _rss_mb() -> float:
+    """Current resident set size of this process in MB (0 if unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+def _embedding_matrix(data: List) -> np.ndarray:
+    """
+    Stack embedding API results into a float32 matrix in input order.
+
+    Base64 payloads are decoded into one bytearray and viewed with
+    np.frombuffer, so no per-float Python objects are created.
+
+    Args:
+        data: ``response.data`` items from embeddings.create
+
+    Returns:
+        Writable array of shape (len(data), dimension)
+    """
+    # Results carry their input index; order by it to be safe
+    data = sorted(data, key=lambda item: item.index)
+    if data and isinstance(data[0].embedding, str):
+        buffer = bytearray()
+        for item in data:
+            buffer += base64.b64decode(item.embedding)
+        return np.frombuffer(buffer, dtype=np.float32).reshape(len(data), -1)
+    return np.array([item.embedding for item in data], dtype=np.float32)
+
+
+def _prefetch_file(path: str):
+    """
+    Ask the OS to read a file into the page cache ahead of use.
+
+    For memory-mapped files this turns first-query page faults into
+    background readahead. No-op where posix_fadvise is unavailable.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        finally:
+            os.close(fd)
+    except OSError as e:
+        logger.debug(f"Could not prefetch {path}: {e}")
+
+
+def mmr_select(
+    query_sims: np.ndarray,
+    doc_sims: np.ndarray,
+    lambda_: float,
+    k: int
+) -> np.ndarray:
+    """
+    Select diverse results with Maximal Marginal Relevance.
+
+    Each step picks the candidate maximizing
+    ``lambda_ * sim(query, doc) - (1 - lambda_) * max sim(doc, selected)``.
+    The inner update is a single vectorized row operation per pick.
+
+    Args:
+        query_sims: Similarity of each candidate to the query, shape (n,)
+        doc_sims: Pairwise candidate similarities, shape (n, n)
+        lambda_: Relevance/diversity trade-off (1.0 = pure relevance)
+        k: Number of candidates to select
+
+    Returns:
+        Indices of the selected candidates in selection order
+    """
+    n = len(query_sims)
+    k = min(k, n)
+    selected = np.empty(k, dtype=np.int64)
+    available = np.ones(n, dtype=bool)
+    penalty = np.zeros(n, dtype=np.float32)
+
+    for i in range(k):
+        scores = lambda_ * query_sims - (1.0 - lambda_) * penalty
+        scores[~available] = -np.inf
+        j = int(np.argmax(scores))
+        selected[i] = j
+        available[j] = False
+        penalty = doc_sims[j].copy() if i == 0 else np.maximum(penalty, doc_sims[j])
+
+    return selected
+
+
+def _self_overlapping(separator: str) -> bool:
+    """Whether occurrences of separator can overlap (e.g. "\\n\\n" in "\\n\\n\\n")."""
+    return any(separator[:k] == separator[-k:] for k in range(1, len(separator)))
+
 
 class LegalDocumentChunker:
     """
@@ -67,6 +184,10 @@ class LegalDocumentChunker:
         separator = separators[0]
         remaining_separators = separators[1:]
 
+        if not _self_overlapping(separator):
+            # Occurrences are exactly the split points: pack without splitting
+            return self._pack_by_position(text, separator, remaining_separators)
+
         # Split by current separator
         splits = text.split(separator)
 
@@ -108,6 +229,85 @@ class LegalDocumentChunker:
 
         return chunks
 
+    def _pack_by_position(self, text: str, separator: str, remaining_separators: list) -> list:
+        """
+        Pack separator-delimited pieces of text into chunks without splitting it.
+
+        Produces the same chunks as splitting on the separator and packing the
+        pieces, but every chunk is a contiguous slice of text whose end is
+        found with one str.rfind, so the work is per chunk, not per piece.
+
+        Args:
+            text: Text to split
+            separator: Separator that cannot overlap itself
+            remaining_separators: Separators for pieces larger than chunk_size
+
+        Returns:
+            List of text chunks
+        """
+        chunk_size = self.chunk_size
+        sep_len = len(separator)
+        n = len(text)
+
+        chunks = []
+        pos = 0        # Start of the next piece not yet packed
+        start = None   # Start of the current chunk (None = no current chunk)
+        end = 0        # End of the last piece in the current chunk
+        limit = 0      # Maximum end - start for the current chunk
+
+        while True:
+            if start is None:
+                if pos > n:
+                    break
+                piece_end = text.find(separator, pos)
+                if piece_end < 0:
+                    piece_end = n
+                if piece_end - pos > chunk_size:
+                    # Recursively split the large piece
+                    chunks.extend(self._split_text_recursive(text[pos:piece_end], remaining_separators))
+                    pos = piece_end + sep_len
+                    continue
+                # A piece that fits always starts the chunk; the packing
+                # budget counts a trailing separator after each piece
+                start, end, limit = pos, piece_end, chunk_size - sep_len
+
+            # Extend to the last piece that ends within the budget
+            if end == n:
+                break
+            bound = start + limit
+            if n <= bound:
+                end = n
+                break
+            last = text.rfind(separator, end + sep_len, bound + sep_len)
+            if last >= 0:
+                end = last
+
+            # The next piece doesn't fit: save the chunk
+            chunk = text[start:end]
+            chunks.append(chunk)
+
+            pos = end + sep_len
+            piece_end = text.find(separator, pos)
+            if piece_end < 0:
+                piece_end = n
+            if piece_end - pos > chunk_size:
+                # Recursively split the large piece
+                chunks.extend(self._split_text_recursive(text[pos:piece_end], remaining_separators))
+                start = None
+                pos = piece_end + sep_len
+                continue
+
+            # Start new chunk with overlap (the budget no longer counts a
+            # trailing separator)
+            overlap = len(chunk[-self.chunk_overlap:])
+            start = end - overlap if overlap else pos
+            end, limit = piece_end, chunk_size
+
+        if start is not None:
+            chunks.append(text[start:end])
+
+        return chunks
+
     def split_text(self, text: str) -> list:
         """
         Split text into chunks using recursive splitting.
@@ -141,31 +341,58 @@ class LegalDocumentChunker:
 
         # Split text into chunks using custom splitter
         chunks = self.split_text(plain_text)
-        
+
+        # Case-level fields are shared by every chunk: resolve them once
+        case_id = case_data.get("id")
+        case_fields = {
+            "case_id": case_id,
+            "case_name": case_data.get("case_name", "Unknown"),
+            "case_name_full": case_data.get("case_name_full", ""),
+            "date_filed": case_data.get("date_filed", ""),
+            "date_filed_int": date_to_int(case_data.get("date_filed")),
+            "court": case_data.get("court", ""),
+            "citation_count": case_data.get("citation_count", 0),
+            "author_str": case_data.get("author_str", ""),
+            "absolute_url": case_data.get("absolute_url", ""),
+            "total_chunks": len(chunks),
+        }
+
         # Create chunk documents with metadata
-        chunk_docs = []
-        for i, chunk_text in enumerate(chunks):
-            chunk_doc = {
+        chunk_docs = [
+            {
                 "text": chunk_text,
                 "metadata": {
-                    "case_id": case_data.get("id"),
-                    "case_name": case_data.get("case_name", "Unknown"),
-                    "case_name_full": case_data.get("case_name_full", ""),
-                    "date_filed": case_data.get("date_filed", ""),
-                    "court": case_data.get("court", ""),
-                    "citation_count": case_data.get("citation_count", 0),
-                    "author_str": case_data.get("author_str", ""),
-                    "absolute_url": case_data.get("absolute_url", ""),
+                    **case_fields,
                     "chunk_index": i,
-                    "total_chunks": len(chunks),
-                    "chunk_id": f"case_{case_data.get('id')}_chunk_{i}",
+                    "chunk_id": f"case_{case_id}_chunk_{i}",
                 }
             }
-            chunk_docs.append(chunk_doc)
+            for i, chunk_text in enumerate(chunks)
+        ]
         
         return chunk_docs
 
 
+# Supported index types. "fp16" and "sq8" store half-precision / 8-bit
+# scalar-quantized vectors (2x / 4x less memory bandwidth per search); "ivfpq" adds an IVF coarse quantizer with
+# product quantization (~24x smaller for 1536-d vectors); "hnsw" is a graph
+# index over full vectors (sub-linear search, exact scores for its results).
+INDEX_TYPES = {"flat", "fp16", "sq8", "ivfpq", "hnsw"}
+
+# Product quantization parameters for "ivfpq"
+PQ_SUBQUANTIZERS = 64
+PQ_BITS = 8
+
+# HNSW graph parameters for "hnsw" (neighbors per node, build-time beam width)
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 200
+
+# Filters narrowing the corpus to at most this many chunks (e.g. a short
+# date range) are searched exactly over the matching chunks instead of
+# post-filtering FAISS's top retrieve_k
+PREFILTER_MAX_CANDIDATES = 4096
+
+
 class DelawareCaseLawIndexer:
     """
     Creates and manages FAISS index for Delaware case law.
@@ -175,7 +402,14 @@ class DelawareCaseLawIndexer:
         self,
         embedding_model: str = "text-embedding-3-small",
         index_path: str = "./faiss_index",
-        data_path: str = "./data/cases/delaware_cases.json"
+        data_path: str = "./data/cases/delaware_cases.json",
+        index_type: str = "flat",
+        nprobe: int = 16,
+        ef_search: int = 64,
+        client: Optional[OpenAI] = None,
+        use_embedding_cache: bool = True,
+        chunk_workers: Optional[int] = None,
+        embed_concurrency: int = EMBED_CONCURRENCY
     ):
         """
         Initialize the indexer.
@@ -184,13 +418,30 @@ class DelawareCaseLawIndexer:
             embedding_model: OpenAI embedding model to use
             index_path: Path to save FAISS index
             data_path: Path to case law JSON data
+            index_type: FAISS index to build ("flat", "fp16", "sq8", "ivfpq" or "hnsw")
+            nprobe: Number of IVF lists probed per query (IVF indexes only)
+            ef_search: Search beam width (HNSW indexes only)
+            client: OpenAI client (defaults to the shared pooled client)
+            use_embedding_cache: Reuse chunk embeddings from previous builds
+                (stored under <index_path>/emb_cache/)
+            chunk_workers: Processes used to chunk cases during builds
+                (1 = chunk in-process; defaults to CHUNK_WORKERS)
+            embed_concurrency: Embedding API requests kept in flight during builds
         """
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"index_type must be one of {sorted(INDEX_TYPES)}")
+
         self.embedding_model = embedding_model
         self.index_path = index_path
         self.data_path = data_path
+        self.index_type = index_type
+        self.nprobe = nprobe
+        self.ef_search = ef_search
+        self.chunk_workers = CHUNK_WORKERS if chunk_workers is None else chunk_workers
+        self.embed_concurrency = max(1, embed_concurrency)
 
-        # Initialize OpenAI client
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        # Shared OpenAI client (pooled keep-alive connections)
+        self.client = client or get_openai_client()
 
         # Initialize chunker
         self.chunker = LegalDocumentChunker(chunk_size=1000, chunk_overlap=200)
@@ -198,11 +449,70 @@ class DelawareCaseLawIndexer:
         # Create index directory
         os.makedirs(index_path, exist_ok=True)
 
+        # Repeated queries skip the embeddings call / the whole search
+        self._query_vectors = LRUCache(QUERY_VECTOR_CACHE_SIZE)
+        self._search_cache = LRUCache(SEARCH_CACHE_SIZE, ttl=SEARCH_CACHE_TTL)
+
         # Index and metadata will be loaded/created
         self.index = None
-        self.metadata = []
+        self._metadata: List[Dict] = []
+        self._columns: Optional[MetadataColumns] = None
+        self.texts: Optional[ChunkTexts] = None  # Chunk texts (row i = vector i)
         self.dimension = 1536  # Default for text-embedding-3-small
+        self.index_factory: Optional[str] = None  # faiss.index_factory string of the index
+        self.index_version: Optional[str] = None  # Build timestamp from config.json
+        self._gpu_resources = None
+
+        # Contiguous (N, d) float32 copy of the normalized chunk embeddings,
+        # used to rerank candidates from quantized indexes exactly
+        self.embeddings: Optional[np.ndarray] = None
+
+        # Chunk embeddings from previous builds, opened on first use
+        self.use_embedding_cache = use_embedding_cache
+        self._embedding_cache: Optional[EmbeddingCache] = None
     
+    @property
+    def metadata(self) -> Sequence[Dict]:
+        """Chunk metadata dicts (row i = vector i); Arrow-backed after load_index."""
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, metadata: Sequence[Dict]):
+        self._metadata = metadata
+        self._columns = None  # Rebuilt from the new rows on next use
+        self._search_cache.clear()  # Results refer to the old rows
+
+    @property
+    def columns(self) -> MetadataColumns:
+        """Column-oriented view of the metadata, built on first filtered search."""
+        if self._columns is None:
+            if isinstance(self._metadata, ArrowMetadata):
+                self._columns = MetadataColumns.from_arrow(self._metadata.table)
+            else:
+                self._columns = MetadataColumns(self._metadata)
+        return self._columns
+
+    def iter_cases(self) -> Iterator[Dict]:
+        """
+        Stream cases from the JSONL data file one at a time.
+
+        Falls back to a zstd-compressed copy (``<data_path>.zst``) when the
+        plain file is missing.
+
+        Returns:
+            Iterator of case dictionaries
+        """
+        data_path = self.data_path
+        if not os.path.exists(data_path) and os.path.exists(f"{data_path}.zst"):
+            data_path = f"{data_path}.zst"
+
+        logger.info(f"Streaming cases from {data_path}")
+
+        if not os.path.exists(data_path):
+            raise FileNotFoundError(f"Data file not found: {self.data_path}")
+
+        return stream_cases(data_path)
+
     def load_cases(self) -> List[Dict]:
         """
         Load cases from JSON file.
@@ -210,52 +520,226 @@ class DelawareCaseLawIndexer:
         Returns:
             List of case dictionaries
         """
-        logger.info(f"Loading cases from {self.data_path}")
-        
-        if not os.path.exists(self.data_path):
-            raise FileNotFoundError(f"Data file not found: {self.data_path}")
-        
-        with open(self.data_path, 'r', encoding='utf-8') as f:
-            cases = json.load(f)
+        cases = list(self.iter_cases())
         
         logger.info(f"Loaded {len(cases)} cases")
         return cases
     
-    def process_cases(self, cases: List[Dict]) -> Tuple[List[str], List[Dict]]:
+    def process_cases(self, cases: Iterable[Dict]) -> Tuple[List[str], List[Dict]]:
         """
         Process cases into chunks with metadata.
 
         Args:
-            cases: List of case dictionaries
+            cases: Iterable of case dictionaries (consumed lazily)
 
         Returns:
-            Tuple of (texts, metadata)
+            Tuple of (texts, metadata); texts are kept out of the metadata
+            and stored separately as a ChunkTexts buffer
         """
         logger.info("Processing cases into chunks...")
 
-        all_chunks = []
-        for case in cases:
-            chunks = self.chunker.chunk_case(case)
-            all_chunks.extend(chunks)
-
-        # Extract texts for embedding generation
-        texts = [chunk["text"] for chunk in all_chunks]
-
-        # Create metadata that includes the text
+        texts = []
         metadata = []
-        for chunk in all_chunks:
-            meta = chunk["metadata"].copy()
-            meta["text"] = chunk["text"]  # Keep text with metadata
-            metadata.append(meta)
+        num_cases = 0
+        for chunks in self._chunk_cases(cases):
+            for chunk in chunks:
+                texts.append(chunk["text"])
+                metadata.append(chunk["metadata"])
+            num_cases += 1
 
-        logger.info(f"Created {len(texts)} chunks from {len(cases)} cases")
-        logger.info(f"Average chunks per case: {len(texts) / len(cases):.1f}")
+        logger.info(f"Created {len(texts)} chunks from {num_cases} cases")
+        logger.info(f"Average chunks per case: {len(texts) / max(num_cases, 1):.1f}")
 
         return texts, metadata
     
+    def _chunk_cases(self, cases: Iterable[Dict]) -> Iterator[List[Dict]]:
+        """
+        Chunk cases across chunk_workers processes (splitting is CPU-bound).
+
+        Cases are read from the iterable in blocks, so a streamed corpus is
+        never fully materialized.
+
+        Args:
+            cases: Iterable of case dictionaries
+
+        Returns:
+            Iterator of per-case chunk lists, in input order
+        """
+        if self.chunk_workers <= 1:
+            yield from map(self.chunker.chunk_case, cases)
+            return
+
+        cases = iter(cases)
+        block_size = self.chunk_workers * CHUNK_TASK_SIZE * CHUNK_TASKS_PER_WORKER
+        with ProcessPoolExecutor(max_workers=self.chunk_workers) as pool:
+            while True:
+                block = list(itertools.islice(cases, block_size))
+                if not block:
+                    return
+                yield from pool.map(self.chunker.chunk_case, block, chunksize=CHUNK_TASK_SIZE)
+
+    def process_and_embed(
+        self,
+        cases: Iterable[Dict],
+        batch_size: int = 100
+    ) -> Tuple[List[str], List[Dict], np.ndarray]:
+        """
+        Chunk cases and embed the chunks as one pipeline.
+
+        Chunking runs on the chunk_workers process pool while embedding
+        batches are sent on a thread pool as soon as enough new chunks have
+        arrived, so API latency overlaps with CPU-bound splitting instead of
+        following it. At most 2 * embed_concurrency batches are queued; the
+        chunker waits on the oldest beyond that. The embedding cache is used
+        as in generate_embeddings().
+
+        Args:
+            cases: Iterable of case dictionaries (consumed lazily)
+            batch_size: Number of texts to embed at once
+
+        Returns:
+            Tuple of (texts, metadata, embeddings), row i = chunk i
+        """
+        logger.info("Chunking and embedding cases...")
+        logger.info(f"Using model: {self.embedding_model}")
+
+        cache = self.embedding_cache if self.use_embedding_cache else None
+        texts: List[str] = []
+        metadata: List[Dict] = []
+        keys: List[bytes] = []
+        vectors: Dict[bytes, np.ndarray] = {}  # Cached or embedded, by key
+        seen = set()                            # Keys cached, queued or embedded
+        unsent: List[Tuple[bytes, str]] = []
+        in_flight = deque()
+        checked = 0                             # keys[:checked] have been looked up
+        num_cases = num_hits = num_batches = 0
+
+        def embed_batch(batch_num: int, batch: List[str]) -> np.ndarray:
+            logger.info(f"Processing batch {batch_num} ({len(batch)} texts)")
+            try:
+                return self._create_embeddings(batch)
+            except Exception as e:
+                logger.error(f"Error generating embeddings for batch {batch_num}: {e}")
+                raise
+
+        def collect(limit: int):
+            # Wait for the oldest batches until at most `limit` are in flight
+            while len(in_flight) > limit:
+                batch_keys, future = in_flight.popleft()
+                batch_vectors = future.result()
+                if cache is not None:
+                    cache.put_many(batch_keys, batch_vectors)
+                vectors.update(zip(batch_keys, batch_vectors))
+
+        def look_up():
+            # Queue the distinct new texts that are not in the cache
+            nonlocal checked, num_hits
+            new = {}
+            for key, text in zip(keys[checked:], texts[checked:]):
+                if key not in seen:
+                    new[key] = text
+            checked = len(keys)
+            seen.update(new)
+            if cache is not None and new:
+                hits = cache.get_many(list(new))
+                num_hits += len(hits)
+                vectors.update(hits)
+            unsent.extend((key, text) for key, text in new.items() if key not in vectors)
+
+        with ThreadPoolExecutor(max_workers=self.embed_concurrency) as pool:
+            def send(final: bool = False):
+                nonlocal num_batches
+                while len(unsent) >= batch_size or (final and unsent):
+                    batch = unsent[:batch_size]
+                    del unsent[:batch_size]
+                    num_batches += 1
+                    future = pool.submit(embed_batch, num_batches, [text for _, text in batch])
+                    in_flight.append(([key for key, _ in batch], future))
+                    collect(2 * self.embed_concurrency)
+
+            for chunks in self._chunk_cases(cases):
+                for chunk in chunks:
+                    texts.append(chunk["text"])
+                    metadata.append(chunk["metadata"])
+                    keys.append(EmbeddingCache.key(self.embedding_model, chunk["text"]))
+                num_cases += 1
+                if len(keys) - checked >= batch_size:
+                    look_up()
+                    send()
+
+            look_up()
+            send(final=True)
+            collect(0)
+
+        logger.info(f"Created {len(texts)} chunks from {num_cases} cases")
+        logger.info(f"Embedding cache: {num_hits} hits, {len(seen) - num_hits} embedded")
+
+        if not keys:
+            return texts, metadata, np.empty((0, self.dimension), dtype=np.float32)
+
+        embeddings = np.empty((len(keys), len(vectors[keys[0]])), dtype=np.float32)
+        for i, key in enumerate(keys):
+            embeddings[i] = vectors[key]
+
+        logger.info(f"Generated embeddings shape: {embeddings.shape}")
+        return texts, metadata, embeddings
+
+    @property
+    def embedding_cache(self) -> EmbeddingCache:
+        """Persistent embedding cache under the index directory."""
+        if self._embedding_cache is None:
+            self._embedding_cache = EmbeddingCache(
+                os.path.join(self.index_path, "emb_cache", "embeddings.sqlite3")
+            )
+        return self._embedding_cache
+
     def generate_embeddings(self, texts: List[str], batch_size: int = 100) -> np.ndarray:
         """
-        Generate embeddings for texts in batches.
+        Generate embeddings for texts, reusing cached ones from earlier builds.
+
+        Only texts missing from the embedding cache (deduplicated) are sent
+        to the API; their embeddings are added to the cache.
+
+        Args:
+            texts: List of text strings
+            batch_size: Number of texts to embed at once
+
+        Returns:
+            Numpy array of embeddings
+        """
+        if not self.use_embedding_cache or not texts:
+            return self._embed_texts(texts, batch_size)
+
+        cache = self.embedding_cache
+        keys = [cache.key(self.embedding_model, text) for text in texts]
+        cached = cache.get_many(keys)
+
+        # One API input per distinct missing text
+        missing: Dict[bytes, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+
+        logger.info(f"Embedding cache: {len(texts) - len(missing)} hits, {len(missing)} to embed")
+
+        if missing:
+            new_embeddings = self._embed_texts(list(missing.values()), batch_size)
+            cache.put_many(list(missing), new_embeddings)
+            cached.update(zip(missing, new_embeddings))
+
+        embeddings_array = np.empty((len(texts), len(cached[keys[0]])), dtype=np.float32)
+        for i, key in enumerate(keys):
+            embeddings_array[i] = cached[key]
+
+        return embeddings_array
+
+    def _embed_texts(self, texts: List[str], batch_size: int = 100) -> np.ndarray:
+        """
+        Embed texts with the API in batches.
+
+        Up to embed_concurrency batches are in flight at once (each request is
+        network-bound), and results are written straight into one
+        preallocated array at their batch offset.
         
         Args:
             texts: List of text strings
@@ -267,33 +751,108 @@ class DelawareCaseLawIndexer:
         logger.info(f"Generating embeddings for {len(texts)} chunks...")
         logger.info(f"Using model: {self.embedding_model}")
         
-        all_embeddings = []
         total_batches = (len(texts) + batch_size - 1) // batch_size
-        
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
-            batch_num = i // batch_size + 1
-            
+        if not total_batches:
+            return np.empty((0, self.dimension), dtype=np.float32)
+
+        def embed_batch(start: int) -> np.ndarray:
+            batch = texts[start:start + batch_size]
+            batch_num = start // batch_size + 1
             logger.info(f"Processing batch {batch_num}/{total_batches} ({len(batch)} texts)")
 
             try:
                 # Generate embeddings for batch using OpenAI API
-                response = self.client.embeddings.create(
-                    model=self.embedding_model,
-                    input=batch
-                )
-                batch_embeddings = [item.embedding for item in response.data]
-                all_embeddings.extend(batch_embeddings)
-
+                return self._create_embeddings(batch)
             except Exception as e:
                 logger.error(f"Error generating embeddings for batch {batch_num}: {e}")
                 raise
+
+        # The first batch fixes the embedding width for the output array
+        first = embed_batch(0)
+        embeddings_array = np.empty((len(texts), first.shape[1]), dtype=np.float32)
+        embeddings_array[:len(first)] = first
+
+        def embed_into(start: int):
+            # Batches cover disjoint rows, so workers write concurrently
+            batch_embeddings = embed_batch(start)
+            embeddings_array[start:start + len(batch_embeddings)] = batch_embeddings
+
+        starts = range(batch_size, len(texts), batch_size)
+        with ThreadPoolExecutor(max_workers=self.embed_concurrency) as pool:
+            list(pool.map(embed_into, starts))
         
-        embeddings_array = np.array(all_embeddings, dtype=np.float32)
         logger.info(f"Generated embeddings shape: {embeddings_array.shape}")
         
         return embeddings_array
     
+    def _create_embeddings(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts in one API call, requesting compact base64 vectors.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            float32 array of shape (len(texts), dimension), in input order
+        """
+        response = self.client.embeddings.create(
+            model=self.embedding_model,
+            input=texts,
+            encoding_format="base64"
+        )
+        return _embedding_matrix(response.data)
+
+    def _factory_string(self, n_vectors: int) -> str:
+        """
+        Build the faiss.index_factory description for the configured index type.
+
+        Falls back to scalar quantization when there are too few vectors to
+        train IVF-PQ.
+
+        Args:
+            n_vectors: Number of vectors that will be indexed
+
+        Returns:
+            Index factory string
+        """
+        if self.index_type == "ivfpq":
+            nlist = min(1024, max(1, int(np.sqrt(n_vectors))))
+            min_train = max(39 * nlist, 2 ** PQ_BITS)
+            if n_vectors >= min_train and self.dimension % PQ_SUBQUANTIZERS == 0:
+                return f"IVF{nlist},PQ{PQ_SUBQUANTIZERS}x{PQ_BITS}"
+            logger.warning(
+                f"Too few vectors ({n_vectors}) or incompatible dimension for IVF-PQ, "
+                f"using SQ8 instead"
+            )
+            return "SQ8"
+
+        if self.index_type == "sq8":
+            return "SQ8"
+
+        if self.index_type == "fp16":
+            return "SQfp16"
+
+        if self.index_type == "hnsw":
+            return f"HNSW{HNSW_M}"
+
+        return "Flat"
+
+    def _configure_index(self, index: faiss.Index):
+        """Apply search-time parameters (efSearch, nprobe, parallel mode) to an HNSW/IVF index."""
+        hnsw = getattr(index, "hnsw", None)
+        if hnsw is not None:
+            hnsw.efSearch = max(self.ef_search, 1)
+            return
+
+        try:
+            ivf = faiss.extract_index_ivf(index)
+        except RuntimeError:
+            return  # Not an IVF index
+
+        ivf.nprobe = self.nprobe
+        # Parallelize each query over its inverted lists (lower single-query latency)
+        ivf.parallel_mode = 1
+
     def create_faiss_index(self, embeddings: np.ndarray) -> faiss.Index:
         """
         Create FAISS index from embeddings.
@@ -309,49 +868,89 @@ class DelawareCaseLawIndexer:
         dimension = embeddings.shape[1]
         self.dimension = dimension
         
-        # Create IndexFlatL2 for exact search
-        # L2 distance (can normalize for cosine similarity)
-        index = faiss.IndexFlatL2(dimension)
+        # Inner product on normalized vectors is cosine similarity (one sgemm per batch)
+        factory_string = self._factory_string(embeddings.shape[0])
+        index = faiss.index_factory(dimension, factory_string, faiss.METRIC_INNER_PRODUCT)
+        self.index_factory = factory_string
         
-        # Normalize vectors for cosine similarity
+        # Normalize vectors for cosine similarity, in place (FAISS's kernel is
+        # SIMD and multi-threaded; several times faster than a numpy norm + divide)
         faiss.normalize_L2(embeddings)
         
+        # Wider build-time beam gives a better-connected graph
+        if getattr(index, "hnsw", None) is not None:
+            index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+
+        # Quantized indexes learn their codebooks from the data
+        if not index.is_trained:
+            logger.info(f"Training {factory_string} index on {embeddings.shape[0]} vectors")
+            index.train(embeddings)
+        
         # Add vectors to index
         index.add(embeddings)
+        self._configure_index(index)
         
         logger.info(f"Created FAISS index with {index.ntotal} vectors")
         logger.info(f"Index dimension: {dimension}")
-        logger.info(f"Index type: IndexFlatL2 (exact search)")
+        logger.info(f"Index type: {factory_string}")
         
         return index
     
-    def save_index(self, index: faiss.Index, metadata: List[Dict]):
+    def save_index(
+        self,
+        index: faiss.Index,
+        metadata: List[Dict],
+        embeddings: Optional[np.ndarray] = None,
+        texts: Optional[ChunkTexts] = None
+    ):
         """
         Save FAISS index and metadata to disk.
 
         Uses JSONL (JSON Lines) format for metadata instead of pickle.
         More secure, human-readable, and cross-platform compatible.
+        Chunk texts go to texts.bin / text_offsets.npy, which load_index
+        memory-maps.
 
         Args:
             index: FAISS index
             metadata: List of metadata dictionaries
+            embeddings: Normalized float32 embeddings, saved as embeddings.npy
+                for exact reranking (optional)
+            texts: Chunk texts (row i = chunk i); without them the texts are
+                expected in each metadata dict's "text" field
         """
         logger.info(f"Saving index to {self.index_path}")
 
         # Save FAISS index
         index_file = os.path.join(self.index_path, "index.faiss")
+        if self._gpu_resources is not None and hasattr(faiss, "index_gpu_to_cpu"):
+            index = faiss.index_gpu_to_cpu(index)
         faiss.write_index(index, index_file)
         logger.info(f"Saved FAISS index: {index_file}")
 
         # Save metadata as JSONL (JSON Lines)
         # Each line is a separate JSON object (one metadata dict per line)
         metadata_file = os.path.join(self.index_path, "metadata.jsonl")
-        with open(metadata_file, 'w', encoding='utf-8') as f:
-            for meta in metadata:
-                json_line = json.dumps(meta, ensure_ascii=False)
-                f.write(json_line + '\n')
+        self._write_metadata_jsonl(metadata_file, metadata)
         logger.info(f"Saved metadata: {metadata_file} ({len(metadata)} chunks)")
 
+        if texts is not None:
+            texts.save(self.index_path)
+            logger.info(f"Saved chunk texts ({texts.blob.nbytes / 1e6:.1f} MB)")
+
+        # Memory-mappable copy of the metadata (needs pyarrow and uniform rows)
+        arrow_file = os.path.join(self.index_path, METADATA_ARROW_FILE)
+        if texts is not None and write_metadata_arrow(arrow_file, metadata):
+            logger.info(f"Saved metadata: {arrow_file}")
+        elif os.path.exists(arrow_file):
+            os.remove(arrow_file)  # Would be stale next to the new JSONL
+
+        # Save float embeddings sidecar (row i = chunk i)
+        if embeddings is not None:
+            embeddings_file = os.path.join(self.index_path, "embeddings.npy")
+            np.save(embeddings_file, np.ascontiguousarray(embeddings, dtype=np.float32))
+            logger.info(f"Saved embeddings: {embeddings_file}")
+
         # Remove old pickle file if it exists (cleanup after migration)
         old_pickle_file = os.path.join(self.index_path, "metadata.pkl")
         if os.path.exists(old_pickle_file):
@@ -363,19 +962,29 @@ class DelawareCaseLawIndexer:
             "embedding_model": self.embedding_model,
             "dimension": self.dimension,
             "total_vectors": index.ntotal,
-            "index_type": "IndexFlatL2",
+            "index_type": type(index).__name__,
+            "index_factory": self.index_factory,  # Vector encoding, e.g. Flat / SQfp16 / SQ8
+            "metric": "inner_product" if index.metric_type == faiss.METRIC_INNER_PRODUCT else "l2",
             "created_at": datetime.now().isoformat(),
             "total_cases": len(set(m["case_id"] for m in metadata)),
             "total_chunks": len(metadata),
-            "metadata_format": "jsonl"  # Track format version
+            "metadata_format": "jsonl",  # Track format version
+            "text_format": "blob" if texts is not None else "metadata"
         }
 
         config_file = os.path.join(self.index_path, "config.json")
         with open(config_file, 'w', encoding='utf-8') as f:
             json.dump(config, f, indent=2)
+        self.index_version = config["created_at"]
         logger.info(f"Saved configuration: {config_file}")
     
-    def load_index(self) -> Tuple[faiss.Index, List[Dict]]:
+    @staticmethod
+    def _write_metadata_jsonl(path: str, metadata: List[Dict]):
+        """Write one UTF-8 JSON object per line (orjson, no ASCII escaping)."""
+        with open(path, 'wb') as f:
+            f.writelines(orjson.dumps(meta) + b'\n' for meta in metadata)
+
+    def load_index(self, mmap: bool = True, prefetch: bool = True) -> Tuple[faiss.Index, Sequence[Dict]]:
         """
         Load FAISS index and metadata from disk.
 
@@ -383,6 +992,13 @@ class DelawareCaseLawIndexer:
         Automatically migrates from pickle to JSONL if needed.
         Validates index configuration against current embedding model.
 
+        Args:
+            mmap: Memory-map the index read-only instead of reading it into RAM,
+                so multiple worker processes share one copy via the page cache.
+                The index file should be on local disk (not NFS).
+            prefetch: With mmap, hint the OS to read the index and embeddings
+                files into the page cache in the background
+
         Returns:
             Tuple of (index, metadata)
 
@@ -399,23 +1015,47 @@ class DelawareCaseLawIndexer:
         if not os.path.exists(index_file):
             raise IndexNotFoundError(self.index_path)
 
-        index = faiss.read_index(index_file)
-        logger.info(f"Loaded FAISS index with {index.ntotal} vectors")
+        rss_before = _rss_mb()
+        if mmap:
+            try:
+                index = faiss.read_index(
+                    index_file, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+                )
+                if prefetch:
+                    _prefetch_file(index_file)
+            except RuntimeError as e:
+                logger.warning(f"Could not memory-map index, reading it into RAM: {e}")
+                index = faiss.read_index(index_file)
+        else:
+            index = faiss.read_index(index_file)
+        self._configure_index(index)
+        logger.info(
+            f"Loaded FAISS index with {index.ntotal} vectors "
+            f"(mmap={mmap}, RSS {rss_before:.0f} -> {_rss_mb():.0f} MB)"
+        )
 
-        # Load metadata (try JSONL first, fall back to pickle)
+        # Load metadata (memory-mapped Arrow, else JSONL, else legacy pickle)
+        metadata_arrow = os.path.join(self.index_path, METADATA_ARROW_FILE)
         metadata_jsonl = os.path.join(self.index_path, "metadata.jsonl")
         metadata_pickle = os.path.join(self.index_path, "metadata.pkl")
 
-        metadata = []
+        metadata = None
         migrated_from_pickle = False
 
-        if os.path.exists(metadata_jsonl):
+        if os.path.exists(metadata_arrow):
+            metadata = read_metadata_arrow(metadata_arrow)
+            if metadata is not None and "date_filed_int" not in metadata.table.column_names:
+                metadata = None  # Not written by save_index; use the JSONL
+
+        if metadata is not None:
+            # Arrow-backed: rows are materialized only when accessed
+            logger.info(f"Memory-mapped {len(metadata)} chunks from {METADATA_ARROW_FILE}")
+
+        elif os.path.exists(metadata_jsonl):
             # Load from JSONL (preferred format)
             logger.info("Loading metadata from JSONL format")
-            with open(metadata_jsonl, 'r', encoding='utf-8') as f:
-                for line in f:
-                    if line.strip():  # Skip empty lines
-                        metadata.append(json.loads(line))
+            with open(metadata_jsonl, 'rb') as f:
+                metadata = [orjson.loads(line) for line in f if line.strip()]
             logger.info(f"Loaded {len(metadata)} chunks from JSONL")
 
         elif os.path.exists(metadata_pickle):
@@ -427,10 +1067,7 @@ class DelawareCaseLawIndexer:
 
             # Auto-migrate to JSONL
             logger.info("Auto-migrating metadata to JSONL format...")
-            with open(metadata_jsonl, 'w', encoding='utf-8') as f:
-                for meta in metadata:
-                    json_line = json.dumps(meta, ensure_ascii=False)
-                    f.write(json_line + '\n')
+            self._write_metadata_jsonl(metadata_jsonl, metadata)
             logger.info("Migration complete. Pickle file will be kept for backup.")
             migrated_from_pickle = True
 
@@ -440,6 +1077,20 @@ class DelawareCaseLawIndexer:
                 f"Expected either metadata.jsonl or metadata.pkl"
             )
 
+        if not isinstance(metadata, ArrowMetadata):
+            for meta in metadata:
+                # Backfill integer dates for indexes built before they existed
+                if "date_filed_int" not in meta:
+                    meta["date_filed_int"] = date_to_int(meta.get("date_filed"))
+
+        # Chunk texts: memory-mapped buffer, or (older indexes) inline in metadata
+        texts = ChunkTexts.load(self.index_path)
+        if texts is not None and len(texts) != len(metadata):
+            logger.warning("Ignoring texts.bin (chunk count does not match metadata)")
+            texts = None
+        if texts is None:
+            texts = ChunkTexts.from_texts(meta.pop("text", "") for meta in metadata)
+
         # Load and validate configuration
         config_file = os.path.join(self.index_path, "config.json")
         if os.path.exists(config_file):
@@ -462,6 +1113,11 @@ class DelawareCaseLawIndexer:
             logger.info(f"Total cases: {config.get('total_cases')}")
             logger.info(f"Index dimension: {saved_dimension} (validated ✓)")
 
+            self.index_factory = config.get('index_factory')
+            self.index_version = config.get('created_at')
+            if self.index_factory:
+                logger.info(f"Index encoding: {self.index_factory}")
+
             if migrated_from_pickle:
                 # Update config to reflect new format
                 config['metadata_format'] = 'jsonl'
@@ -471,12 +1127,66 @@ class DelawareCaseLawIndexer:
 
         else:
             logger.warning("No config.json found. Consider rebuilding the index.")
+            self.index_version = None
+
+        # Load float embeddings sidecar for exact reranking (optional)
+        embeddings_file = os.path.join(self.index_path, "embeddings.npy")
+        self.embeddings = None
+        if os.path.exists(embeddings_file):
+            if mmap and prefetch:
+                _prefetch_file(embeddings_file)
+            embeddings = np.load(embeddings_file, mmap_mode='r' if mmap else None)
+            if embeddings.shape == (index.ntotal, index.d):
+                self.embeddings = embeddings
+                logger.info(f"Loaded embeddings sidecar {embeddings.shape}")
+            else:
+                logger.warning("Ignoring embeddings.npy (shape does not match index)")
 
         self.index = index
         self.metadata = metadata
+        self.texts = texts
 
         return index, metadata
     
+    def move_to_gpu(self, device: int = 0) -> bool:
+        """
+        Move the loaded index to a GPU for the search path.
+
+        Uses cuVS-backed GPU indexes when the FAISS build supports them.
+        Falls back to the CPU index if FAISS was built without GPU support.
+
+        Args:
+            device: CUDA device number
+
+        Returns:
+            True if the index now lives on the GPU
+        """
+        if self.index is None:
+            raise ValueError("Index not loaded. Call load_index() or build_index() first.")
+
+        if not hasattr(faiss, "StandardGpuResources") or faiss.get_num_gpus() == 0:
+            logger.warning("FAISS GPU support not available, keeping index on CPU")
+            return False
+
+        resources = faiss.StandardGpuResources()
+        resources.setTempMemory(64 << 20)
+        resources.setDefaultNullStreamAllDevices()
+
+        options = faiss.GpuClonerOptions()
+        if hasattr(options, "use_cuvs"):
+            options.use_cuvs = True
+
+        try:
+            self.index = faiss.index_cpu_to_gpu(resources, device, self.index, options)
+        except RuntimeError as e:
+            logger.warning(f"Could not move index to GPU {device}, keeping it on CPU: {e}")
+            return False
+
+        # Resources must outlive the GPU index
+        self._gpu_resources = resources
+        logger.info(f"Moved FAISS index to GPU {device}")
+        return True
+
     def build_index(self, max_cases: Optional[int] = None):
         """
         Build complete FAISS index from case law data.
@@ -488,44 +1198,82 @@ class DelawareCaseLawIndexer:
         logger.info("Building FAISS Index for Delaware Case Law")
         logger.info("=" * 80)
         
-        # Load cases
-        cases = self.load_cases()
+        # Stream cases (only their chunks are kept in memory)
+        cases = self.iter_cases()
         
         if max_cases:
-            cases = cases[:max_cases]
+            cases = itertools.islice(cases, max_cases)
             logger.info(f"Limited to {max_cases} cases for testing")
         
-        # Process cases into chunks
-        texts, metadata = self.process_cases(cases)
-        
-        # Generate embeddings
-        embeddings = self.generate_embeddings(texts, batch_size=100)
+        # Chunk cases and embed the chunks (overlapped)
+        texts, metadata, embeddings = self.process_and_embed(cases, batch_size=100)
         
         # Create FAISS index
         index = self.create_faiss_index(embeddings)
         
         # Save index and metadata
-        self.save_index(index, metadata)
+        chunk_texts = ChunkTexts.from_texts(texts)
+        self.save_index(index, metadata, embeddings, chunk_texts)
         
         # Store in instance
         self.index = index
         self.metadata = metadata
+        self.texts = chunk_texts
+        self.embeddings = embeddings
         
         logger.info("=" * 80)
         logger.info("INDEX BUILD COMPLETE")
         logger.info("=" * 80)
-        logger.info(f"Total cases indexed: {len(cases)}")
+        num_cases = len({m["case_id"] for m in metadata})
+        logger.info(f"Total cases indexed: {num_cases}")
         logger.info(f"Total chunks created: {len(texts)}")
-        logger.info(f"Average chunks per case: {len(texts) / len(cases):.1f}")
+        logger.info(f"Average chunks per case: {len(texts) / max(num_cases, 1):.1f}")
         logger.info(f"Index saved to: {self.index_path}")
         logger.info("=" * 80)
     
+    def embed_query(self, query: str) -> np.ndarray:
+        """
+        Generate a normalized embedding for a query.
+
+        Args:
+            query: Query text
+
+        Returns:
+            L2-normalized query vector of shape (1, dimension), read-only
+            (repeated queries share a cached vector)
+        """
+        query_vector = self._query_vectors.get(query)
+        if query_vector is None:
+            query_vector = self.embed_queries([query])
+            query_vector.setflags(write=False)
+            self._query_vectors.put(query, query_vector)
+        return query_vector
+
+    def embed_queries(self, queries: List[str]) -> np.ndarray:
+        """
+        Generate normalized embeddings for several queries in one API call.
+
+        Args:
+            queries: Query texts (the API accepts up to 2048 per call)
+
+        Returns:
+            L2-normalized query vectors of shape (len(queries), dimension)
+        """
+        query_vectors = self._create_embeddings(queries)
+
+        # Normalize for cosine similarity
+        faiss.normalize_L2(query_vectors)
+
+        return query_vectors
+
     def search(
         self,
         query: str,
         k: int = 4,
         filters: Optional[Dict] = None,
-        retrieve_k: int = 20
+        retrieve_k: int = 20,
+        query_vector: Optional[np.ndarray] = None,
+        mmr_lambda: Optional[float] = None
     ) -> List[Dict]:
         """
         Search the index with optional metadata filtering.
@@ -535,6 +1283,8 @@ class DelawareCaseLawIndexer:
             k: Number of results to return
             filters: Metadata filters (e.g., {"court": "delaware-supreme"})
             retrieve_k: Number to retrieve before filtering
+            query_vector: Precomputed query embedding from embed_query() (skips re-embedding)
+            mmr_lambda: If set, pick k diverse results from the candidates with MMR
             
         Returns:
             List of result dictionaries
@@ -542,44 +1292,369 @@ class DelawareCaseLawIndexer:
         if self.index is None:
             raise ValueError("Index not loaded. Call load_index() or build_index() first.")
 
-        # Generate query embedding using OpenAI API
-        response = self.client.embeddings.create(
-            model=self.embedding_model,
-            input=[query]
+        cache_key = self._search_cache_key(query, k, filters, retrieve_k, mmr_lambda)
+        if cache_key is not None:
+            cached = self._search_cache.get(cache_key)
+            if cached is not None:
+                return list(cached)
+
+        if query_vector is None:
+            query_vector = self.embed_query(query)
+
+        results = self.search_vectors(
+            query_vector, k=k, filters=filters, retrieve_k=retrieve_k, mmr_lambda=mmr_lambda
+        )[0]
+
+        if cache_key is not None:
+            self._search_cache.put(cache_key, results)
+        return list(results)
+
+    @staticmethod
+    def _search_cache_key(
+        query: str,
+        k: int,
+        filters: Optional[Dict],
+        retrieve_k: int,
+        mmr_lambda: Optional[float]
+    ) -> Optional[Tuple]:
+        """Hashable key for a search call (None if the filters can't be serialized)."""
+        try:
+            filters_key = orjson.dumps(filters, option=orjson.OPT_SORT_KEYS) if filters else b""
+        except TypeError:
+            return None
+        return query, k, filters_key, retrieve_k, mmr_lambda
+
+    def search_batch(
+        self,
+        queries: List[str],
+        k: int = 4,
+        filters: Optional[Dict] = None,
+        retrieve_k: int = 20,
+        mmr_lambda: Optional[float] = None
+    ) -> List[List[Dict]]:
+        """
+        Search the index for several queries with one embeddings call and one FAISS call.
+
+        Args:
+            queries: Query texts (the API accepts up to 2048 per call)
+            k: Number of results to return per query
+            filters: Metadata filters applied to every query
+            retrieve_k: Number to retrieve before filtering
+            mmr_lambda: If set, pick k diverse results from the candidates with MMR
+
+        Returns:
+            One list of result dictionaries per query, in input order
+        """
+        if self.index is None:
+            raise ValueError("Index not loaded. Call load_index() or build_index() first.")
+
+        if not queries:
+            return []
+
+        return self.search_vectors(
+            self.embed_queries(queries), k=k, filters=filters,
+            retrieve_k=retrieve_k, mmr_lambda=mmr_lambda
         )
-        query_embedding = response.data[0].embedding
-        query_vector = np.array([query_embedding], dtype=np.float32)
-        
-        # Normalize for cosine similarity
-        faiss.normalize_L2(query_vector)
-        
-        # Search FAISS
-        distances, indices = self.index.search(query_vector, retrieve_k)
-        
-        # Collect results with metadata
-        results = []
-        for idx, dist in zip(indices[0], distances[0]):
-            if idx < len(self.metadata):
-                result = {
-                    "text": self.metadata[idx].get("text", ""),
-                    "metadata": self.metadata[idx],
-                    "score": float(dist),
-                    "similarity": 1 - float(dist)  # Convert distance to similarity
-                }
-                
-                # Apply filters if provided
-                if filters:
-                    if self._matches_filters(result["metadata"], filters):
-                        results.append(result)
-                else:
-                    results.append(result)
-                
-                # Stop if we have enough results
-                if len(results) >= k:
-                    break
-        
-        return results[:k]
+
+    def search_vectors(
+        self,
+        query_vectors: np.ndarray,
+        k: int = 4,
+        filters: Optional[Dict] = None,
+        retrieve_k: int = 20,
+        mmr_lambda: Optional[float] = None
+    ) -> List[List[Dict]]:
+        """
+        Search the index for a batch of query embeddings in a single FAISS call.
+
+        Args:
+            query_vectors: L2-normalized query embeddings of shape (n, dimension)
+            k: Number of results to return per query
+            filters: Metadata filters applied to every query
+            retrieve_k: Number to retrieve before filtering
+            mmr_lambda: If set, pick k diverse results from the candidates with MMR
+
+        Returns:
+            One list of result dictionaries per query, in input order
+        """
+        if self.index is None:
+            raise ValueError("Index not loaded. Call load_index() or build_index() first.")
+
+        # Specialize the filters once for the whole batch
+        prepared = self._prepare_filters(filters) if filters else None
+        candidate_filter = self._compile_filter(prepared)
+
+        subset = self._prefilter(prepared, candidate_filter) if prepared else None
+        if subset is not None:
+            # Selective filter: score only the matching chunks, exactly
+            distances, indices = self._search_subset(query_vectors, subset, retrieve_k)
+        else:
+            # Search FAISS (batched queries use the multi-threaded BLAS path)
+            distances, indices = self.index.search(query_vectors, retrieve_k)
+
+            # Quantized indexes return approximate distances; rerank exactly
+            # (flat and HNSW-flat indexes already score full vectors)
+            if self.embeddings is not None and not isinstance(self.index, (faiss.IndexFlat, faiss.IndexHNSWFlat)):
+                distances, indices = self._rerank(query_vectors, distances, indices)
+
+        # One vectorized pass over the (n, retrieve_k) candidate matrix
+        keep = candidate_filter(indices)
+
+        if mmr_lambda is not None:
+            return [
+                self._collect_diverse_results(
+                    query_vector, row_indices, row_distances, row_keep, k, mmr_lambda
+                )
+                for query_vector, row_indices, row_distances, row_keep
+                in zip(query_vectors, indices, distances, keep)
+            ]
+
+        return [
+            self._collect_results(row_indices[row_keep], row_distances[row_keep], k)
+            for row_indices, row_distances, row_keep in zip(indices, distances, keep)
+        ]
+
+    def _prefilter(
+        self,
+        filters: Dict,
+        candidate_filter: Callable[[np.ndarray], np.ndarray]
+    ) -> Optional[np.ndarray]:
+        """
+        Resolve a selective filter to the chunk ids it matches.
+
+        Numeric filters (date_filed_int ranges) are located by binary search
+        over the sorted column; the remaining filters are applied to those
+        rows only.
+
+        Args:
+            filters: Prepared filter criteria
+            candidate_filter: Compiled predicate for the same filters
+
+        Returns:
+            Matching chunk ids, or None if the filter is not selective enough
+            (or exact vectors are unavailable) and FAISS should be searched
+        """
+        if self.embeddings is None and not isinstance(self.index, faiss.IndexFlat):
+            return None
+
+        ids = self.columns.range_ids(filters)
+        if ids is None or len(ids) > PREFILTER_MAX_CANDIDATES:
+            return None
+
+        return np.sort(ids[candidate_filter(ids)])
+
+    def _search_subset(
+        self,
+        query_vectors: np.ndarray,
+        ids: np.ndarray,
+        retrieve_k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Exact search restricted to a set of chunks.
+
+        Args:
+            query_vectors: L2-normalized query embeddings of shape (n, dimension)
+            ids: Chunk ids to search
+            retrieve_k: Number of candidates to return per query
+
+        Returns:
+            Tuple of (scores, indices) of shape (n, min(retrieve_k, len(ids))),
+            sorted best first, in the index's metric
+        """
+        n, top = len(query_vectors), min(retrieve_k, len(ids))
+        if top == 0:
+            return np.zeros((n, 0), dtype=np.float32), np.zeros((n, 0), dtype=np.int64)
+
+        similarities = (query_vectors @ self._vectors(ids).T).astype(np.float32)
+        order = np.argsort(-similarities, axis=1, kind="stable")[:, :top]
+        similarities = np.take_along_axis(similarities, order, axis=1)
+
+        # Squared L2 between unit vectors for legacy IndexFlatL2 indexes
+        scores = similarities if self._inner_product else 2.0 - 2.0 * similarities
+        return scores, ids[order].astype(np.int64, copy=False)
+
+    def _vectors(self, ids: np.ndarray) -> np.ndarray:
+        """Get the normalized embeddings for chunk ids (sidecar, else the index)."""
+        if self.embeddings is not None:
+            return np.asarray(self.embeddings[ids], dtype=np.float32)
+        return self.index.reconstruct_batch(ids)
+
+    def _collect_diverse_results(
+        self,
+        query_vector: np.ndarray,
+        indices: np.ndarray,
+        distances: np.ndarray,
+        keep: np.ndarray,
+        k: int,
+        mmr_lambda: float
+    ) -> List[Dict]:
+        """
+        Filter one row of FAISS output, then pick k diverse results with MMR.
+
+        Args:
+            query_vector: L2-normalized query embedding of shape (dimension,)
+            indices: Row of FAISS result indices
+            distances: Row of FAISS result distances
+            keep: Row of the candidate filter mask
+            k: Number of results to return
+            mmr_lambda: Relevance/diversity trade-off
+
+        Returns:
+            List of result dictionaries in MMR selection order
+        """
+        keep = np.flatnonzero(keep)
+        if not len(keep):
+            return []
+
+        ids, dists = indices[keep], distances[keep]
+
+        # Candidate similarities via BLAS on the contiguous embeddings
+        vectors = self._vectors(ids)
+        selected = mmr_select(vectors @ query_vector, vectors @ vectors.T, mmr_lambda, k)
+
+        return self._collect_results(ids[selected], dists[selected], k)
+
+    @property
+    def _inner_product(self) -> bool:
+        """Whether the loaded index scores by inner product (indexes built before used L2)."""
+        return self.index.metric_type == faiss.METRIC_INNER_PRODUCT
+
+    def _rerank(
+        self,
+        query_vectors: np.ndarray,
+        distances: np.ndarray,
+        indices: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rerank FAISS candidates by exact score using the embeddings sidecar.
+
+        Args:
+            query_vectors: L2-normalized query embeddings of shape (n, dimension)
+            distances: Approximate scores of shape (n, retrieve_k)
+            indices: Candidate indices of shape (n, retrieve_k), -1 for padding
+
+        Returns:
+            Tuple of (scores, indices) sorted best first, in the index's metric
+        """
+        valid = indices >= 0
+
+        # One gather + batched matmul: (n, k, d) x (n, d) -> (n, k)
+        candidates = self.embeddings[np.where(valid, indices, 0)]
+        similarities = np.einsum("nkd,nd->nk", candidates, query_vectors)
+
+        if self._inner_product:
+            # Sort descending by cosine similarity
+            exact = similarities.astype(np.float32)
+            exact[~valid] = -np.inf
+            order = np.argsort(-exact, axis=1, kind="stable")
+        else:
+            # Squared L2 between unit vectors, matching IndexFlatL2 distances
+            exact = (2.0 - 2.0 * similarities).astype(np.float32)
+            exact[~valid] = np.inf
+            order = np.argsort(exact, axis=1, kind="stable")
+
+        return (
+            np.take_along_axis(exact, order, axis=1),
+            np.take_along_axis(indices, order, axis=1)
+        )
+
+    def _collect_results(
+        self,
+        indices: np.ndarray,
+        distances: np.ndarray,
+        k: int
+    ) -> List[Dict]:
+        """
+        Turn filtered FAISS candidates into result dictionaries.
+
+        Args:
+            indices: Matching result indices, best first
+            distances: Matching result distances
+            k: Number of results to return
+
+        Returns:
+            List of result dictionaries
+        """
+        distances = distances[:k]
+        # Cosine similarity (squared L2 on unit vectors is 2 - 2cos), in one
+        # vectorized step rather than per hit
+        similarities = distances if self._inner_product else 1 - distances / 2
+
+        metadata, texts = self.metadata, self.texts
+        return [
+            {
+                "text": texts[idx] if texts is not None else metadata[idx].get("text", ""),
+                "metadata": metadata[idx],
+                "score": dist,
+                "similarity": similarity
+            }
+            for idx, dist, similarity
+            in zip(indices[:k].tolist(), distances.tolist(), similarities.tolist())
+        ]
+
+    def _compile_filter(self, filters: Optional[Dict]) -> Callable[[np.ndarray], np.ndarray]:
+        """
+        Specialize metadata filters into one vectorized candidate predicate.
+
+        Comparators and column lookups are resolved here, once per search,
+        so applying the result is a handful of numpy operations regardless
+        of how many candidates or queries there are.
+
+        Args:
+            filters: Metadata filters (already prepared), or None
+
+        Returns:
+            Callable mapping FAISS result indices (any shape, -1 for padding)
+            to a boolean mask of the candidates that exist and match
+        """
+        size = len(self.metadata)
+        predicates = []
+        for key, condition in (filters or {}).items():
+            predicate = self.columns.compile(key, condition)
+            if predicate is None:
+                # Non-columnar field (e.g. list values): check row by row
+                predicate = self._row_predicate({key: condition})
+            predicates.append(predicate)
+
+        def candidate_filter(indices: np.ndarray) -> np.ndarray:
+            valid = (indices >= 0) & (indices < size)
+            if predicates:
+                ids = np.where(valid, indices, 0)
+                for predicate in predicates:
+                    valid &= predicate(ids)
+            return valid
+
+        return candidate_filter
+
+    def _row_predicate(self, filters: Dict) -> Callable[[np.ndarray], np.ndarray]:
+        """Wrap per-dict filter matching in the vectorized predicate interface."""
+        def predicate(ids: np.ndarray) -> np.ndarray:
+            return np.array([
+                self._matches_filters(self.metadata[idx], filters)
+                for idx in ids.ravel().tolist()
+            ], dtype=bool).reshape(ids.shape)
+
+        return predicate
     
+    @staticmethod
+    def _prepare_filters(filters: Dict) -> Dict:
+        """
+        Rewrite date_filed range filters to compare YYYYMMDD integers.
+
+        Args:
+            filters: Filter criteria as passed to search
+
+        Returns:
+            Equivalent filters on date_filed_int
+        """
+        date_range = filters.get("date_filed")
+        if not isinstance(date_range, dict):
+            return filters
+
+        prepared = {key: value for key, value in filters.items() if key != "date_filed"}
+        prepared["date_filed_int"] = {op: date_to_int(bound) for op, bound in date_range.items()}
+        return prepared
+
     def _matches_filters(self, metadata: Dict, filters: Dict) -> bool:
         """
         Check if metadata matches filters.
@@ -597,7 +1672,7 @@ class DelawareCaseLawIndexer:
             
             # Handle different filter types
             if isinstance(value, dict):
-                # Range filters (e.g., {"date_filed": {"$gte": "2020-01-01"}})
+                # Range filters (e.g., {"date_filed_int": {"$gte": 20200101}})
                 if "$gte" in value and metadata[key] < value["$gte"]:
                     return False
                 if "$lte" in value and metadata[key] > value["$lte"]:
@@ -618,11 +1693,21 @@ def main():
     """
     Main function to build the index.
     """
+    from .config import get_settings
+
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+    settings = get_settings()
+
     # Initialize indexer
     indexer = DelawareCaseLawIndexer(
-        embedding_model=os.getenv("EMBEDDING_MODEL", "text-embedding-3-small"),
-        index_path=os.getenv("FAISS_INDEX_PATH", "./faiss_index"),
-        data_path=os.getenv("DATA_DIR", "./data/cases") + "/delaware_cases.json"
+        embedding_model=settings.embedding_model,
+        index_path=str(settings.faiss_index_path),
+        data_path=str(settings.data_path),
+        index_type=settings.faiss_index_type,
+        nprobe=settings.faiss_nprobe,
+        ef_search=settings.faiss_ef_search,
+        chunk_workers=settings.chunk_workers,
+        embed_concurrency=settings.embed_concurrency
     )
     
     # Build index
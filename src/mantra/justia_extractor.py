@@ -5,23 +5,89 @@ Extracts Delaware Supreme Court and Court of Chancery cases from Justia.
 More reliable alternative to CourtListener API.
 """
 
-import requests
+import asyncio
+from contextlib import asynccontextmanager
 from bs4 import BeautifulSoup
-import json
+import httpx
+import orjson
 import os
-import time
+import hashlib
 from datetime import datetime
-from typing import List, Dict, Optional
+from functools import lru_cache
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple
 import logging
 import re
+import html
+
+from .http_utils import AsyncRateLimiter, create_async_client, get_with_retries, read_capped
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+# Root logging for the command-line entry point
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# C-backed parser (much faster than html.parser on large case pages); it is
+# given the raw bytes and decodes them per the page's declared encoding
+HTML_PARSER = 'lxml'
+
+# Elements whose contents BeautifulSoup's get_text() leaves out
+NON_TEXT_TAGS = ['script', 'style', 'template']
+
+# Case links on a year index page, matched on the raw bytes (no DOM build);
+# e.g. <a href="/cases/delaware/supreme-court/2024/123/">Name</a>
+_CASE_LINK_RE = re.compile(
+    rb'<a\s[^>]*?href=(["\'])(?P<href>[^"\'>]*?/cases/delaware/(?P<court>[\w-]+)/(?P<year>\d{4})/\d+/[^"\'>]*)\1'
+    rb'[^>]*>(?P<text>.*?)</a\s*>',
+    re.IGNORECASE | re.DOTALL
+)
+_TAG_RE = re.compile(rb'<[^>]*>')
+
+# Case hrefs for the full-parse fallback, per (court, year)
+_HREF_TEMPLATE = r'/cases/delaware/{court}/{year}/\d+/'
+
+
+@lru_cache(maxsize=64)
+def _href_re(court: str, year: int) -> re.Pattern:
+    """Compiled case-href pattern for one court's year index."""
+    return re.compile(_HREF_TEMPLATE.format(court=re.escape(court), year=year))
+
+# Resume checkpoint under output_dir: one JSON file per fetched case, and the
+# URLs whose files are complete
+CASES_SUBDIR = "justia_cases"
+FETCHED_URLS_FILE = ".fetched_urls.txt"
+
+
+def _url_digest(url: str) -> bytes:
+    """Stable digest of a case URL (hash() is salted per process)."""
+    return hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest()
+
+
+def _case_id(url: str) -> int:
+    """
+    Deterministic case ID from the full 64-bit URL digest.
+
+    The top bit is dropped so IDs fit the int64 metadata columns.
+    """
+    return int.from_bytes(_url_digest(url), 'big') >> 1
+
+
+def _lexbor_available() -> bool:
+    """selectolax's Lexbor parser is an optional dependency (mantra[html])."""
+    try:
+        import selectolax.lexbor  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _lexbor_text(node, separator: str = '') -> str:
+    """Text of a selectolax node with BeautifulSoup's get_text(strip=True) semantics."""
+    # Lexbor's strip=True keeps whitespace-only text nodes as empty strings;
+    # drop them as BeautifulSoup does, so they do not add blank lines
+    # (parsed HTML never contains NUL, so it safely delimits the nodes)
+    parts = node.text(deep=True, separator='\0', strip=True).split('\0')
+    return separator.join(part for part in parts if part)
+
 
 class JustiaDelawareExtractor:
     """
@@ -29,6 +95,14 @@ class JustiaDelawareExtractor:
     Focuses on Delaware Supreme Court and Court of Chancery.
     """
 
+    # Concurrency and rate limits for page fetches (Justia is a public site;
+    # stay at about one request per second overall)
+    MAX_CONCURRENT_REQUESTS = 4
+    REQUESTS_PER_SECOND = 1
+
+    # Largest page body kept; opinions are well under this
+    MAX_PAGE_BYTES = 5_000_000
+
     def __init__(self, output_dir: str = "./data/cases"):
         """
         Initialize the extractor.
@@ -42,9 +116,71 @@ class JustiaDelawareExtractor:
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
         }
 
+        # Concurrency and rate limits, created per run by _session()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._limiter: Optional[AsyncRateLimiter] = None
+
+        # Lexbor parses case pages several times faster than BeautifulSoup
+        self.use_lexbor = _lexbor_available()
+        if not self.use_lexbor:
+            logger.info("selectolax not installed; parsing with BeautifulSoup (pip install mantra[html])")
+
         # Create output directory
         os.makedirs(output_dir, exist_ok=True)
 
+        # Cases fetched by earlier runs are not downloaded again
+        self._cases_dir = os.path.join(output_dir, CASES_SUBDIR)
+        self._done_file = os.path.join(output_dir, FETCHED_URLS_FILE)
+        os.makedirs(self._cases_dir, exist_ok=True)
+        self._done = self._load_done()
+
+    def _load_done(self) -> set:
+        """
+        Read the URLs fetched by earlier runs.
+
+        Returns:
+            Set of case URLs whose case files exist
+        """
+        if not os.path.exists(self._done_file):
+            return set()
+
+        with open(self._done_file, encoding='utf-8') as f:
+            urls = {line.strip() for line in f if line.strip()}
+        done = {url for url in urls if os.path.exists(self._case_path(url))}
+        if done:
+            logger.info(f"Resuming: {len(done)} cases already fetched")
+        return done
+
+    def _case_path(self, url: str) -> str:
+        """Checkpoint file for a case URL."""
+        return os.path.join(self._cases_dir, f"{_url_digest(url).hex()}.json")
+
+    def _save_case(self, case_data: Dict):
+        """
+        Write a case to its checkpoint file atomically.
+
+        Args:
+            case_data: Case dictionary from fetch_case_details()
+        """
+        path = self._case_path(case_data['absolute_url'])
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps(case_data))
+        os.replace(tmp_path, path)
+
+    def _load_case(self, url: str) -> Dict:
+        """
+        Read a case saved by an earlier run.
+
+        Args:
+            url: Case URL
+
+        Returns:
+            Case dictionary
+        """
+        with open(self._case_path(url), 'rb') as f:
+            return orjson.loads(f.read())
+
     def get_years_to_fetch(self, start_year: int = 2005) -> List[int]:
         """
         Get list of years to fetch cases from.
@@ -69,27 +205,45 @@ class JustiaDelawareExtractor:
         Returns:
             List of case dictionaries with basic info
         """
+        async def fetch():
+            async with self._session() as client:
+                return await self._fetch_year_index(client, court, year)
+
+        return asyncio.run(fetch())
+
+    async def _fetch_year_index(self, client: httpx.AsyncClient, court: str, year: int) -> List[Dict]:
+        """
+        Fetch the case list for one court and year.
+
+        Args:
+            client: Client from _session()
+            court: Either 'supreme-court' or 'court-of-chancery'
+            year: Year to fetch
+
+        Returns:
+            List of case dictionaries with basic info ([] on errors)
+        """
         url = f"{self.base_url}/cases/delaware/{court}/{year}/"
         logger.info(f"Fetching {court} cases from {year}...")
 
         try:
-            response = requests.get(url, headers=self.headers, timeout=30)
-            response.raise_for_status()
+            content = await self._get(client, url)
 
-            soup = BeautifulSoup(response.text, 'html.parser')
             cases = []
 
             # Find all case links
             # Justia lists cases with links like /cases/delaware/supreme-court/2024/123/
-            case_links = soup.find_all('a', href=re.compile(rf'/cases/delaware/{court}/{year}/\d+/'))
-
-            for link in case_links:
-                case_url = link.get('href')
+            case_links = self._scan_case_links(content, court, year)
+            if not case_links:
+                # Markup may have changed; fall back to a full parse
+                case_links = self._find_links(
+                    content, _href_re(court, year)
+                )
+
+            for case_url, case_name in case_links:
                 if not case_url.startswith('http'):
                     case_url = self.base_url + case_url
 
-                case_name = link.get_text(strip=True)
-
                 cases.append({
                     'url': case_url,
                     'case_name': case_name,
@@ -100,7 +254,7 @@ class JustiaDelawareExtractor:
             logger.info(f"Found {len(cases)} cases for {court} {year}")
             return cases
 
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Error fetching {court} {year}: {e}")
             return []
 
@@ -114,26 +268,38 @@ class JustiaDelawareExtractor:
         Returns:
             Complete case dictionary with full text
         """
+        async def fetch():
+            async with self._session() as client:
+                return await self._fetch_case_details(client, case_info)
+
+        return asyncio.run(fetch())
+
+    async def _fetch_case_details(self, client: httpx.AsyncClient, case_info: Dict) -> Optional[Dict]:
+        """
+        Fetch and parse one case page.
+
+        Args:
+            client: Client from _session()
+            case_info: Basic case info with URL
+
+        Returns:
+            Complete case dictionary with full text (None on errors)
+        """
         url = case_info['url']
         logger.info(f"Fetching case: {case_info['case_name']}")
 
         try:
-            response = requests.get(url, headers=self.headers, timeout=30)
-            response.raise_for_status()
+            content = await self._get(client, url)
 
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # Extract case number/docket
-            docket = ""
-            docket_elem = soup.find('span', class_='docket')
-            if docket_elem:
-                docket = docket_elem.get_text(strip=True)
+            # Parse off the event loop so other fetches keep going
+            page = await asyncio.to_thread(self._parse_case_page, content)
+            docket = page['docket']
+            case_text = page['text']
 
             # Extract decision date
             date_filed = ""
-            date_elem = soup.find('span', class_='date')
-            if date_elem:
-                date_text = date_elem.get_text(strip=True)
+            if page['date'] is not None:
+                date_text = page['date']
                 # Try to parse date
                 try:
                     date_obj = datetime.strptime(date_text, '%B %d, %Y')
@@ -141,29 +307,16 @@ class JustiaDelawareExtractor:
                 except:
                     date_filed = date_text
 
-            # Extract full case text
-            case_text = ""
-            # Justia puts case text in div with class 'entry-content' or similar
-            content_div = soup.find('div', class_=['entry-content', 'case-content'])
-            if content_div:
-                case_text = content_div.get_text(separator='\n', strip=True)
-
-            # If we didn't find content_div, try finding the main content area
-            if not case_text:
-                main_content = soup.find('article') or soup.find('main')
-                if main_content:
-                    case_text = main_content.get_text(separator='\n', strip=True)
-
             # Create complete case dictionary
             case_data = {
-                'id': hash(url) % (10 ** 8),  # Generate simple ID from URL
+                'id': _case_id(url),
                 'case_name': case_info['case_name'],
                 'case_name_full': case_info['case_name'],
                 'docket_number': docket,
                 'date_filed': date_filed,
                 'court': case_info['court'],
                 'plain_text': case_text,
-                'html': str(content_div) if content_div else "",
+                'html': page['html'],
                 'absolute_url': url,
                 'citation_count': 0,
                 'author_str': "",
@@ -180,10 +333,168 @@ class JustiaDelawareExtractor:
 
             return case_data
 
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Error fetching case details: {e}")
             return None
 
+    @asynccontextmanager
+    async def _session(self):
+        """
+        Open a pooled client plus the concurrency and rate limits for a run.
+
+        Connections are kept alive for the whole run and, when h2 is
+        installed, concurrent fetches are multiplexed over one HTTP/2
+        connection (one TLS handshake). Responses are requested gzipped.
+        The limits are created here, inside the running event loop.
+
+        Yields:
+            httpx.AsyncClient for _get()
+        """
+        self._semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+        self._limiter = AsyncRateLimiter(rate=self.REQUESTS_PER_SECOND, period=1)
+        async with create_async_client(
+            headers=self.headers,
+            timeout=30,
+            max_connections=self.MAX_CONCURRENT_REQUESTS,
+            http2=True
+        ) as client:
+            yield client
+
+    async def _get(self, client: httpx.AsyncClient, url: str) -> bytes:
+        """
+        GET a page within the session's limits, retrying transient errors.
+
+        The body is streamed and cut off at MAX_PAGE_BYTES, so concurrent
+        fetches hold at most MAX_CONCURRENT_REQUESTS x MAX_PAGE_BYTES.
+
+        Args:
+            client: Client from _session()
+            url: Page URL
+
+        Returns:
+            Body of the successful response (raises httpx.HTTPStatusError otherwise)
+        """
+        async with self._semaphore, self._limiter:
+            response = await get_with_retries(client, url, stream=True)
+            try:
+                response.raise_for_status()
+                return await read_capped(response, self.MAX_PAGE_BYTES)
+            finally:
+                await response.aclose()
+
+    @staticmethod
+    def _scan_case_links(content: bytes, court: str, year: int) -> List[Tuple[str, str]]:
+        """
+        Extract case links for one court and year with a single regex scan.
+
+        Link text is rebuilt like BeautifulSoup's get_text(strip=True):
+        tags removed, each text piece unescaped and stripped.
+
+        Args:
+            content: Raw year index page body
+            court: Court slug
+            year: Year
+
+        Returns:
+            List of (href, link text) tuples in document order
+        """
+        court_slug, year_text = court.encode(), str(year).encode()
+        links = []
+        for match in _CASE_LINK_RE.finditer(content):
+            if match['court'] != court_slug or match['year'] != year_text:
+                continue
+            pieces = _TAG_RE.split(match['text'])
+            links.append((
+                html.unescape(match['href'].decode('utf-8', 'replace')),
+                ''.join(html.unescape(piece.decode('utf-8', 'replace')).strip() for piece in pieces)
+            ))
+        return links
+
+    def _find_links(self, content: bytes, pattern: re.Pattern) -> List[Tuple[str, str]]:
+        """
+        Find links whose href matches a pattern.
+
+        Args:
+            content: Raw page body
+            pattern: Regex searched in each href
+
+        Returns:
+            List of (href, link text) tuples in document order
+        """
+        if self.use_lexbor:
+            from selectolax.lexbor import LexborHTMLParser
+
+            links = []
+            for link in LexborHTMLParser(content).css('a[href]'):
+                href = link.attributes.get('href') or ''
+                if pattern.search(href):
+                    links.append((href, _lexbor_text(link)))
+            return links
+
+        soup = BeautifulSoup(content, HTML_PARSER)
+        return [
+            (link.get('href'), link.get_text(strip=True))
+            for link in soup.find_all('a', href=pattern)
+        ]
+
+    def _parse_case_page(self, content: bytes) -> Dict[str, Optional[str]]:
+        """
+        Extract the docket, date and opinion text from a case page.
+
+        Args:
+            content: Raw page body
+
+        Returns:
+            Dict with 'docket', 'date' (raw text, None if absent), 'text' and
+            'html' (markup of the content div, "" if absent)
+        """
+        if self.use_lexbor:
+            from selectolax.lexbor import LexborHTMLParser
+
+            tree = LexborHTMLParser(content)
+            docket_elem = tree.css_first('span.docket')
+            date_elem = tree.css_first('span.date')
+            # Justia puts case text in div with class 'entry-content' or similar
+            content_div = tree.css_first('div.entry-content, div.case-content')
+            content_html = content_div.html if content_div else ""
+
+            # Lexbor's text() includes script/style contents; get_text() skips them
+            tree.strip_tags(NON_TEXT_TAGS)
+
+            case_text = _lexbor_text(content_div, '\n') if content_div else ""
+            # If we didn't find content_div, try finding the main content area
+            if not case_text:
+                main_content = tree.css_first('article') or tree.css_first('main')
+                if main_content:
+                    case_text = _lexbor_text(main_content, '\n')
+
+            return {
+                'docket': _lexbor_text(docket_elem) if docket_elem else "",
+                'date': _lexbor_text(date_elem) if date_elem else None,
+                'text': case_text,
+                'html': content_html,
+            }
+
+        soup = BeautifulSoup(content, HTML_PARSER)
+        docket_elem = soup.find('span', class_='docket')
+        date_elem = soup.find('span', class_='date')
+        # Justia puts case text in div with class 'entry-content' or similar
+        content_div = soup.find('div', class_=['entry-content', 'case-content'])
+
+        case_text = content_div.get_text(separator='\n', strip=True) if content_div else ""
+        # If we didn't find content_div, try finding the main content area
+        if not case_text:
+            main_content = soup.find('article') or soup.find('main')
+            if main_content:
+                case_text = main_content.get_text(separator='\n', strip=True)
+
+        return {
+            'docket': docket_elem.get_text(strip=True) if docket_elem else "",
+            'date': date_elem.get_text(strip=True) if date_elem else None,
+            'text': case_text,
+            'html': str(content_div) if content_div else "",
+        }
+
     def fetch_all_cases(self,
                        start_year: int = 2005,
                        max_cases: Optional[int] = None,
@@ -191,105 +502,178 @@ class JustiaDelawareExtractor:
         """
         Fetch all cases from specified courts and years.
 
+        Index pages and case pages are fetched concurrently
+        (MAX_CONCURRENT_REQUESTS at a time, at most REQUESTS_PER_SECOND
+        overall). Each fetched case is checkpointed under output_dir, so a
+        later run (after a crash, or to pick up new cases) only downloads
+        case pages it has not fetched before.
+
+        Args:
+            start_year: Starting year
+            max_cases: Maximum number of cases to fetch (None for all)
+            courts: List of courts to fetch from (default: both)
+
+        Returns:
+            List of case dictionaries (all held in memory; run() streams
+            them from disk instead, see fetch_to_checkpoint())
+        """
+        return list(self.iter_cases(self.fetch_to_checkpoint(start_year, max_cases, courts)))
+
+    def fetch_to_checkpoint(self,
+                            start_year: int = 2005,
+                            max_cases: Optional[int] = None,
+                            courts: List[str] = None) -> List[str]:
+        """
+        Fetch cases like fetch_all_cases(), keeping them only on disk.
+
+        Each case is dropped from memory once its checkpoint file is
+        written; read them back with iter_cases().
+
         Args:
             start_year: Starting year
             max_cases: Maximum number of cases to fetch (None for all)
             courts: List of courts to fetch from (default: both)
 
         Returns:
-            List of case dictionaries
+            URLs of the available cases, in index order
+        """
+        return asyncio.run(self._fetch_all_cases_async(start_year, max_cases, courts))
+
+    def iter_cases(self, urls: Iterable[str]) -> Iterator[Dict]:
         """
+        Lazily read checkpointed cases, one at a time.
+
+        Args:
+            urls: Case URLs from fetch_to_checkpoint()
+
+        Yields:
+            Case dictionaries
+        """
+        for url in urls:
+            yield self._load_case(url)
+
+    async def _fetch_all_cases_async(self,
+                                     start_year: int,
+                                     max_cases: Optional[int],
+                                     courts: Optional[List[str]]) -> List[str]:
         if courts is None:
             courts = ['supreme-court', 'court-of-chancery']
 
         years = self.get_years_to_fetch(start_year)
-        all_cases = []
+        pairs = [(court, year) for year in years for court in courts]
 
         logger.info(f"Fetching cases from {start_year} to {datetime.now().year}")
         logger.info(f"Courts: {', '.join(courts)}")
 
-        # First, get all case URLs
-        case_list = []
-        for year in years:
-            for court in courts:
-                year_cases = self.fetch_year_index(court, year)
-                case_list.extend(year_cases)
-
-                # Rate limiting
-                time.sleep(1)
+        async with self._session() as client:
+            # First, get all case URLs. With a limit, index pages are requested
+            # a window at a time (in year order) so fetching stops early
+            case_list = []
+            window = self.MAX_CONCURRENT_REQUESTS if max_cases else len(pairs)
+            for start in range(0, len(pairs), max(window, 1)):
+                indexes = await asyncio.gather(*[
+                    self._fetch_year_index(client, court, year)
+                    for court, year in pairs[start:start + window]
+                ])
+                for year_cases in indexes:
+                    case_list.extend(year_cases)
 
                 if max_cases and len(case_list) >= max_cases:
                     case_list = case_list[:max_cases]
                     break
 
-            if max_cases and len(case_list) >= max_cases:
-                break
+            pending = [case_info for case_info in case_list if case_info['url'] not in self._done]
+            logger.info(
+                f"Found {len(case_list)} total cases, "
+                f"{len(case_list) - len(pending)} already fetched, {len(pending)} to fetch"
+            )
 
-        logger.info(f"Found {len(case_list)} total cases to fetch")
+            # Now fetch full details for each case
+            fetched = 0
+            done = 0
 
-        # Now fetch full details for each case
-        for i, case_info in enumerate(case_list, 1):
-            logger.info(f"Progress: {i}/{len(case_list)}")
+            # Line-buffered, so every completed case is recorded immediately
+            with open(self._done_file, 'a', encoding='utf-8', buffering=1) as done_file:
+                async def fetch_case(case_info: Dict):
+                    nonlocal done, fetched
+                    case_data = await self._fetch_case_details(client, case_info)
+                    done += 1
+                    logger.info(f"Progress: {done}/{len(pending)}")
+                    if case_data:
+                        await asyncio.to_thread(self._save_case, case_data)
+                        done_file.write(case_info['url'] + '\n')
+                        self._done.add(case_info['url'])
+                        fetched += 1
 
-            case_data = self.fetch_case_details(case_info)
-            if case_data:
-                all_cases.append(case_data)
+                await asyncio.gather(*[fetch_case(case_info) for case_info in pending])
 
-            # Rate limiting - be respectful
-            time.sleep(2)
+        logger.info(f"Successfully fetched {fetched} cases")
 
-            # Check max_cases limit
-            if max_cases and len(all_cases) >= max_cases:
-                break
+        return [case_info['url'] for case_info in case_list if case_info['url'] in self._done]
 
-        logger.info(f"Successfully fetched {len(all_cases)} cases")
-        return all_cases
-
-    def save_to_json(self, cases: List[Dict], filename: str = "delaware_cases.json"):
+    def save_to_json(self, cases: Iterable[Dict], filename: str = "delaware_cases.json"):
         """
-        Save cases to JSON file.
+        Save cases as line-delimited JSON (one case per line).
+
+        Cases are written as they are read, so an iterator such as
+        iter_cases() is never materialized.
 
         Args:
-            cases: List of case dictionaries
+            cases: Iterable of case dictionaries
             filename: Output filename
         """
         filepath = os.path.join(self.output_dir, filename)
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(cases, f, indent=2, ensure_ascii=False)
+        count = 0
+        with open(filepath, 'wb') as f:
+            for case in cases:
+                # orjson emits UTF-8 bytes directly
+                f.write(orjson.dumps(case))
+                f.write(b'\n')
+                count += 1
 
-        logger.info(f"Saved {len(cases)} cases to {filepath}")
+        logger.info(f"Saved {count} cases to {filepath}")
 
-    def generate_summary_stats(self, cases: List[Dict]) -> Dict:
+    def generate_summary_stats(self, cases: Iterable[Dict]) -> Dict:
         """
-        Generate summary statistics.
+        Generate summary statistics in a single pass.
 
         Args:
-            cases: List of case dictionaries
+            cases: Iterable of case dictionaries
 
         Returns:
             Statistics dictionary
         """
-        if not cases:
-            return {}
-
-        stats = {
-            'total_cases': len(cases),
-            'date_range': {
-                'earliest': min(c.get('date_filed', '9999') for c in cases if c.get('date_filed')),
-                'latest': max(c.get('date_filed', '0000') for c in cases if c.get('date_filed'))
-            },
-            'total_words': sum(c.get('word_count', 0) for c in cases),
-            'avg_words_per_case': sum(c.get('word_count', 0) for c in cases) / len(cases),
-            'courts': {}
-        }
+        total_cases = total_words = 0
+        earliest = latest = None
+        courts: Dict[str, int] = {}
 
-        # Count by court
         for case in cases:
+            total_cases += 1
+            total_words += case.get('word_count', 0)
+
+            date_filed = case.get('date_filed')
+            if date_filed:
+                # ISO dates order as strings
+                if earliest is None or date_filed < earliest:
+                    earliest = date_filed
+                if latest is None or date_filed > latest:
+                    latest = date_filed
+
+            # Count by court
             court = case.get('court', 'Unknown')
-            stats['courts'][court] = stats['courts'].get(court, 0) + 1
+            courts[court] = courts.get(court, 0) + 1
 
-        return stats
+        if not total_cases:
+            return {}
+
+        return {
+            'total_cases': total_cases,
+            'date_range': {'earliest': earliest, 'latest': latest},
+            'total_words': total_words,
+            'avg_words_per_case': total_words / total_cases,
+            'courts': courts
+        }
 
     def run(self, start_year: int = 2005, max_cases: Optional[int] = None):
         """
@@ -303,21 +687,21 @@ class JustiaDelawareExtractor:
         logger.info("Justia Delaware Case Law Extractor")
         logger.info("=" * 80)
 
-        # Fetch cases
-        cases = self.fetch_all_cases(start_year=start_year, max_cases=max_cases)
+        # Fetch cases (kept on disk, not in memory)
+        urls = self.fetch_to_checkpoint(start_year=start_year, max_cases=max_cases)
 
-        if not cases:
+        if not urls:
             logger.warning("No cases fetched. Exiting.")
             return
 
-        # Save to JSON
-        self.save_to_json(cases)
+        # Save to JSON, streaming one case at a time
+        self.save_to_json(self.iter_cases(urls))
 
         # Generate statistics
-        stats = self.generate_summary_stats(cases)
+        stats = self.generate_summary_stats(self.iter_cases(urls))
         stats_file = os.path.join(self.output_dir, "summary_stats.json")
-        with open(stats_file, 'w', encoding='utf-8') as f:
-            json.dump(stats, f, indent=2)
+        with open(stats_file, 'wb') as f:
+            f.write(orjson.dumps(stats, option=orjson.OPT_INDENT_2))
 
         logger.info("=" * 80)
         logger.info("EXTRACTION COMPLETE")
@@ -336,6 +720,8 @@ def main():
     """
     Main function to run the extractor.
     """
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+
     extractor = JustiaDelawareExtractor(output_dir="./data/cases")
 
     # Run extraction
@@ -0,0 +1,270 @@
+"""
+Column-oriented chunk metadata for Mantra.
+Stores each filterable metadata field as one numpy array (struct of arrays) so
+search filters are evaluated with vectorized comparisons over candidate ids
+instead of walking one metadata dict per hit.
+"""
+
+import logging
+import operator
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Range operators accepted in search filters
+RANGE_OPS: Dict[str, Callable[[Any, Any], bool]] = {
+    "$gte": operator.ge,
+    "$lte": operator.le,
+    "$gt": operator.gt,
+    "$lt": operator.lt,
+}
+
+# Never filtered on, and by far the largest field
+_SKIPPED_FIELDS = frozenset({"text"})
+
+_MISSING = object()
+
+
+class _NumericColumn:
+    """Integer/float field: values plus a presence mask."""
+
+    __slots__ = ("values", "present", "_order", "_sorted")
+
+    def __init__(self, values: np.ndarray, present: np.ndarray):
+        self.values = values
+        self.present = present
+        self._order: Optional[np.ndarray] = None   # argsort of values, built on demand
+        self._sorted: Optional[np.ndarray] = None
+
+    def range_ids(self, condition: Any) -> Optional[np.ndarray]:
+        """
+        Rows matching the condition, found by binary search over sorted values.
+
+        Returns None for conditions without a bound (nothing to narrow by).
+        """
+        if isinstance(condition, dict):
+            bounds = [(op, bound) for op, bound in condition.items() if op in RANGE_OPS]
+        else:
+            bounds = [("$gte", condition), ("$lte", condition)]
+        if not bounds:
+            return None
+        if not all(isinstance(bound, (int, float)) for _, bound in bounds):
+            return np.zeros(0, dtype=np.int64)
+
+        if self._order is None:
+            self._order = np.argsort(self.values, kind="stable")
+            self._sorted = self.values[self._order]
+
+        lo, hi = 0, len(self._sorted)
+        for op, bound in bounds:
+            if op == "$gte":
+                lo = max(lo, int(np.searchsorted(self._sorted, bound, side="left")))
+            elif op == "$gt":
+                lo = max(lo, int(np.searchsorted(self._sorted, bound, side="right")))
+            elif op == "$lte":
+                hi = min(hi, int(np.searchsorted(self._sorted, bound, side="right")))
+            else:  # $lt
+                hi = min(hi, int(np.searchsorted(self._sorted, bound, side="left")))
+
+        ids = self._order[lo:max(lo, hi)]
+        return ids[self.present[ids]]
+
+    def compile(self, condition: Any) -> Callable[[np.ndarray], np.ndarray]:
+        """Specialize the condition into a vectorized predicate over row ids."""
+        if isinstance(condition, dict):
+            bounds = [(RANGE_OPS[op], bound) for op, bound in condition.items() if op in RANGE_OPS]
+            if not all(isinstance(bound, (int, float)) for _, bound in bounds):
+                return _never
+        elif isinstance(condition, (int, float)):
+            bounds = [(operator.eq, condition)]
+        else:
+            return _never
+
+        values, present = self.values, self.present
+
+        def predicate(ids: np.ndarray) -> np.ndarray:
+            mask = present[ids]
+            for compare, bound in bounds:
+                mask &= compare(values[ids], bound)
+            return mask
+
+        return predicate
+
+
+class _CategoricalColumn:
+    """Any other hashable field: per-row codes into a vocabulary (-1 = missing)."""
+
+    __slots__ = ("codes", "vocabulary")
+
+    def __init__(self, codes: np.ndarray, vocabulary: List[Any]):
+        self.codes = codes
+        self.vocabulary = vocabulary
+
+    def compile(self, condition: Any) -> Callable[[np.ndarray], np.ndarray]:
+        """Specialize the condition into a vectorized predicate over row ids."""
+        # Evaluate the condition once per distinct value, then gather by code
+        lookup = np.zeros(len(self.vocabulary) + 1, dtype=bool)  # Last slot: missing
+        for code, value in enumerate(self.vocabulary):
+            lookup[code] = _matches(value, condition)
+        codes = self.codes
+
+        return lambda ids: lookup[codes[ids]]
+
+
+def _never(ids: np.ndarray) -> np.ndarray:
+    return np.zeros(np.shape(ids), dtype=bool)
+
+
+def _is_number(value: Any) -> bool:
+    return type(value) in (int, float)
+
+
+def _matches(value: Any, condition: Any) -> bool:
+    """Scalar predicate with the same semantics as per-dict filtering."""
+    if isinstance(condition, dict):
+        try:
+            return all(
+                RANGE_OPS[op](value, bound)
+                for op, bound in condition.items() if op in RANGE_OPS
+            )
+        except TypeError:
+            return False  # Incomparable types (e.g. None vs int) never match
+    return value == condition
+
+
+class MetadataColumns:
+    """
+    Struct-of-arrays view over a list of chunk metadata dicts.
+
+    Fields whose values are all plain ints/floats become numeric arrays;
+    other hashable fields are dictionary-encoded. Fields holding unhashable
+    values (lists, dicts) are not columnar and report no column.
+    """
+
+    def __init__(self, metadata: List[Dict]):
+        """
+        Build columns for every filterable field in the metadata.
+
+        Args:
+            metadata: Chunk metadata dicts (row i = chunk i)
+        """
+        self.size = len(metadata)
+        self._columns: Dict[str, Any] = {}
+
+        self._fields = {key for meta in metadata for key in meta}
+        for field in self._fields - _SKIPPED_FIELDS:
+            column = self._build_column([meta.get(field, _MISSING) for meta in metadata])
+            if column is not None:
+                self._columns[field] = column
+
+        logger.info(f"Built {len(self._columns)} metadata columns over {self.size} chunks")
+
+    @classmethod
+    def from_arrow(cls, table) -> "MetadataColumns":
+        """
+        Build columns straight from Arrow-backed metadata (no per-row dicts).
+
+        Null-free numeric columns are used as-is; other flat columns are
+        dictionary-encoded (nulls become a None vocabulary entry, like a
+        None value in a dict). Nested columns are left for per-row checks.
+
+        Args:
+            table: pyarrow.Table with one row per chunk and no missing fields
+
+        Returns:
+            MetadataColumns over the table
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        self = cls.__new__(cls)
+        self.size = table.num_rows
+        self._columns = {}
+        self._fields = set(table.column_names)
+
+        for field in self._fields - _SKIPPED_FIELDS:
+            column = table.column(field)
+            kind = column.type
+            if pa.types.is_nested(kind):
+                continue
+            if (pa.types.is_integer(kind) or pa.types.is_floating(kind)) and column.null_count == 0:
+                dtype = np.int64 if pa.types.is_integer(kind) else np.float64
+                values = column.to_numpy().astype(dtype, copy=False)
+                self._columns[field] = _NumericColumn(values, np.ones(self.size, dtype=bool))
+                continue
+
+            encoded = pc.dictionary_encode(column, null_encoding="encode").combine_chunks()
+            codes = encoded.indices.to_numpy(zero_copy_only=False).astype(np.int32, copy=False)
+            self._columns[field] = _CategoricalColumn(codes, encoded.dictionary.to_pylist())
+
+        logger.info(f"Built {len(self._columns)} metadata columns over {self.size} chunks (Arrow)")
+        return self
+
+    @staticmethod
+    def _build_column(values: List[Any]) -> Optional[Any]:
+        present = np.fromiter((v is not _MISSING for v in values), dtype=bool, count=len(values))
+        observed = [v for v in values if v is not _MISSING]
+
+        if observed and all(_is_number(v) for v in observed):
+            dtype = np.int64 if all(type(v) is int for v in observed) else np.float64
+            filled = np.zeros(len(values), dtype=dtype)
+            filled[present] = observed
+            return _NumericColumn(filled, present)
+
+        vocabulary: Dict[Any, int] = {}
+        codes = np.full(len(values), -1, dtype=np.int32)
+        try:
+            for i, value in enumerate(values):
+                if value is not _MISSING:
+                    codes[i] = vocabulary.setdefault(value, len(vocabulary))
+        except TypeError:
+            return None  # Unhashable values
+
+        return _CategoricalColumn(codes, list(vocabulary))
+
+    def range_ids(self, filters: Dict[str, Any]) -> Optional[np.ndarray]:
+        """
+        Rows matching the most selective numeric filter, without a full scan.
+
+        Only numeric columns are considered (e.g. date_filed_int ranges);
+        the other filters still have to be applied to the returned rows.
+
+        Args:
+            filters: Filter criteria (already prepared)
+
+        Returns:
+            Row ids (unordered), or None if no filter narrows by a numeric bound
+        """
+        best = None
+        for field, condition in filters.items():
+            column = self._columns.get(field)
+            if isinstance(column, _NumericColumn):
+                ids = column.range_ids(condition)
+                if ids is not None and (best is None or len(ids) < len(best)):
+                    best = ids
+        return best
+
+    def compile(self, field: str, condition: Any) -> Optional[Callable[[np.ndarray], np.ndarray]]:
+        """
+        Specialize one filter condition into a vectorized predicate.
+
+        Comparators and lookup tables are built here, once, so the returned
+        callable is only numpy gathers and comparisons. Rows without the
+        field never match.
+
+        Args:
+            field: Metadata field
+            condition: Exact value, or dict of range operators ($gte, $lte, $gt, $lt)
+
+        Returns:
+            Callable mapping row ids (any shape) to a boolean array of the same
+            shape, or None if the field is not columnar and must be checked per row
+        """
+        column = self._columns.get(field)
+        if column is not None:
+            return column.compile(condition)
+        if field not in self._fields:
+            return _never
+        return None
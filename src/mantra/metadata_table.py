@@ -0,0 +1,115 @@
+"""
+Memory-mapped chunk metadata for Mantra.
+Saves index metadata as an Arrow IPC file next to metadata.jsonl; loading
+maps it instead of parsing one dict per chunk, and rows are materialized
+only for the hits a search returns. Requires the optional pyarrow
+dependency (pip install mantra[parquet]).
+"""
+
+import logging
+from collections import abc
+from typing import Dict, Iterator, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+METADATA_ARROW_FILE = "metadata.arrow"
+
+
+class ArrowMetadata(abc.Sequence):
+    """
+    Read-only sequence of chunk metadata dicts backed by a pyarrow Table.
+
+    Row i is converted to a dict on access; column data stays in the
+    memory-mapped file until touched.
+    """
+
+    def __init__(self, table):
+        """
+        Wrap a table.
+
+        Args:
+            table: pyarrow.Table with one row per chunk
+        """
+        self.table = table
+
+    def __len__(self) -> int:
+        return self.table.num_rows
+
+    def __getitem__(self, i: int) -> Dict:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self.table.slice(i, 1).to_pylist()[0]
+
+    def __iter__(self) -> Iterator[Dict]:
+        for batch in self.table.to_batches():
+            yield from batch.to_pylist()
+
+
+def write_metadata_arrow(path: str, metadata: Sequence[Dict]) -> bool:
+    """
+    Write metadata as an Arrow IPC file.
+
+    Only uniform metadata is written: every row must have the same fields
+    and each field a consistent type, so that nulls are exactly the
+    rows' None values and rows read back unchanged.
+
+    Args:
+        path: Output file
+        metadata: Chunk metadata dicts
+
+    Returns:
+        True if the file was written
+    """
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return False
+
+    if not metadata:
+        return False
+
+    fields = list(metadata[0])
+    if any(list(meta) != fields for meta in metadata):
+        logger.info("Metadata fields differ between chunks; not writing metadata.arrow")
+        return False
+
+    for field in fields:
+        kinds = {type(meta[field]) for meta in metadata} - {type(None)}
+        if len(kinds) > 1 or dict in kinds:
+            logger.info(f"Metadata field {field!r} has mixed types; not writing metadata.arrow")
+            return False
+
+    try:
+        table = pa.Table.from_pylist(list(metadata))
+    except (pa.ArrowException, TypeError, ValueError) as e:
+        logger.info(f"Metadata is not tabular ({e}); not writing metadata.arrow")
+        return False
+
+    # One record batch keeps every column a single contiguous array
+    with pa.OSFile(path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=max(table.num_rows, 1))
+    return True
+
+
+def read_metadata_arrow(path: str) -> Optional[ArrowMetadata]:
+    """
+    Memory-map metadata written by write_metadata_arrow().
+
+    Args:
+        path: Arrow IPC file
+
+    Returns:
+        ArrowMetadata, or None if pyarrow is not installed
+    """
+    try:
+        import pyarrow as pa
+    except ImportError:
+        logger.warning("pyarrow not installed; reading metadata.jsonl instead (pip install mantra[parquet])")
+        return None
+
+    table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+    return ArrowMetadata(table)
+
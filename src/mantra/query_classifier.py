@@ -3,17 +3,79 @@ Query Classification and Validation Component.
 Determines if queries are relevant to Delaware case law.
 """
 
-import os
+import re
 import logging
-from typing import Dict, Tuple
+import orjson
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from openai import OpenAI
-from dotenv import load_dotenv
 
-load_dotenv()
+from .clients import get_openai_client
+from .utils import LRUCache
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Classifications kept per classifier, keyed on normalized query text
+CLASSIFICATION_CACHE_SIZE = 4096
+
+# Ambiguous queries sent to the LLM per classify_queries() request
+CLASSIFY_BATCH_SIZE = 20
+
+# Tokens as delimited by regex word boundaries
+_WORD_RE = re.compile(r"\w+")
+
+
+def _build_automaton(patterns: Iterable[Tuple[str, Any]]):
+    """
+    Build an Aho-Corasick automaton matching all patterns in one scan.
+
+    Args:
+        patterns: (pattern, value) pairs; values of repeated patterns are grouped
+
+    Returns:
+        ahocorasick.Automaton whose values are lists, or None if pyahocorasick
+        is not installed
+    """
+    try:
+        import ahocorasick
+    except ImportError:
+        return None
+
+    values: Dict[str, List[Any]] = {}
+    for pattern, value in patterns:
+        values.setdefault(pattern, []).append(value)
+
+    automaton = ahocorasick.Automaton()
+    for pattern, pattern_values in values.items():
+        automaton.add_word(pattern, (pattern, pattern_values))
+    automaton.make_automaton()
+    return automaton
+
+
+def _is_word_boundary(text: str, i: int) -> bool:
+    """Whether position i (just outside a match) is not a word character."""
+    return i < 0 or i >= len(text) or not (text[i].isalnum() or text[i] == "_")
+
+
+def _whole_word_matches(automaton, text: str) -> Iterator[List[Any]]:
+    """Values of the automaton's patterns found in text as whole words/phrases."""
+    for end, (pattern, values) in automaton.iter(text):
+        if _is_word_boundary(text, end - len(pattern)) and _is_word_boundary(text, end + 1):
+            yield values
+
+
+def _word_regex(words: Iterable[str]) -> "re.Pattern":
+    """
+    Compile one regex matching any of the words as a whole word/phrase.
+
+    Args:
+        words: Lowercase words or phrases
+
+    Returns:
+        Compiled pattern (longest alternatives first)
+    """
+    alternation = "|".join(re.escape(word) for word in sorted(words, key=len, reverse=True))
+    return re.compile(rf"\b(?:{alternation})\b")
+
 
 class QueryClassifier:
     """
@@ -21,7 +83,7 @@ class QueryClassifier:
     """
     
     # Legal terms that indicate relevance
-    LEGAL_KEYWORDS = {
+    LEGAL_KEYWORDS = frozenset({
         # Corporate law concepts
         "fiduciary", "duty", "care", "loyalty", "good faith",
         "entire fairness", "business judgment", "revlon", "corwin", "caremark",
@@ -50,17 +112,67 @@ class QueryClassifier:
         # Case law
         "precedent", "case law", "opinion", "ruling", "holding",
         "decision", "judgment", "appeal"
+    })
+
+    # Topic mappings for suggested topics
+    TOPIC_KEYWORDS = {
+        "fiduciary duty": ["fiduciary", "duty of care", "duty of loyalty"],
+        "business judgment rule": ["business judgment", "bjr"],
+        "entire fairness": ["entire fairness", "fair dealing", "fair price"],
+        "revlon": ["revlon", "sale of control"],
+        "corwin": ["corwin", "stockholder vote"],
+        "caremark": ["caremark", "oversight", "monitoring"],
+        "appraisal": ["appraisal", "fair value"],
+        "section 220": ["section 220", "books and records", "220"],
+        "merger": ["merger", "acquisition", "m&a"],
+        "shareholder rights": ["shareholder", "stockholder", "voting"],
     }
+
+    # Fallback matchers when pyahocorasick is not installed. Single-word
+    # keywords are found with one set intersection over the query's tokens;
+    # only the phrases ("good faith", "de-spac", ...) need a search each
+    _SINGLE_WORD_KEYWORDS = frozenset(k for k in LEGAL_KEYWORDS if _WORD_RE.fullmatch(k))
+    _PHRASE_KEYWORDS = tuple(
+        (k, _word_regex([k])) for k in sorted(LEGAL_KEYWORDS - _SINGLE_WORD_KEYWORDS)
+    )
+    _TOPIC_RES = {topic: _word_regex(keywords) for topic, keywords in TOPIC_KEYWORDS.items()}
     
-    def __init__(self, model: str = "gpt-4"):
+    def __init__(
+        self,
+        model: str = "gpt-4o-mini",
+        tokenizer=None,
+        max_query_tokens: int = 512,
+        client: Optional[OpenAI] = None
+    ):
         """
         Initialize the classifier.
 
         Args:
             model: OpenAI model to use for classification
+            tokenizer: Shared tiktoken encoding used to enforce max_query_tokens
+            max_query_tokens: Longest query (in tokens) sent to the LLM classifier
+            client: OpenAI client (defaults to the shared pooled client)
         """
         self.model = model
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.tokenizer = tokenizer
+        self.max_query_tokens = max_query_tokens
+        self.client = client or get_openai_client()
+
+        # Repeated queries skip keyword scanning and the LLM call
+        self._classifications = LRUCache(CLASSIFICATION_CACHE_SIZE)
+
+        # Aho-Corasick automatons find every keyword in one pass over the
+        # query (pip install mantra[keywords]); without pyahocorasick the
+        # compiled word regexes are used
+        self._keyword_automaton = _build_automaton(
+            (keyword, keyword) for keyword in self.LEGAL_KEYWORDS
+        )
+        self._topic_automaton = _build_automaton(
+            (keyword, topic)
+            for topic, keywords in self.TOPIC_KEYWORDS.items() for keyword in keywords
+        )
+        if self._keyword_automaton is None:
+            logger.info("pyahocorasick not installed; using regex keyword matching")
 
         # Classification system prompt
         self.system_prompt = """You are a legal query classifier for a Delaware corporate law chatbot.
@@ -88,30 +200,217 @@ Respond with a JSON object containing:
 - "suggested_topics": list of relevant legal topics if relevant, empty list if not
 
 Example responses:
-{{"relevant": true, "confidence": 0.95, "reason": "Query asks about fiduciary duty, a core Delaware corporate law concept", "suggested_topics": ["fiduciary duty", "duty of care"]}}
-{{"relevant": false, "confidence": 0.99, "reason": "Query is a personal question unrelated to law", "suggested_topics": []}}
+{"relevant": true, "confidence": 0.95, "reason": "Query asks about fiduciary duty, a core Delaware corporate law concept", "suggested_topics": ["fiduciary duty", "duty of care"]}
+{"relevant": false, "confidence": 0.99, "reason": "Query is a personal question unrelated to law", "suggested_topics": []}
 """
     
     def classify_query(self, query: str) -> Dict:
         """
         Classify a query as relevant or irrelevant.
+
+        Results are cached on the query's normalized text (lowercased,
+        whitespace collapsed), except fallbacks after a failed LLM call.
         
         Args:
             query: User query string
             
+        Returns:
+            Dictionary with classification results
+        """
+        # Lowered and split once; the keyword helpers share it
+        tokens = query.lower().split()
+        key = " ".join(tokens)
+        result = self._classifications.get(key)
+        if result is None:
+            result = self._classify(query, key, tokens)
+            if result.get("method") != "keyword_fallback":
+                self._classifications.put(key, result)
+
+        # Callers get their own copy of the cached dict
+        return dict(result)
+
+    def classify_queries(self, queries: List[str], batch_size: int = CLASSIFY_BATCH_SIZE) -> List[Dict]:
+        """
+        Classify several queries, sending the ambiguous ones to the LLM together.
+
+        Keyword-decided and cached queries never reach the LLM; the rest are
+        classified batch_size at a time with one request per batch.
+
+        Args:
+            queries: User query strings
+            batch_size: Maximum number of queries per LLM request
+
+        Returns:
+            One classification dict per query, in input order
+        """
+        results: List[Optional[Dict]] = [None] * len(queries)
+        pending: Dict[str, List[int]] = {}  # normalized query -> positions
+        scores: Dict[str, float] = {}
+
+        for i, query in enumerate(queries):
+            tokens = query.lower().split()
+            key = " ".join(tokens)
+            cached = self._classifications.get(key)
+            if cached is not None:
+                results[i] = dict(cached)
+                continue
+            if key in pending:
+                pending[key].append(i)
+                continue
+
+            keyword_score = self._keyword_relevance_score(key, tokens)
+            decided = self._keyword_decision(key, keyword_score)
+            if decided is not None:
+                self._classifications.put(key, decided)
+                results[i] = dict(decided)
+            else:
+                pending[key] = [i]
+                scores[key] = keyword_score
+
+        keys = list(pending)
+        for start in range(0, len(keys), batch_size):
+            batch = keys[start:start + batch_size]
+            batch_queries = [queries[pending[key][0]] for key in batch]
+            classified = self._llm_classify_batch(batch_queries, batch, [scores[key] for key in batch])
+            for key, result in zip(batch, classified):
+                if result.get("method") != "keyword_fallback":
+                    self._classifications.put(key, result)
+                for i in pending[key]:
+                    results[i] = dict(result)
+
+        return results
+
+    def _classify(self, query: str, query_lower: str, tokens: List[str]) -> Dict:
+        """
+        Classify a query without consulting the cache.
+
+        Args:
+            query: User query string
+            query_lower: Lowercased query, whitespace collapsed
+            tokens: query_lower split on whitespace
+
         Returns:
             Dictionary with classification results
         """
         # Quick keyword check first
-        keyword_score = self._keyword_relevance_score(query)
+        keyword_score = self._keyword_relevance_score(query_lower, tokens)
+        decided = self._keyword_decision(query_lower, keyword_score)
+        if decided is not None:
+            return decided
         
+        # Use LLM for ambiguous cases
+        return self._llm_classify(query, query_lower, keyword_score)
+
+    def _llm_classify(self, query: str, query_lower: str, keyword_score: float) -> Dict:
+        """
+        Classify one ambiguous query with the LLM.
+
+        Args:
+            query: User query string
+            query_lower: Lowercased query, whitespace collapsed
+            keyword_score: Keyword relevance score, used if the call fails
+
+        Returns:
+            Dictionary with classification results
+        """
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": self.system_prompt},
+                    {"role": "user", "content": self._truncate_query(query)}
+                ],
+                temperature=0,
+                # JSON mode: the reply is always a parseable JSON object
+                response_format={"type": "json_object"}
+            )
+
+            result = orjson.loads(response.choices[0].message.content)
+            result["method"] = "llm"
+
+            return result
+
+        except Exception as e:
+            logger.error(f"Error in LLM classification: {e}")
+            return self._keyword_fallback(query_lower, keyword_score)
+
+    def _llm_classify_batch(
+        self,
+        queries: List[str],
+        lowered: List[str],
+        keyword_scores: List[float]
+    ) -> List[Dict]:
+        """
+        Classify ambiguous queries with a single LLM request.
+
+        JSON mode only returns objects, so the model is asked for
+        {"results": [...]} with one classification per query.
+
+        Args:
+            queries: Queries the keyword check could not decide
+            lowered: Each query lowercased, whitespace collapsed
+            keyword_scores: Keyword relevance score of each query
+
+        Returns:
+            One classification dict per query, in input order
+        """
+        if len(queries) == 1:
+            return [self._llm_classify(queries[0], lowered[0], keyword_scores[0])]
+
+        numbered = "\n".join(
+            f"{n}. {orjson.dumps(self._truncate_query(query)).decode()}"
+            for n, query in enumerate(queries, 1)
+        )
+        prompt = (
+            f"Classify each of the following {len(queries)} queries. Respond with a JSON "
+            f'object {{"results": [...]}} holding one classification object per query, '
+            f"in the same order.\n\n{numbered}"
+        )
+
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": self.system_prompt},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0,
+                response_format={"type": "json_object"}
+            )
+
+            results = orjson.loads(response.choices[0].message.content)["results"]
+            if len(results) != len(queries) or not all(isinstance(r, dict) for r in results):
+                raise ValueError(f"expected {len(queries)} classifications, got {len(results)}")
+            for result in results:
+                result["method"] = "llm"
+
+            return results
+
+        except Exception as e:
+            logger.error(f"Error in batched LLM classification: {e}")
+            return [
+                self._keyword_fallback(query_lower, score)
+                for query_lower, score in zip(lowered, keyword_scores)
+            ]
+
+    def _keyword_decision(self, query_lower: str, keyword_score: float) -> Optional[Dict]:
+        """
+        Classify from the keyword score alone when it is conclusive.
+
+        Args:
+            query_lower: Lowercased query
+            keyword_score: Result of _keyword_relevance_score()
+
+        Returns:
+            Classification dict, or None if the query needs the LLM
+        """
         # If very high keyword score, skip LLM call
         if keyword_score > 0.7:
             return {
                 "relevant": True,
                 "confidence": min(keyword_score, 0.95),
                 "reason": "Query contains multiple legal keywords",
-                "suggested_topics": self._extract_topics(query),
+                "suggested_topics": self._extract_topics(query_lower),
                 "method": "keyword"
             }
         
@@ -124,53 +423,66 @@ Example responses:
                 "suggested_topics": [],
                 "method": "keyword"
             }
-        
-        # Use LLM for ambiguous cases
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": query}
-                ],
-                temperature=0
-            )
-
-            # Parse response (assuming JSON format)
-            import json
-            result = json.loads(response.choices[0].message.content)
-            result["method"] = "llm"
 
-            return result
+        return None
 
-        except Exception as e:
-            logger.error(f"Error in LLM classification: {e}")
-            # Fallback to keyword-based classification
-            return {
-                "relevant": keyword_score > 0.3,
-                "confidence": keyword_score,
-                "reason": "Fallback to keyword-based classification",
-                "suggested_topics": self._extract_topics(query) if keyword_score > 0.3 else [],
-                "method": "keyword_fallback"
-            }
+    def _keyword_fallback(self, query_lower: str, keyword_score: float) -> Dict:
+        """Keyword-based classification used when the LLM call fails."""
+        return {
+            "relevant": keyword_score > 0.3,
+            "confidence": keyword_score,
+            "reason": "Fallback to keyword-based classification",
+            "suggested_topics": self._extract_topics(query_lower) if keyword_score > 0.3 else [],
+            "method": "keyword_fallback"
+        }
     
-    def _keyword_relevance_score(self, query: str) -> float:
+    def _truncate_query(self, query: str) -> str:
+        """
+        Truncate a query to max_query_tokens for the LLM classifier.
+
+        Args:
+            query: Query string
+
+        Returns:
+            Query, cut to the token limit if a tokenizer is available
+        """
+        if self.tokenizer is None:
+            return query
+
+        tokens = self.tokenizer.encode_ordinary(query)
+        if len(tokens) <= self.max_query_tokens:
+            return query
+
+        return self.tokenizer.decode(tokens[:self.max_query_tokens])
+
+    def _keyword_relevance_score(self, query_lower: str, tokens: List[str]) -> float:
         """
         Calculate relevance score based on keyword matching.
         
         Args:
-            query: Query string
+            query_lower: Lowercased query string
+            tokens: query_lower split on whitespace
             
         Returns:
             Relevance score between 0 and 1
         """
-        query_lower = query.lower()
-        
-        # Count matching keywords
-        matches = sum(1 for keyword in self.LEGAL_KEYWORDS if keyword in query_lower)
+        # Count matching keywords (each distinct keyword once). Keywords only
+        # match whole words: "care" is not found in "careful", nor "220" in "2205"
+        if self._keyword_automaton is not None:
+            matches = len({
+                keyword
+                for keywords in _whole_word_matches(self._keyword_automaton, query_lower)
+                for keyword in keywords
+            })
+        else:
+            matches = len(self._SINGLE_WORD_KEYWORDS.intersection(_WORD_RE.findall(query_lower)))
+            matches += sum(
+                1 for phrase, pattern in self._PHRASE_KEYWORDS
+                if phrase in query_lower and pattern.search(query_lower)
+            )
         
         # Normalize by query length (longer queries can have more matches)
-        query_words = len(query.split())
+        query_words = len(tokens)
         
         if query_words == 0:
             return 0.0
@@ -181,38 +493,26 @@ Example responses:
         # Cap at 1.0
         return min(density * 2, 1.0)
     
-    def _extract_topics(self, query: str) -> list:
+    def _extract_topics(self, query_lower: str) -> list:
         """
         Extract legal topics from query based on keywords.
         
         Args:
-            query: Query string
+            query_lower: Lowercased query string
             
         Returns:
             List of identified topics
         """
-        query_lower = query.lower()
-        topics = []
-        
-        # Topic mappings
-        topic_keywords = {
-            "fiduciary duty": ["fiduciary", "duty of care", "duty of loyalty"],
-            "business judgment rule": ["business judgment", "bjr"],
-            "entire fairness": ["entire fairness", "fair dealing", "fair price"],
-            "revlon": ["revlon", "sale of control"],
-            "corwin": ["corwin", "stockholder vote"],
-            "caremark": ["caremark", "oversight", "monitoring"],
-            "appraisal": ["appraisal", "fair value"],
-            "section 220": ["section 220", "books and records", "220"],
-            "merger": ["merger", "acquisition", "m&a"],
-            "shareholder rights": ["shareholder", "stockholder", "voting"],
-        }
-        
-        for topic, keywords in topic_keywords.items():
-            if any(keyword in query_lower for keyword in keywords):
-                topics.append(topic)
-        
-        return topics
+        if self._topic_automaton is not None:
+            found = {
+                topic
+                for topics in _whole_word_matches(self._topic_automaton, query_lower)
+                for topic in topics
+            }
+            # Keep TOPIC_KEYWORDS order
+            return [topic for topic in self.TOPIC_KEYWORDS if topic in found]
+
+        return [topic for topic, pattern in self._TOPIC_RES.items() if pattern.search(query_lower)]
     
     def get_rejection_message(self, query: str, classification: Dict) -> str:
         """
@@ -278,4 +578,5 @@ def test_classifier():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     test_classifier()
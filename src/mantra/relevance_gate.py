@@ -0,0 +1,170 @@
+"""
+Embedding-based relevance gate for Mantra.
+Decides clear-cut queries locally by similarity to prototype phrases,
+so the LLM classifier only sees ambiguous ones.
+"""
+
+import logging
+from typing import Callable, Dict, List, Optional
+
+import faiss
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class RelevanceGate:
+    """
+    Routes queries by cosine similarity to prototype phrases.
+
+    Queries close to a Delaware-law prototype are relevant, queries close to
+    an off-topic prototype (or far from every legal one) are irrelevant, and
+    anything in between is left to the QueryClassifier.
+    """
+
+    # Canonical Delaware corporate law questions
+    RELEVANT_PROTOTYPES = [
+        "What is fiduciary duty under Delaware law?",
+        "What is the duty of loyalty owed by directors?",
+        "What is the duty of care owed by directors?",
+        "Explain the business judgment rule",
+        "When does the business judgment rule not apply?",
+        "What is entire fairness review?",
+        "What is fair dealing and fair price in entire fairness?",
+        "Explain the Revlon doctrine",
+        "When are Revlon duties triggered in a sale of control?",
+        "What is enhanced scrutiny under Unocal?",
+        "What is the Blasius compelling justification standard?",
+        "Explain Corwin cleansing by a fully informed stockholder vote",
+        "Explain the MFW framework for controlling stockholder transactions",
+        "What is Caremark oversight liability?",
+        "How does a board satisfy its Caremark monitoring duties?",
+        "What is a controlling stockholder under Delaware law?",
+        "What does a special committee need to be effective?",
+        "How does a Delaware appraisal action work?",
+        "How is fair value determined in an appraisal proceeding?",
+        "What is a Section 220 books and records demand?",
+        "What is a proper purpose for a Section 220 inspection?",
+        "When is demand futile in a derivative suit?",
+        "Explain the Zuckerberg test for demand futility",
+        "What are the pleading standards in the Court of Chancery?",
+        "What is the standard for a motion to dismiss in Delaware?",
+        "What remedies are available for breach of fiduciary duty?",
+        "What is exculpation under Section 102(b)(7)?",
+        "When can officers be held liable for breach of fiduciary duty?",
+        "What are the fiduciary duties in a SPAC or de-SPAC merger?",
+        "What standard of review applies to a squeeze-out merger?",
+        "What are the rules for a tender offer under Delaware law?",
+        "What are a board's disclosure duties to stockholders?",
+        "What is a poison pill and when is it permissible?",
+        "What is the Schnell doctrine on inequitable conduct?",
+        "How do Delaware courts review deal protection measures?",
+        "What is the role of the Delaware Court of Chancery?",
+        "How does the Delaware Supreme Court review Chancery decisions?",
+        "What did the court hold in Smith v. Van Gorkom?",
+        "What is the holding of Aronson v. Lewis?",
+        "What is the significance of Weinberger v. UOP?",
+        "Can stockholders sue directors for corporate waste?",
+        "What is the corporate opportunity doctrine?",
+        "What are the requirements for advancement and indemnification?",
+        "How do Delaware courts treat LLC agreements and fiduciary duty waivers?",
+        "What is the standard for a preliminary injunction in a merger case?",
+        "What are the rights of preferred stockholders in Delaware?",
+        "What voting rights do stockholders have under the DGCL?",
+        "How do Delaware courts interpret a merger agreement?",
+        "What is aiding and abetting a breach of fiduciary duty?",
+        "What is the statute of limitations for fiduciary duty claims in Delaware?",
+    ]
+
+    # Common off-topic requests
+    IRRELEVANT_PROTOTYPES = [
+        "What's the weather today?",
+        "Tell me a joke",
+        "How do I make pasta?",
+        "Who are you and where do you work?",
+        "Hello, how are you?",
+        "What is Python programming?",
+        "Recommend a good movie",
+        "What is the capital of France?",
+        "How do I get divorced?",
+        "What is the penalty for a speeding ticket?",
+    ]
+
+    def __init__(self, relevant_threshold: float = 0.75, irrelevant_threshold: float = 0.35):
+        """
+        Initialize the gate.
+
+        Args:
+            relevant_threshold: Similarity above which the nearest prototype decides
+            irrelevant_threshold: Similarity to the nearest legal prototype below
+                which the query is rejected
+        """
+        self.relevant_threshold = relevant_threshold
+        self.irrelevant_threshold = irrelevant_threshold
+
+        self.index: Optional[faiss.Index] = None
+        self._is_relevant: Optional[np.ndarray] = None
+
+    def build(self, embed_fn: Callable[[List[str]], np.ndarray]):
+        """
+        Embed the prototypes and build the similarity index.
+
+        Args:
+            embed_fn: Function mapping a list of texts to an (n, d) embedding array
+        """
+        texts = self.RELEVANT_PROTOTYPES + self.IRRELEVANT_PROTOTYPES
+        vectors = np.ascontiguousarray(embed_fn(texts), dtype=np.float32)
+        faiss.normalize_L2(vectors)
+
+        self.index = faiss.IndexFlatIP(vectors.shape[1])
+        self.index.add(vectors)
+        self._is_relevant = np.array(
+            [True] * len(self.RELEVANT_PROTOTYPES) + [False] * len(self.IRRELEVANT_PROTOTYPES)
+        )
+
+        logger.info(f"Built relevance gate with {len(texts)} prototypes")
+
+    def classify(self, query_vector: np.ndarray) -> Optional[Dict]:
+        """
+        Classify a query embedding against the prototypes.
+
+        Args:
+            query_vector: L2-normalized query embedding of shape (1, dimension)
+
+        Returns:
+            Classification dictionary (same shape as QueryClassifier results),
+            or None if the query falls in the ambiguous band
+        """
+        if self.index is None:
+            return None
+
+        similarities, indices = self.index.search(query_vector, self.index.ntotal)
+        similarities, indices = similarities[0], indices[0]
+
+        top_similarity = float(similarities[0])
+        top_is_relevant = bool(self._is_relevant[indices[0]])
+
+        if top_similarity >= self.relevant_threshold:
+            return {
+                "relevant": top_is_relevant,
+                "confidence": min(top_similarity, 1.0),
+                "reason": (
+                    "Query closely matches a Delaware corporate law topic" if top_is_relevant
+                    else "Query closely matches a known off-topic request"
+                ),
+                "suggested_topics": [],
+                "method": "prototype"
+            }
+
+        # Nearest legal prototype (results are sorted by similarity)
+        legal_similarity = float(similarities[self._is_relevant[indices]][0])
+        if legal_similarity < self.irrelevant_threshold:
+            return {
+                "relevant": False,
+                "confidence": 1 - legal_similarity,
+                "reason": "Query is not similar to any Delaware corporate law topic",
+                "suggested_topics": [],
+                "method": "prototype"
+            }
+
+        return None
@@ -3,32 +3,86 @@ Response Generation Component.
 Generates legal responses with proper citations and formatting.
 """
 
-import os
+import asyncio
+import heapq
 import logging
-from typing import List, Dict
-from openai import OpenAI
-from dotenv import load_dotenv
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import AsyncIterator, Iterator, List, Dict, Optional
+import numpy as np
+from openai import AsyncOpenAI, OpenAI
 
-load_dotenv()
+from .clients import CircuitBreaker, get_async_openai_client, get_openai_client
+from .semantic_cache import ResponseCache
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Concurrent LLM requests for generate_responses()/agenerate_responses()
+BATCH_CONCURRENCY = 8
+
+NO_RESULTS_MESSAGE = "I couldn't find relevant case law to answer your question. Please try rephrasing or ask about a different topic."
+ERROR_MESSAGE = "I encountered an error generating a response. Please try again."
+
+# An answer that already lists its sources (checked in one scan)
+_SOURCES_HEADER_RE = re.compile(r"\*\*(?:Sources|Citations|References):\*\*")
+
+
+@lru_cache(maxsize=64)
+def _court_display(court: str) -> str:
+    """Court slug as shown in the sources section (e.g. "Delaware Supreme")."""
+    return court.replace("-", " ").title()
+
+
+@lru_cache(maxsize=4096)
+def _excerpt_header(case_name: str, date_filed: str, court: str) -> str:
+    """Per-case lines of an excerpt's prompt header (shared by all its chunks)."""
+    return f"Case: {case_name}\nDate: {date_filed}\nCourt: {court}\n\n"
+
 
 class LegalResponseGenerator:
     """
     Generates responses for legal queries with proper citations.
     """
     
-    def __init__(self, model: str = "gpt-4"):
+    def __init__(
+        self,
+        model: str = "gpt-4",
+        tokenizer=None,
+        max_context_tokens: int = 6000,
+        client: Optional[OpenAI] = None,
+        async_client: Optional[AsyncOpenAI] = None,
+        response_cache: Optional[ResponseCache] = None,
+        max_sources: Optional[int] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None
+    ):
         """
         Initialize the response generator.
 
         Args:
             model: OpenAI model to use
+            tokenizer: Shared tiktoken encoding used to enforce max_context_tokens
+            max_context_tokens: Token budget for retrieved excerpts in the prompt
+            client: OpenAI client (defaults to the shared pooled client)
+            async_client: AsyncOpenAI client for the async methods (defaults to the shared one)
+            response_cache: Cache of answers per question and retrieved context
+                (generation is temperature 0, so repeats give the same answer)
+            max_sources: Most-cited sources to list per response (None for all)
+            circuit_breaker: Breaker guarding the LLM calls; while the API keeps
+                failing, responses fall back immediately instead of waiting on it
         """
         self.model = model
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.tokenizer = tokenizer
+        self.max_context_tokens = max_context_tokens
+        self.client = client or get_openai_client()
+        self._async_client = async_client
+        self.response_cache = response_cache
+        self.max_sources = max_sources
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+
+        # Provider-side prompt cache accounting (see _record_usage())
+        self._prompt_tokens = 0
+        self._cached_prompt_tokens = 0
 
         # Response generation system prompt
         self.system_prompt = """You are Mantra, an expert legal assistant specializing in Delaware corporate law.
@@ -59,7 +113,8 @@ Be professional, accurate, and helpful. If you're uncertain, say so."""
         self,
         question: str,
         retrieved_chunks: List[Dict],
-        include_sources: bool = True
+        include_sources: bool = True,
+        query_vector: Optional[np.ndarray] = None
     ) -> Dict:
         """
         Generate a response to a legal question.
@@ -68,93 +123,387 @@ Be professional, accurate, and helpful. If you're uncertain, say so."""
             question: User's question
             retrieved_chunks: List of retrieved document chunks with metadata
             include_sources: Whether to include source citations
+            query_vector: L2-normalized question embedding; lets the response
+                cache also answer similar questions over the same chunks
             
         Returns:
             Dictionary with response and metadata
         """
         if not retrieved_chunks:
-            return {
-                "answer": "I couldn't find relevant case law to answer your question. Please try rephrasing or ask about a different topic.",
-                "sources": [],
-                "confidence": "low"
-            }
-        
-        # Format context from retrieved chunks
-        context = self._format_context(retrieved_chunks)
+            return {"answer": NO_RESULTS_MESSAGE, "sources": [], "confidence": "low"}
         
         # Generate response
         try:
-            user_prompt = f"""Question: {question}
+            answer = None
+            if self.response_cache is not None:
+                context = ResponseCache.context_key(retrieved_chunks)
+                answer = self.response_cache.get(question, context, query_vector)
 
-Relevant Case Law Excerpts:
-{context}
+            if answer is None:
+                with self.circuit_breaker.call():
+                    response = self.client.chat.completions.create(
+                        model=self.model,
+                        messages=self._build_messages(question, retrieved_chunks),
+                        temperature=0
+                    )
 
-Please provide a comprehensive answer based on these excerpts."""
-
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0
-            )
-
-            answer = response.choices[0].message.content
-            
-            # Extract and format sources
-            sources = self._extract_sources(retrieved_chunks) if include_sources else []
+                answer = response.choices[0].message.content
+                self._record_usage(response.usage)
+                if self.response_cache is not None:
+                    self.response_cache.put(question, context, answer, query_vector)
             
-            # Add sources section to answer if not already included
-            if include_sources and sources:
-                answer = self._add_sources_section(answer, sources)
-            
-            return {
-                "answer": answer,
-                "sources": sources,
-                "confidence": self._estimate_confidence(retrieved_chunks),
-                "chunks_used": len(retrieved_chunks)
-            }
+            return self._build_response(answer, retrieved_chunks, include_sources)
             
         except Exception as e:
             logger.error(f"Error generating response: {e}")
-            return {
-                "answer": "I encountered an error generating a response. Please try again.",
-                "sources": [],
-                "confidence": "error"
-            }
-    
-    def _format_context(self, chunks: List[Dict]) -> str:
+            return {"answer": ERROR_MESSAGE, "sources": [], "confidence": "error"}
+
+    async def agenerate_response(
+        self,
+        question: str,
+        retrieved_chunks: List[Dict],
+        include_sources: bool = True,
+        query_vector: Optional[np.ndarray] = None
+    ) -> Dict:
+        """
+        Generate a response to a legal question without blocking the event loop.
+
+        Same result as generate_response(), using the async client, so one
+        worker can serve many concurrent requests.
+
+        Args:
+            question: User's question
+            retrieved_chunks: List of retrieved document chunks with metadata
+            include_sources: Whether to include source citations
+            query_vector: L2-normalized question embedding; lets the response
+                cache also answer similar questions over the same chunks
+
+        Returns:
+            Dictionary with response and metadata
         """
-        Format retrieved chunks into context for the prompt.
+        if not retrieved_chunks:
+            return {"answer": NO_RESULTS_MESSAGE, "sources": [], "confidence": "low"}
+
+        if self._async_client is None:
+            self._async_client = get_async_openai_client()
+
+        try:
+            answer = None
+            if self.response_cache is not None:
+                context = ResponseCache.context_key(retrieved_chunks)
+                answer = self.response_cache.get(question, context, query_vector)
+
+            if answer is None:
+                with self.circuit_breaker.call():
+                    response = await self._async_client.chat.completions.create(
+                        model=self.model,
+                        messages=self._build_messages(question, retrieved_chunks),
+                        temperature=0
+                    )
+
+                answer = response.choices[0].message.content
+                self._record_usage(response.usage)
+                if self.response_cache is not None:
+                    self.response_cache.put(question, context, answer, query_vector)
+
+            return self._build_response(answer, retrieved_chunks, include_sources)
+
+        except Exception as e:
+            logger.error(f"Error generating response: {e}")
+            return {"answer": ERROR_MESSAGE, "sources": [], "confidence": "error"}
+
+    def generate_responses(
+        self,
+        questions: List[str],
+        chunk_lists: List[List[Dict]],
+        include_sources: bool = True,
+        max_concurrency: int = BATCH_CONCURRENCY
+    ) -> List[Dict]:
+        """
+        Generate responses for several questions with concurrent LLM requests.
+
+        Runs generate_response() on a thread pool with the shared sync client
+        (for scripts and evaluation harnesses; async code should use
+        agenerate_responses()).
+
+        Args:
+            questions: User questions
+            chunk_lists: Retrieved chunks for each question
+            include_sources: Whether to include source citations
+            max_concurrency: Maximum number of requests in flight
+
+        Returns:
+            One response dictionary per question, in input order
+        """
+        with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+            return list(pool.map(
+                lambda pair: self.generate_response(pair[0], pair[1], include_sources),
+                zip(questions, chunk_lists)
+            ))
+
+    async def agenerate_responses(
+        self,
+        questions: List[str],
+        chunk_lists: List[List[Dict]],
+        include_sources: bool = True,
+        max_concurrency: int = BATCH_CONCURRENCY
+    ) -> List[Dict]:
+        """
+        Generate responses for several questions with concurrent async LLM requests.
+
+        Args:
+            questions: User questions
+            chunk_lists: Retrieved chunks for each question
+            include_sources: Whether to include source citations
+            max_concurrency: Maximum number of requests in flight
+
+        Returns:
+            One response dictionary per question, in input order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def generate(question: str, chunks: List[Dict]) -> Dict:
+            async with semaphore:
+                return await self.agenerate_response(question, chunks, include_sources)
+
+        return list(await asyncio.gather(*(
+            generate(question, chunks) for question, chunks in zip(questions, chunk_lists)
+        )))
+
+    def _build_response(self, answer: str, chunks: List[Dict], include_sources: bool) -> Dict:
+        """
+        Assemble the response dictionary for a generated answer.
+
+        Args:
+            answer: Generated answer
+            chunks: Retrieved chunks the answer is based on
+            include_sources: Whether to include source citations
+
+        Returns:
+            Dictionary with response and metadata
+        """
+        # Extract and format sources
+        sources = self._extract_sources(chunks) if include_sources else []
         
+        # Add sources section to answer if not already included
+        if include_sources and sources:
+            answer = self._add_sources_section(answer, sources)
+        
+        return {
+            "answer": answer,
+            "sources": sources,
+            "confidence": self.estimate_confidence(chunks),
+            "chunks_used": len(chunks)
+        }
+    
+    def generate_response_stream(
+        self,
+        question: str,
+        retrieved_chunks: List[Dict],
+        include_sources: bool = True,
+        query_vector: Optional[np.ndarray] = None
+    ) -> Iterator[str]:
+        """
+        Generate a response to a legal question, yielding text as it is produced.
+
+        The first tokens arrive as soon as the model starts answering instead
+        of after the whole completion; the sources section (if any) follows
+        once the answer is complete. Cached answers are yielded in one piece.
+
+        Args:
+            question: User's question
+            retrieved_chunks: List of retrieved document chunks with metadata
+            include_sources: Whether to append the sources section
+            query_vector: L2-normalized question embedding (see generate_response())
+
+        Yields:
+            Text deltas; joined, they equal generate_response()'s answer
+        """
+        if not retrieved_chunks:
+            yield NO_RESULTS_MESSAGE
+            return
+
+        try:
+            answer = None
+            if self.response_cache is not None:
+                context = ResponseCache.context_key(retrieved_chunks)
+                answer = self.response_cache.get(question, context, query_vector)
+
+            if answer is not None:
+                yield answer
+            else:
+                # Errors while reading the stream count towards the breaker too
+                with self.circuit_breaker.call():
+                    stream = self.client.chat.completions.create(
+                        model=self.model,
+                        messages=self._build_messages(question, retrieved_chunks),
+                        temperature=0,
+                        stream=True,
+                        stream_options={"include_usage": True}
+                    )
+
+                    deltas = []
+                    for chunk in stream:
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            deltas.append(chunk.choices[0].delta.content)
+                            yield deltas[-1]
+                        elif chunk.usage is not None:
+                            self._record_usage(chunk.usage)
+
+                answer = "".join(deltas)
+                if self.response_cache is not None:
+                    self.response_cache.put(question, context, answer, query_vector)
+
+        except Exception as e:
+            logger.error(f"Error generating response: {e}")
+            yield ERROR_MESSAGE
+            return
+
+        sources = self._extract_sources(retrieved_chunks) if include_sources else []
+        if sources:
+            yield self._add_sources_section(answer, sources)[len(answer):]
+
+    async def astream(self, question: str, retrieved_chunks: List[Dict]) -> AsyncIterator[str]:
+        """
+        Stream a response to a legal question token by token.
+
+        Sources are not appended to the streamed text; callers can list them
+        (e.g. utils.format_sources()) and call estimate_confidence() on the
+        same chunks.
+
+        Args:
+            question: User's question
+            retrieved_chunks: List of retrieved document chunks with metadata
+
+        Yields:
+            Text deltas as they are produced by the model
+        """
+        if self._async_client is None:
+            self._async_client = get_async_openai_client()
+
+        # Errors while reading the stream count towards the breaker too
+        with self.circuit_breaker.call():
+            stream = await self._async_client.chat.completions.create(
+                model=self.model,
+                messages=self._build_messages(question, retrieved_chunks),
+                temperature=0,
+                stream=True,
+                # The last chunk then carries token usage (incl. cached tokens)
+                stream_options={"include_usage": True}
+            )
+
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+                elif chunk.usage is not None:
+                    self._record_usage(chunk.usage)
+
+    @property
+    def prompt_cache_hit_rate(self) -> float:
+        """Fraction of prompt tokens served from the provider's prompt cache so far."""
+        return self._cached_prompt_tokens / self._prompt_tokens if self._prompt_tokens else 0.0
+
+    def _record_usage(self, usage):
+        """
+        Log how much of a prompt was served from OpenAI's prompt cache.
+
         Args:
+            usage: Usage object of a chat completion (may be None)
+        """
+        if usage is None:
+            return
+
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", None) or 0
+        self._prompt_tokens += usage.prompt_tokens
+        self._cached_prompt_tokens += cached
+        logger.info(
+            f"Prompt cache: {cached}/{usage.prompt_tokens} prompt tokens cached "
+            f"({self.prompt_cache_hit_rate:.0%} overall)"
+        )
+
+    def _build_messages(self, question: str, chunks: List[Dict]) -> List[Dict]:
+        """
+        Build the chat messages for a question and its retrieved chunks.
+
+        Args:
+            question: User's question
             chunks: List of chunk dictionaries
-            
+
         Returns:
-            Formatted context string
+            List of chat message dictionaries
+        """
+        # Static system prompt, then excerpts, then the question: OpenAI caches
+        # prompt prefixes (1024+ tokens), so rephrased questions over the same
+        # retrieved cases reuse the cached system prompt and excerpts.
+        # One join over the excerpt parts copies each chunk text only once
+        user_prompt = "".join([
+            "Relevant Case Law Excerpts:\n",
+            *self._context_parts(self._fit_context(chunks)),
+            f"\n\nQuestion: {question}\n\n"
+            "Please provide a comprehensive answer based on these excerpts."
+        ])
+
+        return [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+
+    def _fit_context(self, chunks: List[Dict]) -> List[Dict]:
+        """
+        Keep the highest-ranked chunks that fit in the context token budget.
+
+        Args:
+            chunks: List of chunk dictionaries, best match first
+
+        Returns:
+            Leading chunks whose texts fit in max_context_tokens (at least one)
+        """
+        if self.tokenizer is None or len(chunks) <= 1:
+            return chunks
+
+        token_counts = [
+            len(tokens)
+            for tokens in self.tokenizer.encode_ordinary_batch(
+                [chunk.get("text", "") for chunk in chunks]
+            )
+        ]
+
+        total = 0
+        for i, count in enumerate(token_counts):
+            total += count
+            if total > self.max_context_tokens:
+                logger.info(f"Context budget reached, using {max(i, 1)}/{len(chunks)} chunks")
+                return chunks[:max(i, 1)]
+
+        return chunks
+
+    @staticmethod
+    def _context_parts(chunks: List[Dict]) -> Iterator[str]:
+        """
+        Format retrieved chunks into context for the prompt, piece by piece.
+
+        Chunk texts are yielded as-is, so joining the pieces copies them once.
+
+        Args:
+            chunks: List of chunk dictionaries
+
+        Yields:
+            Strings that concatenate to the formatted context
         """
-        context_parts = []
-        
         for i, chunk in enumerate(chunks, 1):
             metadata = chunk.get("metadata", {})
-            text = chunk.get("text", "")
             
-            case_name = metadata.get("case_name", "Unknown Case")
-            date = metadata.get("date_filed", "Unknown Date")
-            court = metadata.get("court", "Unknown Court")
-            
-            context_part = f"""
-[Excerpt {i}]
-Case: {case_name}
-Date: {date}
-Court: {court}
-
-{text}
-"""
-            context_parts.append(context_part)
-        
-        return "\n---\n".join(context_parts)
+            if i > 1:
+                yield "\n---\n"
+            yield f"\n[Excerpt {i}]\n"
+            yield _excerpt_header(
+                metadata.get('case_name', 'Unknown Case'),
+                metadata.get('date_filed', 'Unknown Date'),
+                metadata.get('court', 'Unknown Court')
+            )
+            yield chunk.get("text", "")
+            yield "\n"
     
     def _extract_sources(self, chunks: List[Dict]) -> List[Dict]:
         """
@@ -164,7 +513,8 @@ Court: {court}
             chunks: List of chunk dictionaries
             
         Returns:
-            List of unique source dictionaries
+            List of unique source dictionaries, most cited first (at most
+            max_sources)
         """
         sources_dict = {}
         
@@ -183,10 +533,11 @@ Court: {court}
                 }
         
         # Sort by citation count (more cited cases first)
-        sources = list(sources_dict.values())
-        sources.sort(key=lambda x: x["citation_count"], reverse=True)
-        
-        return sources
+        if self.max_sources is not None:
+            return heapq.nlargest(
+                self.max_sources, sources_dict.values(), key=lambda x: x["citation_count"]
+            )
+        return sorted(sources_dict.values(), key=lambda x: x["citation_count"], reverse=True)
     
     def _add_sources_section(self, answer: str, sources: List[Dict]) -> str:
         """
@@ -200,37 +551,37 @@ Court: {court}
             Answer with sources section
         """
         # Check if answer already has a sources/citations section
-        if "**Sources:**" in answer or "**Citations:**" in answer or "**References:**" in answer:
+        if _SOURCES_HEADER_RE.search(answer):
             return answer
         
         # Add sources section
-        sources_section = "\n\n---\n\n**Sources:**\n\n"
+        parts = [answer, "\n\n---\n\n**Sources:**\n\n"]
         
         for i, source in enumerate(sources, 1):
-            case_name = source["case_name"]
-            date = source["date_filed"]
-            court = source["court"]
             url = source["url"]
             
-            # Format court name
-            court_display = court.replace("-", " ").title()
-            
-            sources_section += f"{i}. **{case_name}** ({court_display}, {date})\n"
+            parts.append(
+                f"{i}. **{source['case_name']}** "
+                f"({_court_display(source['court'])}, {source['date_filed']})\n"
+            )
             if url:
-                sources_section += f"   [View Case]({url})\n"
-            sources_section += "\n"
+                parts.append(f"   [View Case]({url})\n")
+            parts.append("\n")
         
-        return answer + sources_section
+        return "".join(parts)
     
-    def _estimate_confidence(self, chunks: List[Dict]) -> str:
+    def estimate_confidence(self, chunks: List[Dict]) -> str:
         """
         Estimate confidence level based on retrieved chunks.
+
+        Same estimate as the "confidence" of generate_response(), for callers
+        that stream the answer with astream().
         
         Args:
             chunks: List of retrieved chunks
             
         Returns:
-            Confidence level string
+            Confidence level string ("high", "medium" or "low")
         """
         if not chunks:
             return "low"
@@ -313,10 +664,12 @@ def test_response_generator():
     print("=" * 80)
     print(f"\nQuestion: {question}\n")
     
-    result = generator.generate_response(question, mock_chunks)
-    
     print("Answer:")
-    print(result["answer"])
+    for delta in generator.generate_response_stream(question, mock_chunks):
+        print(delta, end="", flush=True)
+    print()
+
+    result = generator.generate_response(question, mock_chunks)
     print(f"\nConfidence: {result['confidence']}")
     print(f"Chunks used: {result['chunks_used']}")
     print(f"Sources: {len(result['sources'])}")
@@ -325,4 +678,5 @@ def test_response_generator():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     test_response_generator()
@@ -0,0 +1,91 @@
+"""
+Shared component registry for Mantra.
+Creates the indexer, classifier and generator once per process so every entry
+point (FastAPI, Streamlit) shares a single FAISS index and set of API clients.
+"""
+
+import logging
+from functools import lru_cache
+from typing import Any, NamedTuple
+
+from .config import get_settings
+from .indexer import DelawareCaseLawIndexer
+from .query_classifier import QueryClassifier
+from .response_generator import LegalResponseGenerator
+from .semantic_cache import ResponseCache
+from .utils import load_tokenizer
+
+logger = logging.getLogger(__name__)
+
+# Guards against a second set of components (and a second copy of the index)
+_instantiated = False
+
+
+class Components(NamedTuple):
+    """Process-wide Mantra components."""
+    indexer: DelawareCaseLawIndexer
+    classifier: QueryClassifier
+    generator: LegalResponseGenerator
+    tokenizer: Any  # tiktoken Encoding, or None if unavailable
+
+
+@lru_cache(maxsize=1)
+def get_components() -> Components:
+    """
+    Get the process-wide components, loading the index on first use.
+
+    Returns:
+        Components with a loaded indexer
+
+    Raises:
+        IndexNotFoundError: If the FAISS index has not been built
+    """
+    global _instantiated
+    assert not _instantiated, "components already loaded"
+
+    settings = get_settings()
+
+    indexer = DelawareCaseLawIndexer(
+        embedding_model=settings.embedding_model,
+        index_path=str(settings.faiss_index_path),
+        data_path=str(settings.data_path),
+        index_type=settings.faiss_index_type,
+        nprobe=settings.faiss_nprobe,
+        ef_search=settings.faiss_ef_search
+    )
+    indexer.load_index(mmap=settings.faiss_mmap, prefetch=settings.faiss_prefetch)
+
+    if settings.use_gpu:
+        indexer.move_to_gpu(settings.gpu_device)
+
+    # Parse the BPE ranks once and share them between components
+    tokenizer = load_tokenizer(settings.llm_model)
+
+    classifier_tokenizer = (
+        tokenizer if settings.classifier_model == settings.llm_model
+        else load_tokenizer(settings.classifier_model)
+    )
+    classifier = QueryClassifier(model=settings.classifier_model, tokenizer=classifier_tokenizer)
+    response_cache = None
+    if settings.response_cache_enabled:
+        response_cache = ResponseCache(
+            threshold=settings.semantic_cache_threshold,
+            max_entries=settings.response_cache_size,
+            ttl=settings.response_cache_ttl
+        )
+    generator = LegalResponseGenerator(
+        model=settings.llm_model,
+        tokenizer=tokenizer,
+        max_context_tokens=settings.max_context_tokens,
+        response_cache=response_cache
+    )
+
+    _instantiated = True
+    logger.info(f"Loaded Mantra components ({indexer.index.ntotal} vectors)")
+
+    return Components(
+        indexer=indexer,
+        classifier=classifier,
+        generator=generator,
+        tokenizer=tokenizer
+    )
@@ -0,0 +1,472 @@
+"""
+Semantic query cache for Mantra.
+Serves repeated or near-identical questions without re-running the RAG pipeline,
+and generated answers for the same retrieved context without another LLM call.
+"""
+
+import os
+import json
+import sqlite3
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import faiss
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize query text for exact-match cache keys.
+
+    Args:
+        query: Raw query text
+
+    Returns:
+        Lower-cased query with collapsed whitespace
+    """
+    return " ".join(query.lower().split())
+
+
+class SemanticCache:
+    """
+    Two-tier cache in front of the RAG pipeline.
+
+    Tier 1 is an exact-match LRU keyed by the SHA-256 of the normalized query.
+    Tier 2 is a FAISS inner-product index over prior query embeddings (stored
+    as float16); a stored response is returned when cosine similarity exceeds
+    the threshold.
+
+    With a ``db_path`` every entry is also written through to SQLite (WAL
+    mode), so the cache survives restarts and is shared between processes:
+    verbatim repeats are served from disk even after they are evicted from
+    memory, and entries other processes add are picked up by the semantic
+    tier before each lookup. Rows are tagged with the ``index_version`` they
+    were answered over; rows from other index builds are never served and
+    are purged when the store is opened. Each consumer of the store (e.g.
+    the API and the Streamlit app, which cache different response shapes)
+    uses its own ``namespace`` and only sees its own rows. With a ``ttl``
+    entries older than ``ttl`` seconds are ignored. Methods are thread-safe.
+    """
+
+    # The SQLite store keeps up to this many times max_entries responses
+    DB_ENTRIES_FACTOR = 8
+
+    # Semantic candidates checked per lookup (expired ones are skipped)
+    SEARCH_K = 4
+
+    def __init__(
+        self,
+        dimension: int = 1536,
+        threshold: float = 0.95,
+        max_entries: int = 1024,
+        db_path: Optional[str] = None,
+        ttl: Optional[float] = 3600.0,
+        index_version: Optional[str] = None,
+        namespace: str = ""
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            dimension: Dimension of the query embeddings
+            threshold: Minimum cosine similarity for a semantic hit
+            max_entries: Maximum number of cached responses per tier
+            db_path: Optional SQLite file for a persistent, shared write-through store
+            ttl: Seconds a response stays valid (None for no expiry)
+            index_version: Identity of the index the responses are answered over
+                (e.g. DelawareCaseLawIndexer.index_version); stored rows from
+                other versions are discarded
+            namespace: Consumer of the store; responses cached under another
+                namespace are never served
+        """
+        self.dimension = dimension
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.index_version = index_version or ""
+        self.namespace = namespace
+
+        self._lock = threading.RLock()
+
+        # Exact-match tier: key -> (response, created) (ordered for LRU eviction)
+        self._exact: "OrderedDict[str, Tuple[Dict, float]]" = OrderedDict()
+
+        # Semantic tier: row i of the index maps to self._responses[i]
+        self.index = self._new_index(dimension)
+        self._responses: List[Dict] = []
+        self._created: List[float] = []
+        self._keys: List[Optional[str]] = []
+        self._semantic_keys: Set[str] = set()
+
+        self._db: Optional[sqlite3.Connection] = None
+        self._last_rowid = 0  # Newest SQLite row already in the semantic tier
+        if db_path:
+            self._open_db(db_path)
+
+    @staticmethod
+    def _new_index(dimension: int) -> faiss.Index:
+        # fp16 codes halve memory versus IndexFlatIP; no training needed
+        return faiss.IndexScalarQuantizer(
+            dimension, faiss.ScalarQuantizer.QT_fp16, faiss.METRIC_INNER_PRODUCT
+        )
+
+    def _open_db(self, db_path: str):
+        """Open the SQLite store and warm both tiers with its newest entries."""
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+        self._db = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        # WAL lets other processes read while one writes
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, embedding BLOB NOT NULL, "
+            "created REAL NOT NULL DEFAULT 0, index_version TEXT NOT NULL DEFAULT '', "
+            "namespace TEXT NOT NULL DEFAULT '')"
+        )
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(responses)")}
+        if "created" not in columns:
+            # Stores from before TTL support (their rows count as expired under a TTL)
+            self._db.execute("ALTER TABLE responses ADD COLUMN created REAL NOT NULL DEFAULT 0")
+        if "index_version" not in columns:
+            self._db.execute("ALTER TABLE responses ADD COLUMN index_version TEXT NOT NULL DEFAULT ''")
+        if "namespace" not in columns:
+            self._db.execute("ALTER TABLE responses ADD COLUMN namespace TEXT NOT NULL DEFAULT ''")
+
+        # Answers over another index build would cite a stale corpus
+        purged = self._db.execute(
+            "DELETE FROM responses WHERE namespace = ? AND index_version != ?",
+            (self.namespace, self.index_version)
+        ).rowcount
+        self._db.commit()
+        if purged:
+            logger.info(f"Discarded {purged} cached responses from other index builds")
+
+        rows = self._db.execute(
+            "SELECT rowid, key, response, embedding, created FROM responses "
+            "WHERE namespace = ? AND index_version = ? ORDER BY rowid DESC LIMIT ?",
+            (self.namespace, self.index_version, self.max_entries)
+        ).fetchall()
+        rows.reverse()
+
+        loaded = self._add_rows(rows, exact=True)
+        self._last_rowid = self._db.execute("SELECT IFNULL(MAX(rowid), 0) FROM responses").fetchone()[0]
+
+        logger.info(f"Loaded {loaded} cached responses from {db_path}")
+
+    def _add_rows(self, rows: List[Tuple], exact: bool = False) -> int:
+        """Add SQLite rows (rowid, key, response, embedding, created) to the semantic tier."""
+        added = 0
+        for _, key, response_json, embedding, created in rows:
+            vector = np.frombuffer(embedding, dtype=np.float16)
+            if vector.shape[0] != self.dimension or key in self._semantic_keys or self._expired(created):
+                continue
+            response = json.loads(response_json)
+            if exact:
+                self._exact[key] = (response, created)
+            self._append(key, vector, response, created)
+            added += 1
+        return added
+
+    def _sync(self):
+        """Pick up entries other processes wrote to the store (caller holds the lock)."""
+        if self._db is None:
+            return
+        rows = self._db.execute(
+            "SELECT rowid, key, response, embedding, created FROM responses "
+            "WHERE rowid > ? AND namespace = ? AND index_version = ? ORDER BY rowid",
+            (self._last_rowid, self.namespace, self.index_version)
+        ).fetchall()
+        if rows:
+            self._last_rowid = rows[-1][0]
+            self._add_rows(rows[-self.max_entries:])
+
+    def _expired(self, created: float) -> bool:
+        return self.ttl is not None and created + self.ttl <= time.time()
+
+    def _append(self, key: Optional[str], vector: np.ndarray, response: Dict, created: float):
+        """
+        Add one entry to the semantic tier (caller holds the lock).
+
+        Evicts the oldest quarter first when the tier is full.
+        """
+        if len(self._responses) >= self.max_entries:
+            # Flat codes renumber the remaining rows
+            n_evict = max(1, self.max_entries // 4)
+            self.index.remove_ids(np.arange(n_evict, dtype=np.int64))
+            self._semantic_keys.difference_update(self._keys[:n_evict])
+            del self._responses[:n_evict]
+            del self._created[:n_evict]
+            del self._keys[:n_evict]
+
+        self.index.add(np.asarray(vector, dtype=np.float32).reshape(1, -1))
+        self._responses.append(response)
+        self._created.append(created)
+        self._keys.append(key)
+        if key is not None:
+            self._semantic_keys.add(key)
+
+    def _key(self, query: str) -> str:
+        # Keys are unique across namespaces (the key column is the primary key)
+        text = normalize_query(query)
+        if self.namespace:
+            text = f"{self.namespace}\0{text}"
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def __len__(self) -> int:
+        return len(self._responses)
+
+    def get_exact(self, query: str) -> Optional[Dict]:
+        """
+        Look up a response by exact (normalized) query text.
+
+        Args:
+            query: Query text
+
+        Returns:
+            Cached response dictionary, or None on a miss
+        """
+        key = self._key(query)
+        with self._lock:
+            entry = self._exact.get(key)
+            if entry is not None:
+                if not self._expired(entry[1]):
+                    self._exact.move_to_end(key)
+                    return entry[0]
+                del self._exact[key]
+
+            if self._db is None:
+                return None
+
+            row = self._db.execute(
+                "SELECT response, created FROM responses "
+                "WHERE key = ? AND namespace = ? AND index_version = ?",
+                (key, self.namespace, self.index_version)
+            ).fetchone()
+
+        if row is None or self._expired(row[1]):
+            return None
+        return json.loads(row[0])
+
+    def get_similar(self, query_vector: np.ndarray) -> Optional[Dict]:
+        """
+        Look up a response by semantic similarity of the query embedding.
+
+        Args:
+            query_vector: L2-normalized query embedding of shape (1, dimension)
+
+        Returns:
+            Cached response dictionary, or None if no prior query is close enough
+        """
+        with self._lock:
+            self._sync()
+            if self.index.ntotal == 0:
+                return None
+
+            similarities, indices = self.index.search(query_vector, min(self.SEARCH_K, self.index.ntotal))
+            for similarity, idx in zip(similarities[0].tolist(), indices[0].tolist()):
+                if idx < 0 or similarity < self.threshold:
+                    return None
+                if not self._expired(self._created[idx]):
+                    logger.info(f"Semantic cache hit (similarity={similarity:.3f})")
+                    return self._responses[idx]
+
+            return None
+
+    def add(self, query: str, query_vector: np.ndarray, response: Dict):
+        """
+        Store a response under both the exact and the semantic tier.
+
+        Args:
+            query: Query text
+            query_vector: L2-normalized query embedding of shape (1, dimension)
+            response: Response dictionary to cache
+        """
+        key = self._key(query)
+        query_vector = np.ascontiguousarray(query_vector, dtype=np.float32)
+        created = time.time()
+
+        with self._lock:
+            self._exact[key] = (response, created)
+            self._exact.move_to_end(key)
+            if len(self._exact) > self.max_entries:
+                self._exact.popitem(last=False)
+
+            if self._db is not None and len(self._responses) >= self.max_entries:
+                # Keep the on-disk store bounded too
+                self._db.execute(
+                    "DELETE FROM responses WHERE rowid <= "
+                    "(SELECT MAX(rowid) FROM responses) - ?",
+                    (self.DB_ENTRIES_FACTOR * self.max_entries,)
+                )
+
+            self._append(key, query_vector, response, created)
+
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses "
+                    "(key, response, embedding, created, index_version, namespace) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        key,
+                        json.dumps(response, ensure_ascii=False),
+                        query_vector.reshape(-1).astype(np.float16).tobytes(),
+                        created,
+                        self.index_version,
+                        self.namespace
+                    )
+                )
+                self._db.commit()
+
+
+class ResponseCache:
+    """
+    LRU + TTL cache of generated answers, keyed by question and retrieved context.
+
+    The context key covers the retrieved chunk IDs, so a question answered
+    over different excerpts (other filters, a rebuilt index) is not served
+    a stale answer. Within one context, a question whose embedding has at
+    least ``threshold`` cosine similarity to a cached one is a hit as well.
+    Methods are thread-safe.
+    """
+
+    def __init__(self, threshold: float = 0.95, max_entries: int = 1024, ttl: float = 3600.0):
+        """
+        Initialize the cache.
+
+        Args:
+            threshold: Minimum cosine similarity between questions for a hit
+            max_entries: Maximum number of cached answers
+            ttl: Seconds an answer stays valid
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+
+        # key -> (context, question vector or None, answer, expiry), LRU order
+        self._entries: "OrderedDict[bytes, Tuple[bytes, Optional[np.ndarray], str, float]]" = OrderedDict()
+        # context -> keys of its entries, for the semantic lookup
+        self._by_context: Dict[bytes, Dict[bytes, None]] = {}
+
+    @staticmethod
+    def context_key(chunks: Sequence[Dict]) -> bytes:
+        """
+        Digest of the retrieved chunks, in rank order.
+
+        Args:
+            chunks: Retrieved chunk dictionaries
+
+        Returns:
+            16-byte BLAKE2b digest of the chunk IDs (texts for chunks without one)
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for chunk in chunks:
+            chunk_id = chunk.get("metadata", {}).get("chunk_id") or chunk.get("text", "")
+            digest.update(str(chunk_id).encode("utf-8") + b"\0")
+        return digest.digest()
+
+    @staticmethod
+    def _key(question: str, context: bytes) -> bytes:
+        return hashlib.blake2b(
+            context + normalize_query(question).encode("utf-8"), digest_size=16
+        ).digest()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(
+        self,
+        question: str,
+        context: bytes,
+        query_vector: Optional[np.ndarray] = None
+    ) -> Optional[str]:
+        """
+        Look up an answer for a question over a retrieved context.
+
+        Args:
+            question: User's question
+            context: context_key() of the retrieved chunks
+            query_vector: L2-normalized question embedding, enabling similar-question hits
+
+        Returns:
+            Cached answer, or None on a miss
+        """
+        key = self._key(question, context)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[3] > now:
+                    self._entries.move_to_end(key)
+                    return entry[2]
+                self._drop(key)
+
+            if query_vector is None:
+                return None
+
+            keys, vectors = [], []
+            for other in list(self._by_context.get(context, ())):
+                _, vector, _, expiry = self._entries[other]
+                if expiry <= now:
+                    self._drop(other)
+                elif vector is not None:
+                    keys.append(other)
+                    vectors.append(vector)
+            if not vectors:
+                return None
+
+            # One matrix-vector product over this context's questions
+            similarities = np.vstack(vectors) @ np.asarray(query_vector, dtype=np.float32).reshape(-1)
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                return None
+
+            logger.info(f"Response cache hit (similarity={float(similarities[best]):.3f})")
+            self._entries.move_to_end(keys[best])
+            return self._entries[keys[best]][2]
+
+    def put(
+        self,
+        question: str,
+        context: bytes,
+        answer: str,
+        query_vector: Optional[np.ndarray] = None
+    ):
+        """
+        Store an answer, evicting the least recently used one when full.
+
+        Args:
+            question: User's question
+            context: context_key() of the retrieved chunks
+            answer: Generated answer
+            query_vector: L2-normalized question embedding (optional)
+        """
+        key = self._key(question, context)
+        if query_vector is not None:
+            query_vector = np.array(query_vector, dtype=np.float32).reshape(-1)
+
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = (context, query_vector, answer, time.monotonic() + self.ttl)
+            self._by_context.setdefault(context, {})[key] = None
+
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def _drop(self, key: bytes):
+        """Remove an entry (caller holds the lock)."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._by_context[entry[0]]
+        del keys[key]
+        if not keys:
+            del self._by_context[entry[0]]
@@ -0,0 +1,95 @@
+"""
+Contiguous chunk text storage for Mantra.
+All chunk texts live in one UTF-8 buffer with an offsets array, so an index
+holds no per-chunk string objects and loads by memory-mapping two files.
+"""
+
+import os
+import logging
+from typing import Iterable, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+BLOB_FILE = "texts.bin"
+OFFSETS_FILE = "text_offsets.npy"
+
+
+class ChunkTexts:
+    """
+    Read-only sequence of chunk texts backed by a byte buffer.
+
+    Text i is ``blob[offsets[i]:offsets[i + 1]]`` decoded as UTF-8.
+    """
+
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray):
+        """
+        Wrap an existing buffer.
+
+        Args:
+            blob: uint8 array holding the concatenated UTF-8 texts
+            offsets: int64 array of len(texts) + 1 byte offsets into blob
+        """
+        self.blob = blob
+        self.offsets = offsets
+
+    @classmethod
+    def from_texts(cls, texts: Iterable[str]) -> "ChunkTexts":
+        """
+        Pack texts into a new buffer.
+
+        Args:
+            texts: Chunk texts (row i = chunk i)
+
+        Returns:
+            ChunkTexts over an in-memory buffer
+        """
+        encoded = [text.encode("utf-8") for text in texts]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(data) for data in encoded], out=offsets[1:])
+        blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        return cls(blob, offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return self.blob[start:end].tobytes().decode("utf-8")
+
+    def save(self, directory: str):
+        """
+        Write the buffer and offsets into a directory.
+
+        Args:
+            directory: Index directory
+        """
+        self.blob.tofile(os.path.join(directory, BLOB_FILE))
+        np.save(os.path.join(directory, OFFSETS_FILE), self.offsets)
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> Optional["ChunkTexts"]:
+        """
+        Open texts saved with save().
+
+        Args:
+            directory: Index directory
+            mmap: Memory-map the files instead of reading them into RAM
+
+        Returns:
+            ChunkTexts, or None if the directory holds no saved texts
+        """
+        blob_file = os.path.join(directory, BLOB_FILE)
+        offsets_file = os.path.join(directory, OFFSETS_FILE)
+        if not (os.path.exists(blob_file) and os.path.exists(offsets_file)):
+            return None
+
+        offsets = np.load(offsets_file, mmap_mode="r" if mmap else None)
+        if os.path.getsize(blob_file) == 0:
+            blob = np.zeros(0, dtype=np.uint8)  # np.memmap cannot map empty files
+        elif mmap:
+            blob = np.memmap(blob_file, dtype=np.uint8, mode="r")
+        else:
+            blob = np.fromfile(blob_file, dtype=np.uint8)
+        return cls(blob, offsets)
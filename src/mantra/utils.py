@@ -3,9 +3,44 @@ Utility functions for Mantra application.
 Provides common functionality used across multiple modules.
 """
 
-from typing import List, Dict, Optional
-
-
+import io
+import itertools
+import json
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from functools import lru_cache
+from types import MappingProxyType
+from typing import IO, Any, Hashable, List, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Runs of non-whitespace, i.e. the words str.split() would return
+_WORD_RE = re.compile(r"\S+")
+
+# truncate_text() looks this far back from the cut for a word boundary
+TRUNCATE_BOUNDARY_WINDOW = 40
+
+# Display labels (read-only; built once at import)
+_CONFIDENCE_LABELS = MappingProxyType({
+    "low": "🟡 Low",
+    "medium": "🟢 Medium",
+    "high": "🟢 High"
+})
+
+# Display names for common court slugs
+_COURT_NAMES = MappingProxyType({
+    "delaware-supreme": "Delaware Supreme Court",
+    "delaware-chancery": "Delaware Court of Chancery",
+    "delaware": "Delaware Courts"
+})
+
+
+# Pure function of the URL; the same few thousand case URLs recur across queries
+@lru_cache(maxsize=4096)
 def extract_case_name_from_url(url: str) -> str:
     """
     Extract case name from CourtListener URL.
@@ -29,6 +64,34 @@ def extract_case_name_from_url(url: str) -> str:
     return case_name
 
 
+def _make_source(result: Dict) -> Dict:
+    """
+    Format a single search result as a display source.
+
+    Args:
+        result: Search result dictionary from indexer
+
+    Returns:
+        Source dictionary (see format_sources)
+    """
+    metadata = result.get("metadata", {})
+
+    # Get case name, fallback to extracting from URL if "Unknown Case"
+    case_name = metadata.get("case_name", "Unknown Case")
+    url = metadata.get("absolute_url", "#")
+
+    if case_name == "Unknown Case" or not case_name:
+        case_name = extract_case_name_from_url(url)
+
+    return {
+        "case_name": case_name,
+        "date": metadata.get("date_filed", ""),
+        "court": metadata.get("court", ""),
+        "citation": metadata.get("case_name_full", case_name),
+        "url": url
+    }
+
+
 def format_sources(
     search_results: List[Dict],
     max_sources: int = 3
@@ -51,35 +114,19 @@ def format_sources(
         - citation: Full citation
         - url: URL to case
     """
-    sources = []
-    seen_case_ids = set()
+    if not search_results:
+        return []
 
+    # First occurrence of each case_id, kept in rank order; stop as soon as
+    # max_sources distinct cases are found
+    sources = []
+    seen = set()
     for result in search_results:
-        metadata = result.get("metadata", {})
-        case_id = metadata.get("case_id")
-
-        # Skip if we've already added this case
-        if case_id in seen_case_ids:
+        case_id = result.get("metadata", {}).get("case_id")
+        if case_id in seen:
             continue
-
-        seen_case_ids.add(case_id)
-
-        # Get case name, fallback to extracting from URL if "Unknown Case"
-        case_name = metadata.get("case_name", "Unknown Case")
-        url = metadata.get("absolute_url", "#")
-
-        if case_name == "Unknown Case" or not case_name:
-            case_name = extract_case_name_from_url(url)
-
-        sources.append({
-            "case_name": case_name,
-            "date": metadata.get("date_filed", ""),
-            "court": metadata.get("court", ""),
-            "citation": metadata.get("case_name_full", case_name),
-            "url": url
-        })
-
-        # Stop if we have enough sources
+        seen.add(case_id)
+        sources.append(_make_source(result))
         if len(sources) >= max_sources:
             break
 
@@ -90,6 +137,9 @@ def truncate_text(text: str, max_length: int = 200, suffix: str = "...") -> str:
     """
     Truncate text to a maximum length with suffix.
 
+    The cut is moved back to the last space within the final
+    TRUNCATE_BOUNDARY_WINDOW characters, so words are not split.
+
     Args:
         text: Text to truncate
         max_length: Maximum length (including suffix)
@@ -101,7 +151,9 @@ def truncate_text(text: str, max_length: int = 200, suffix: str = "...") -> str:
     if len(text) <= max_length:
         return text
 
-    return text[:max_length - len(suffix)] + suffix
+    cutoff = max_length - len(suffix)
+    last_space = text.rfind(" ", max(cutoff - TRUNCATE_BOUNDARY_WINDOW, 0), cutoff)
+    return text[:last_space if last_space > 0 else cutoff] + suffix
 
 
 def format_confidence(confidence: str) -> str:
@@ -114,14 +166,10 @@ def format_confidence(confidence: str) -> str:
     Returns:
         Formatted confidence string with emoji
     """
-    confidence_map = {
-        "low": "🟡 Low",
-        "medium": "🟢 Medium",
-        "high": "🟢 High"
-    }
-    return confidence_map.get(confidence.lower(), confidence)
+    return _CONFIDENCE_LABELS.get(confidence.lower() if confidence else "", confidence)
 
 
+@lru_cache(maxsize=64)
 def format_court_name(court: str) -> str:
     """
     Format court name for display.
@@ -132,17 +180,10 @@ def format_court_name(court: str) -> str:
     Returns:
         Formatted court name
     """
-    # Common abbreviations and formatting
-    court_map = {
-        "delaware-supreme": "Delaware Supreme Court",
-        "delaware-chancery": "Delaware Court of Chancery",
-        "delaware": "Delaware Courts"
-    }
-
     # Check if we have a known mapping
     court_lower = court.lower().strip()
-    if court_lower in court_map:
-        return court_map[court_lower]
+    if court_lower in _COURT_NAMES:
+        return _COURT_NAMES[court_lower]
 
     # Otherwise, just title case it
     return court.title()
@@ -152,13 +193,44 @@ def calculate_word_count(text: str) -> int:
     """
     Calculate word count in text.
 
+    Counts regex matches instead of materializing the list from str.split(),
+    so long opinions don't allocate a string per word.
+
     Args:
         text: Text to count words in
 
     Returns:
         Number of words
     """
-    return len(text.split())
+    if not text:
+        return 0
+    return sum(1 for _ in _WORD_RE.finditer(text))
+
+
+def date_to_int(value) -> int:
+    """
+    Convert a filing date to a sortable YYYYMMDD integer.
+
+    Integer comparison is cheaper than comparing ISO strings when filtering
+    many chunks. Partial dates are padded (2020 -> 20200000).
+
+    Args:
+        value: ISO date string, date/datetime, or an already converted int
+
+    Returns:
+        YYYYMMDD integer, or 0 if the date is missing or malformed
+    """
+    if not value:
+        return 0
+    if isinstance(value, int):
+        return value
+    if isinstance(value, date):
+        return value.year * 10000 + value.month * 100 + value.day
+
+    digits = str(value)[:10].replace("-", "")
+    if not digits.isdigit() or len(digits) > 8:
+        return 0
+    return int(digits.ljust(8, "0"))
 
 
 def validate_k_parameter(k: int, min_k: int = 1, max_k: int = 20) -> int:
@@ -174,3 +246,140 @@ def validate_k_parameter(k: int, min_k: int = 1, max_k: int = 20) -> int:
         Validated k value (clamped to range)
     """
     return max(min_k, min(k, max_k))
+
+
+def load_tokenizer(model: str):
+    """
+    Load and warm up the tiktoken encoding for a model.
+
+    Loading parses the BPE ranks, so do this once at startup and share the
+    result between components.
+
+    Args:
+        model: OpenAI model name
+
+    Returns:
+        tiktoken Encoding, or None if tiktoken or the encoding is unavailable
+    """
+    try:
+        import tiktoken
+
+        try:
+            encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            encoding = tiktoken.get_encoding("o200k_base")
+
+        encoding.encode("warmup")
+        return encoding
+
+    except Exception as e:
+        logger.warning(f"Tokenizer unavailable, token limits disabled: {e}")
+        return None
+
+
+def _open_case_file(path: str) -> IO[str]:
+    """Open a case data file as text, decompressing ``.zst`` files on the fly."""
+    if str(path).endswith(".zst"):
+        import zstandard
+
+        raw = open(path, 'rb')
+        reader = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        return io.TextIOWrapper(reader, encoding='utf-8')
+
+    return open(path, 'r', encoding='utf-8')
+
+
+def stream_cases(path: str) -> Iterator[Dict]:
+    """
+    Lazily iterate over the cases in a case data file.
+
+    Reads line-delimited JSON (one case per line) without materializing the
+    whole file. Legacy files holding a single JSON array are still accepted,
+    but are loaded in full. Paths ending in ``.zst`` are decompressed while
+    reading (requires zstandard).
+
+    Args:
+        path: Path to the case data file
+
+    Yields:
+        Case dictionaries
+    """
+    with _open_case_file(path) as f:
+        # Sniff the first non-space character; compressed streams can't
+        # seek, so keep what was read instead of rewinding
+        prefix = f.read(1)
+        while prefix and prefix.isspace():
+            prefix = f.read(1)
+
+        if prefix == '[':
+            yield from json.loads(prefix + f.read())
+            return
+
+        for line in itertools.chain([prefix + f.readline()], f):
+            if line.strip():
+                yield json.loads(line)
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache with an optional time-to-live per entry.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries (0 disables caching)
+            ttl: Seconds an entry stays valid (None = until evicted)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Look up an entry and mark it most recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires is not None and expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        """
+        Store an entry, evicting the least recently used one when full.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        if self.maxsize <= 0:
+            return
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
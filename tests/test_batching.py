@@ -0,0 +1,122 @@
+"""
+Tests for MicroBatcher request coalescing.
+Results must come back to the right caller, and no caller may wait forever.
+"""
+
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mantra.batching import MicroBatcher
+
+
+def test_results_follow_submission_order():
+    calls = []
+
+    def double(items):
+        calls.append(list(items))
+        return [item * 2 for item in items]
+
+    async def run():
+        batcher = MicroBatcher(double, max_batch=8, max_wait=0.05)
+        batcher.start()
+        try:
+            return await asyncio.gather(*(batcher.submit(i) for i in range(20)))
+        finally:
+            await batcher.stop()
+
+    assert asyncio.run(run()) == [i * 2 for i in range(20)]
+    # Coalesced into full batches, never larger than max_batch
+    assert len(calls) < 20
+    assert all(len(batch) <= 8 for batch in calls)
+    assert sorted(item for batch in calls for item in batch) == list(range(20))
+
+
+def test_batch_error_fails_only_its_callers():
+    def fail_on_odd(items):
+        if any(item % 2 for item in items):
+            raise ValueError("odd")
+        return items
+
+    async def run():
+        batcher = MicroBatcher(fail_on_odd, max_batch=1, max_wait=0)
+        batcher.start()
+        try:
+            return await asyncio.gather(*(batcher.submit(i) for i in range(4)), return_exceptions=True)
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(run())
+    assert results[0] == 0 and results[2] == 2
+    assert isinstance(results[1], ValueError) and isinstance(results[3], ValueError)
+
+
+def test_wrong_result_count_fails_the_batch():
+    async def run():
+        batcher = MicroBatcher(lambda items: items[:-1], max_batch=4, max_wait=0.05)
+        batcher.start()
+        try:
+            return await asyncio.gather(*(batcher.submit(i) for i in range(3)), return_exceptions=True)
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_submit_requires_start():
+    batcher = MicroBatcher(lambda items: items)
+    with pytest.raises(RuntimeError):
+        asyncio.run(batcher.submit(1))
+
+
+def test_slow_batch_does_not_block_the_next():
+    release = threading.Event()
+
+    def batch_fn(items):
+        if "slow" in items:
+            release.wait(5)
+        return items
+
+    async def run():
+        batcher = MicroBatcher(batch_fn, max_batch=1, max_wait=0, max_in_flight=2)
+        batcher.start()
+        try:
+            slow = asyncio.ensure_future(batcher.submit("slow"))
+            await asyncio.sleep(0.05)
+            fast = await asyncio.wait_for(batcher.submit("fast"), timeout=2)
+            release.set()
+            return fast, await slow
+        finally:
+            release.set()
+            await batcher.stop()
+
+    assert asyncio.run(run()) == ("fast", "slow")
+
+
+def test_stop_fails_queued_and_in_flight_callers():
+    release = threading.Event()
+
+    def blocking(items):
+        release.wait(5)
+        return items
+
+    async def run():
+        batcher = MicroBatcher(blocking, max_batch=1, max_wait=0, max_in_flight=1)
+        batcher.start()
+        # One batch in flight, the rest queued behind the single slot
+        pending = [asyncio.ensure_future(batcher.submit(i)) for i in range(3)]
+        await asyncio.sleep(0.05)
+        await batcher.stop()
+        release.set()
+        return await asyncio.wait_for(asyncio.gather(*pending, return_exceptions=True), timeout=2)
+
+    results = asyncio.run(run())
+    assert len(results) == 3
+    assert all(isinstance(result, RuntimeError) for result in results)
@@ -0,0 +1,69 @@
+"""
+Tests for LegalDocumentChunker.
+Packing by position must produce exactly the chunks of the split-and-pack loop.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mantra import indexer
+from mantra.indexer import LegalDocumentChunker
+
+WORDS = ["the", "court", "held", "that", "Del.", "A.2d", "fiduciary", "duty", "of", "loyalty",
+         "Revlon", "Unocal", "board", "directors", "stockholders", "merger", "x" * 40]
+SEPARATORS = [" ", " ", " ", " ", ", ", ". ", "\n", "\n\n", "\n\n\n", "\n\n\n\n"]
+
+
+def random_text(rng: random.Random, length: int) -> str:
+    parts = []
+    size = 0
+    while size < length:
+        part = rng.choice(WORDS) if rng.random() < 0.97 else "y" * rng.randrange(100, 1500)
+        parts.extend([part, rng.choice(SEPARATORS)])
+        size += len(part) + 1
+    return "".join(parts)
+
+
+def baseline_chunks(monkeypatch, chunker: LegalDocumentChunker, text: str) -> list:
+    """Chunks from the split-and-pack loop for every separator."""
+    with monkeypatch.context() as patch:
+        patch.setattr(indexer, "_self_overlapping", lambda separator: True)
+        return chunker.split_text(text)
+
+
+@pytest.mark.parametrize("chunk_size,chunk_overlap", [(1000, 200), (200, 50), (120, 0), (64, 16)])
+def test_pack_by_position_matches_baseline(monkeypatch, chunk_size, chunk_overlap):
+    rng = random.Random(chunk_size)
+    chunker = LegalDocumentChunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+    for _ in range(100):
+        text = random_text(rng, rng.randrange(chunk_size // 2, chunk_size * 12))
+        assert chunker.split_text(text) == baseline_chunks(monkeypatch, chunker, text)
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "short",
+    "a" * 5000,
+    ("word " * 600).strip(),
+    ". ".join(["Sentence number %d" % i for i in range(200)]),
+    "\n" * 50 + "end",
+    " leading and trailing separators " * 80 + " ",
+])
+def test_edge_cases_match_baseline(monkeypatch, text):
+    chunker = LegalDocumentChunker(chunk_size=300, chunk_overlap=60)
+    assert chunker.split_text(text) == baseline_chunks(monkeypatch, chunker, text)
+
+
+def test_self_overlapping_separators():
+    assert indexer._self_overlapping("\n\n")
+    assert indexer._self_overlapping("\n\n\n")
+    assert not indexer._self_overlapping("\n")
+    assert not indexer._self_overlapping(". ")
+    assert not indexer._self_overlapping(" ")
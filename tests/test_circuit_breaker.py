@@ -0,0 +1,150 @@
+"""
+Tests for the OpenAI API circuit breaker.
+Uses a fake clock and SDK exceptions; no network access.
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+import httpx
+import openai
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mantra import clients
+from mantra.clients import CircuitBreaker
+from mantra.exceptions import LLMUnavailableError
+
+
+def transient_error() -> openai.APIConnectionError:
+    return openai.APIConnectionError(request=httpx.Request("POST", "https://api.openai.com/v1"))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(clients.time, "monotonic", lambda: now[0])
+    return now
+
+
+def fail(breaker: CircuitBreaker, error: Exception):
+    with pytest.raises(type(error)):
+        with breaker.call():
+            raise error
+
+
+def test_opens_after_consecutive_transient_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30.0)
+    for _ in range(2):
+        fail(breaker, transient_error())
+    assert not breaker.is_open
+
+    fail(breaker, transient_error())
+    assert breaker.is_open
+    with pytest.raises(LLMUnavailableError):
+        with breaker.call():
+            pytest.fail("short-circuited call must not run")
+
+
+def test_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker(failure_threshold=2)
+    fail(breaker, transient_error())
+    with breaker.call():
+        pass
+    fail(breaker, transient_error())
+    assert not breaker.is_open
+
+
+def test_non_transient_errors_do_not_count(clock):
+    breaker = CircuitBreaker(failure_threshold=1)
+    fail(breaker, ValueError("bad request"))
+    assert not breaker.is_open
+
+
+def test_successful_trial_closes_the_circuit(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0)
+    fail(breaker, transient_error())
+
+    clock[0] += 31
+    assert not breaker.is_open
+    with breaker.call():
+        pass
+    assert not breaker.is_open
+    with breaker.call():
+        pass
+
+
+def test_failed_trial_reopens_the_circuit(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0)
+    fail(breaker, transient_error())
+
+    clock[0] += 31
+    fail(breaker, transient_error())
+    assert breaker.is_open
+
+    clock[0] += 29
+    with pytest.raises(LLMUnavailableError):
+        with breaker.call():
+            pass
+
+
+def test_non_transient_trial_error_frees_the_trial_slot(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0)
+    fail(breaker, transient_error())
+
+    clock[0] += 31
+    fail(breaker, ValueError("bad request"))
+    # No verdict: the next call is the trial
+    with breaker.call():
+        pass
+    assert not breaker.is_open
+
+
+def test_half_open_admits_a_single_trial(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0)
+    fail(breaker, transient_error())
+    clock[0] += 31
+
+    started, release = threading.Event(), threading.Event()
+    admitted, rejected = [], []
+
+    def trial():
+        with breaker.call():
+            admitted.append(True)
+            started.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=trial)
+    thread.start()
+    assert started.wait(5)
+
+    assert breaker.is_open
+    for _ in range(9):
+        try:
+            with breaker.call():
+                admitted.append(True)
+        except LLMUnavailableError:
+            rejected.append(True)
+
+    release.set()
+    thread.join(5)
+    assert len(admitted) == 1 and len(rejected) == 9
+    assert not breaker.is_open
+
+
+def test_guard_spans_stream_iteration(clock):
+    breaker = CircuitBreaker(failure_threshold=1)
+
+    def stream():
+        with breaker.call():
+            yield "first"
+            raise transient_error()
+
+    chunks = stream()
+    assert next(chunks) == "first"
+    with pytest.raises(openai.APIConnectionError):
+        next(chunks)
+    assert breaker.is_open
@@ -0,0 +1,38 @@
+"""
+Tests for format_sources deduplication.
+Sources are the first hit of each distinct case_id, in rank order.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mantra.utils import format_sources
+
+
+def hit(case_id, name):
+    return {"metadata": {"case_id": case_id, "case_name": name, "absolute_url": f"/opinion/{name}/"}}
+
+
+def test_first_hit_per_case_in_rank_order():
+    results = [hit(2, "b"), hit(1, "a"), hit(2, "b2"), hit(3, "c"), hit(1, "a2")]
+    assert [source["case_name"] for source in format_sources(results, max_sources=5)] == ["b", "a", "c"]
+
+
+def test_stops_at_max_sources():
+    results = [hit(i, str(i)) for i in range(10)]
+    assert [source["case_name"] for source in format_sources(results, max_sources=3)] == ["0", "1", "2"]
+
+
+def test_case_ids_are_compared_as_stored():
+    # 1 and "1", None and "None" are different cases
+    results = [hit(1, "int"), hit("1", "str"), hit(None, "none"), hit("None", "none str")]
+    assert [source["case_name"] for source in format_sources(results, max_sources=5)] == [
+        "int", "str", "none", "none str"
+    ]
+
+
+def test_no_results():
+    assert format_sources([]) == []
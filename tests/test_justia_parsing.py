@@ -0,0 +1,82 @@
+"""
+Tests for Justia case page parsing.
+The Lexbor (selectolax) and BeautifulSoup paths must extract the same text.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mantra.justia_extractor import JustiaDelawareExtractor
+
+pytest.importorskip("selectolax.lexbor")
+
+
+SAMPLE_PAGES = {
+    "entry_content": b"""<html><head><title>Case</title>
+<style>body { color: black; }</style>
+<script>window.analytics = {id: 1};</script>
+</head><body>
+<span class="docket">No. <b>123</b>, 2020</span>
+<span class="date">May 1, 2020</span>
+<div class="entry-content">
+  <p>IN THE SUPREME COURT OF THE STATE OF DELAWARE</p>
+  <script>var x = 1;</script><style>p {}</style>
+  <p>The board   breached its <i>fiduciary</i> duty &amp; the duty of loyalty.</p>
+  <template><p>Template text</p></template>
+  <p>   </p>
+  <ul><li>First</li><li>Second</li></ul>
+  <noscript>Enable JavaScript</noscript>
+  <!-- comment -->
+  <p>AFFIRMED.</p>
+</div>
+</body></html>""",
+    "case_content": b"""<html><body>
+<div class="case-content"><h1>Opinion</h1><p>Text with&nbsp;entity and \xe2\x80\x9cquotes\xe2\x80\x9d.</p></div>
+</body></html>""",
+    "article_fallback": b"""<html><body>
+<span class="date">June 2, 2019</span>
+<article><script>track()</script><p>Article body.</p><style>.a{}</style><p>More.</p></article>
+</body></html>""",
+    "main_fallback": b"""<html><body><main><p>Main body only.</p></main></body></html>""",
+    "empty": b"""<html><body><p>No case content here.</p></body></html>""",
+}
+
+TEXT_FIELDS = ("docket", "date", "text")
+
+
+@pytest.fixture
+def extractor(tmp_path):
+    return JustiaDelawareExtractor(output_dir=str(tmp_path))
+
+
+@pytest.mark.parametrize("name", sorted(SAMPLE_PAGES))
+def test_lexbor_matches_beautifulsoup(extractor, name):
+    """Both parsers extract identical docket, date and text."""
+    page = SAMPLE_PAGES[name]
+
+    extractor.use_lexbor = True
+    lexbor = extractor._parse_case_page(page)
+    extractor.use_lexbor = False
+    soup = extractor._parse_case_page(page)
+
+    for field in TEXT_FIELDS:
+        assert lexbor[field] == soup[field], field
+    assert bool(lexbor["html"]) == bool(soup["html"])
+
+
+def test_script_and_style_are_not_text(extractor):
+    """Script, style and template contents never reach the case text."""
+    extractor.use_lexbor = True
+    page = extractor._parse_case_page(SAMPLE_PAGES["entry_content"])
+
+    assert "var x" not in page["text"]
+    assert "p {}" not in page["text"]
+    assert "Template text" not in page["text"]
+    assert "fiduciary" in page["text"]
+    # The stored markup is the content div as published
+    assert "<script>" in page["html"]
@@ -0,0 +1,97 @@
+"""
+Tests for QueryClassifier keyword matching.
+The Aho-Corasick automatons and the regex fallback must find the same
+whole-word keywords and topics as a plain per-keyword regex search.
+"""
+
+import random
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mantra.query_classifier import QueryClassifier
+
+pytest.importorskip("ahocorasick")
+
+
+SAMPLE_QUERIES = [
+    "What is the business judgment rule in Delaware?",
+    "Explain Revlon duties in a sale of control",
+    "Section 220 books and records demand",
+    "section 2205 of the code",
+    "Is a careful director liable for a breach of the duty of care?",
+    "caremark oversight claims against the board",
+    "de-spac mergers and the MFW framework",
+    "freeze-out / squeeze-out: entire fairness?",
+    "m&a litigation after corwin stockholder vote",
+    "court of chancery opinion on appraisal fair value",
+    "controlling shareholder special committee",
+    "what's the weather like today",
+    "recipe for chocolate cake",
+    "duty_of_care fiduciaryship boards",
+    "",
+    "   ",
+    "DELAWARE",
+    "revlon,unocal;blasius.schnell",
+]
+
+
+@pytest.fixture(scope="module")
+def classifiers():
+    automaton = QueryClassifier(client=object())
+    assert automaton._keyword_automaton is not None
+
+    fallback = QueryClassifier(client=object())
+    fallback._keyword_automaton = None
+    fallback._topic_automaton = None
+    return automaton, fallback
+
+
+def reference_keywords(query_lower: str) -> set:
+    return {
+        keyword for keyword in QueryClassifier.LEGAL_KEYWORDS
+        if re.search(rf"\b{re.escape(keyword)}\b", query_lower)
+    }
+
+
+def reference_topics(query_lower: str) -> list:
+    return [
+        topic for topic, keywords in QueryClassifier.TOPIC_KEYWORDS.items()
+        if any(re.search(rf"\b{re.escape(keyword)}\b", query_lower) for keyword in keywords)
+    ]
+
+
+def random_queries(count: int = 300):
+    """Queries mixing keywords, their fragments and filler words."""
+    rng = random.Random(0)
+    vocabulary = sorted(QueryClassifier.LEGAL_KEYWORDS) + [
+        keyword for keywords in QueryClassifier.TOPIC_KEYWORDS.values() for keyword in keywords
+    ]
+    filler = ["the", "a", "of", "in", "careful", "boarded", "2205", "re", "-", "?", "_x", "fair"]
+    separators = [" ", " ", ", ", "-", "/", "", "_"]
+    for _ in range(count):
+        words = [rng.choice(vocabulary if rng.random() < 0.5 else filler) for _ in range(rng.randrange(1, 10))]
+        yield "".join(word + rng.choice(separators) for word in words)
+
+
+@pytest.mark.parametrize("query", SAMPLE_QUERIES + list(random_queries()))
+def test_keyword_and_topic_parity(classifiers, query):
+    query_lower = query.lower()
+    tokens = query_lower.split()
+    expected_score = min(2 * len(reference_keywords(query_lower)) / max(len(tokens), 1), 1.0)
+
+    for classifier in classifiers:
+        assert classifier._keyword_relevance_score(query_lower, tokens) == pytest.approx(expected_score)
+        assert classifier._extract_topics(query_lower) == reference_topics(query_lower)
+
+
+def test_keywords_match_whole_words_only(classifiers):
+    for classifier in classifiers:
+        assert classifier._keyword_relevance_score("careful", ["careful"]) == 0.0
+        assert classifier._extract_topics("section 2205") == []
+        assert classifier._extract_topics("section 220") == ["section 220"]
@@ -0,0 +1,127 @@
+"""
+Tests for columnar metadata filtering.
+The vectorized filters must select exactly the rows _matches_filters accepts,
+for dict-backed and Arrow-backed metadata.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mantra.indexer import DelawareCaseLawIndexer
+from mantra.metadata_columns import MetadataColumns
+from mantra.metadata_table import ArrowMetadata
+
+COURTS = ["del", "delch", "delsuperct", "delfamct"]
+NUM_ROWS = 300
+
+
+def make_metadata(rng: random.Random, arrow_safe: bool = False):
+    """Chunk metadata with the field shapes the index stores."""
+    metadata = []
+    for i in range(NUM_ROWS):
+        date = 19900101 + rng.randrange(35) * 10000 + rng.randrange(12) * 100 + rng.randrange(28)
+        meta = {
+            "chunk_id": f"{i}_0",
+            "case_id": rng.randrange(50),
+            "court": rng.choice(COURTS),
+            "date_filed": f"{date // 10000}-{date // 100 % 100:02d}-{date % 100:02d}",
+            "date_filed_int": date,
+            "score": rng.random(),
+            "precedential": rng.choice([True, False]),
+            "judge": rng.choice(["Strine", "Laster", None]),
+            "citations": rng.sample(["A.2d", "A.3d", "Del."], rng.randrange(3)),
+            "text": "excerpt",
+        }
+        if not arrow_safe:
+            # Dict metadata may miss fields or mix value types
+            if rng.random() < 0.1:
+                del meta["date_filed_int"]
+            if rng.random() < 0.1:
+                meta["case_id"] = None
+        metadata.append(meta)
+    return metadata
+
+
+def make_filters(rng: random.Random):
+    """Random filters over the fields in make_metadata."""
+    candidates = [
+        ("court", lambda: rng.choice(COURTS + ["missing"])),
+        ("case_id", lambda: rng.randrange(50)),
+        ("case_id", lambda: {"$gte": rng.randrange(50), "$lt": rng.randrange(50)}),
+        ("date_filed_int", lambda: {"$gte": 20000101 + rng.randrange(20) * 10000}),
+        ("date_filed_int", lambda: {"$gt": 19950101, "$lte": 20150101 + rng.randrange(5) * 10000}),
+        ("date_filed", lambda: {"$gte": f"{2000 + rng.randrange(20)}-01-01"}),
+        ("score", lambda: {"$lt": rng.random()}),
+        ("precedential", lambda: rng.choice([True, False])),
+        ("judge", lambda: rng.choice(["Strine", "Laster", None])),
+        ("citations", lambda: rng.choice([[], ["A.2d"], ["A.3d", "Del."]])),
+        ("no_such_field", lambda: 1),
+    ]
+    return dict((key, make_value()) for key, make_value in rng.sample(candidates, rng.randrange(1, 4)))
+
+
+@pytest.fixture
+def indexer(tmp_path):
+    return DelawareCaseLawIndexer(index_path=str(tmp_path), client=object())
+
+
+def reference_mask(indexer, metadata, filters):
+    """Row-by-row filtering, where incomparable values never match."""
+    def matches(meta):
+        try:
+            return indexer._matches_filters(meta, filters)
+        except TypeError:
+            return False
+
+    return np.array([matches(meta) for meta in metadata], dtype=bool)
+
+
+def assert_parity(indexer, metadata, rng):
+    for _ in range(200):
+        filters = indexer._prepare_filters(make_filters(rng))
+        expected = reference_mask(indexer, metadata, filters)
+
+        candidate_filter = indexer._compile_filter(filters)
+        assert candidate_filter(np.arange(len(metadata))).tolist() == expected.tolist(), filters
+
+        # FAISS-shaped input with -1 padding
+        ids = np.array([[0, len(metadata) - 1, -1]])
+        assert candidate_filter(ids).tolist() == [[expected[0], expected[-1], False]], filters
+
+        # The numeric pre-selection never drops a matching row
+        narrowed = indexer.columns.range_ids(filters)
+        if narrowed is not None:
+            assert set(np.flatnonzero(expected).tolist()) <= set(narrowed.tolist()), filters
+
+
+def test_dict_metadata_filter_parity(indexer):
+    rng = random.Random(0)
+    metadata = make_metadata(rng)
+    indexer.metadata = metadata
+    assert_parity(indexer, metadata, rng)
+
+
+def test_arrow_metadata_filter_parity(indexer):
+    pa = pytest.importorskip("pyarrow")
+    rng = random.Random(1)
+    metadata = make_metadata(rng, arrow_safe=True)
+    indexer.metadata = ArrowMetadata(pa.Table.from_pylist(metadata))
+    assert_parity(indexer, metadata, rng)
+
+
+def test_date_filed_range_is_compared_as_integers(indexer):
+    filters = indexer._prepare_filters({"court": "del", "date_filed": {"$gte": "2020-01-01"}})
+    assert filters == {"court": "del", "date_filed_int": {"$gte": 20200101}}
+
+
+def test_list_fields_are_not_columnar():
+    columns = MetadataColumns([{"citations": ["A.2d"]}, {"citations": []}])
+    assert columns.compile("citations", ["A.2d"]) is None
+    assert columns.compile("missing", 1)(np.arange(2)).tolist() == [False, False]
@@ -0,0 +1,108 @@
+"""
+Tests for the generated-answer cache.
+Covers context keys, exact and similar-question hits, TTL expiry and LRU eviction.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mantra import semantic_cache
+from mantra.semantic_cache import ResponseCache
+
+DIMENSION = 8
+
+
+def unit_vector(seed: int) -> np.ndarray:
+    """Random L2-normalized embedding of shape (1, DIMENSION)."""
+    vector = np.random.default_rng(seed).standard_normal((1, DIMENSION)).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def nearby(vector: np.ndarray, noise: float = 0.01, seed: int = 0) -> np.ndarray:
+    """A unit vector with cosine similarity close to 1 to vector."""
+    jitter = np.random.default_rng(seed).standard_normal(vector.shape).astype(np.float32)
+    other = vector + noise * jitter
+    return other / np.linalg.norm(other)
+
+
+class FakeClock:
+    """Stands in for time.monotonic() in the cache module."""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(semantic_cache.time, "monotonic", fake)
+    return fake
+
+
+
+def chunks(*chunk_ids):
+    return [{"text": f"text {i}", "metadata": {"chunk_id": i}} for i in chunk_ids]
+
+
+def test_context_key_follows_chunk_ids_in_order():
+    assert ResponseCache.context_key(chunks(1, 2)) == ResponseCache.context_key(chunks(1, 2))
+    assert ResponseCache.context_key(chunks(1, 2)) != ResponseCache.context_key(chunks(2, 1))
+    assert ResponseCache.context_key(chunks(1, 2)) != ResponseCache.context_key(chunks(1, 3))
+    # Chunks without an ID are keyed by text
+    assert ResponseCache.context_key([{"text": "a"}]) != ResponseCache.context_key([{"text": "b"}])
+
+
+def test_response_exact_hit_is_scoped_to_context():
+    cache = ResponseCache()
+    context = ResponseCache.context_key(chunks(1, 2))
+    cache.put("What is Revlon?", context, "answer")
+
+    assert cache.get("what is  revlon?", context) == "answer"
+    assert cache.get("What is Revlon?", ResponseCache.context_key(chunks(3))) is None
+
+
+def test_response_similar_question_hit():
+    cache = ResponseCache(threshold=0.95)
+    context = ResponseCache.context_key(chunks(1))
+    vector = unit_vector(1)
+    cache.put("What is Revlon?", context, "answer", query_vector=vector)
+
+    assert cache.get("Explain Revlon duties", context, query_vector=nearby(vector)) == "answer"
+    assert cache.get("Explain Revlon duties", context, query_vector=unit_vector(2)) is None
+    # Similar questions never cross contexts
+    other = ResponseCache.context_key(chunks(2))
+    assert cache.get("Explain Revlon duties", other, query_vector=nearby(vector)) is None
+
+
+def test_response_entries_expire(clock):
+    cache = ResponseCache(ttl=60.0)
+    context = ResponseCache.context_key(chunks(1))
+    cache.put("q", context, "answer", query_vector=unit_vector(1))
+
+    clock.now += 61
+    assert cache.get("q", context) is None
+    assert cache.get("other", context, query_vector=unit_vector(1)) is None
+    assert len(cache) == 0
+
+
+def test_response_cache_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2)
+    context = ResponseCache.context_key(chunks(1))
+    cache.put("a", context, "A")
+    cache.put("b", context, "B")
+    assert cache.get("a", context) == "A"  # b is now least recently used
+
+    cache.put("c", context, "C")
+    assert len(cache) == 2
+    assert cache.get("b", context) is None
+    assert cache.get("a", context) == "A"
+    assert cache.get("c", context) == "C"
@@ -0,0 +1,191 @@
+"""
+Tests for LegalResponseGenerator with a fake OpenAI client.
+Covers the response cache and the circuit breaker around the LLM call, and
+streamed answers.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+import openai
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mantra.clients import CircuitBreaker
+from mantra.response_generator import ERROR_MESSAGE, NO_RESULTS_MESSAGE, LegalResponseGenerator
+from mantra.semantic_cache import ResponseCache
+
+CHUNKS = [
+    {
+        "text": "The board breached its duty of loyalty.",
+        "score": 0.2,
+        "similarity": 0.9,
+        "metadata": {"chunk_id": "1_0", "case_id": 1, "case_name": "In re Example", "court": "delch"},
+    },
+]
+
+
+class FakeCompletions:
+    """chat.completions stand-in returning canned answers or raising errors."""
+
+    def __init__(self, error: Exception = None):
+        self.error = error
+        self.calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        content = f"answer {self.calls}"
+        usage = SimpleNamespace(prompt_tokens=100, prompt_tokens_details=SimpleNamespace(cached_tokens=50))
+        if kwargs.get("stream"):
+            return self._stream(content, usage)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=usage,
+        )
+
+    @staticmethod
+    def _stream(content: str, usage):
+        for delta in content.partition(" "):
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=delta))], usage=None)
+        # With include_usage, the last chunk has no choices
+        yield SimpleNamespace(choices=[], usage=usage)
+
+
+class FakeAsyncCompletions(FakeCompletions):
+    async def create(self, **kwargs):
+        return FakeCompletions.create(self, **kwargs)
+
+
+def fake_client(completions: FakeCompletions) -> SimpleNamespace:
+    return SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+
+def transient_error() -> openai.APIConnectionError:
+    return openai.APIConnectionError(request=httpx.Request("POST", "https://api.openai.com/v1"))
+
+
+def test_answers_are_cached_per_context():
+    completions = FakeCompletions()
+    generator = LegalResponseGenerator(client=fake_client(completions), response_cache=ResponseCache())
+
+    first = generator.generate_response("What is loyalty?", CHUNKS, include_sources=False)
+    second = generator.generate_response("what is loyalty?", CHUNKS, include_sources=False)
+    assert first["answer"] == second["answer"] == "answer 1"
+    assert completions.calls == 1
+
+    # Other retrieved chunks: answered again
+    other = [dict(CHUNKS[0], metadata=dict(CHUNKS[0]["metadata"], chunk_id="2_0"))]
+    assert generator.generate_response("What is loyalty?", other, include_sources=False)["answer"] == "answer 2"
+
+
+def test_async_generation_shares_the_cache():
+    completions = FakeAsyncCompletions()
+    cache = ResponseCache()
+    generator = LegalResponseGenerator(
+        client=fake_client(FakeCompletions()), async_client=fake_client(completions), response_cache=cache
+    )
+
+    async def run():
+        first = await generator.agenerate_response("What is loyalty?", CHUNKS, include_sources=False)
+        second = await generator.agenerate_response("What is loyalty?", CHUNKS, include_sources=False)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first["answer"] == second["answer"] == "answer 1"
+    assert completions.calls == 1
+    # The sync path is served from the same cache
+    assert generator.generate_response("What is loyalty?", CHUNKS, include_sources=False)["answer"] == "answer 1"
+
+
+def test_async_generation_matches_sync():
+    sync = LegalResponseGenerator(client=fake_client(FakeCompletions()))
+    concurrent = LegalResponseGenerator(
+        client=fake_client(FakeCompletions()), async_client=fake_client(FakeAsyncCompletions())
+    )
+
+    async def run():
+        return await asyncio.gather(*(concurrent.agenerate_response(f"q{i}", CHUNKS) for i in range(3)))
+
+    responses = asyncio.run(run())
+    assert sorted(response["answer"] for response in responses) == sorted(
+        sync.generate_response(f"q{i}", CHUNKS)["answer"] for i in range(3)
+    )
+
+
+def test_prompt_cache_hit_rate_counts_cached_tokens():
+    generator = LegalResponseGenerator(client=fake_client(FakeCompletions()))
+    assert generator.prompt_cache_hit_rate == 0.0
+
+    generator.generate_response("q1", CHUNKS)
+    generator.generate_response("q2", CHUNKS)
+    assert generator.prompt_cache_hit_rate == 0.5
+
+    # Questions over the same chunks share everything before the question
+    first = generator._build_messages("What is loyalty?", CHUNKS)
+    second = generator._build_messages("Explain the duty of care", CHUNKS)
+    assert first[0] == second[0] == {"role": "system", "content": generator.system_prompt}
+    assert second[1]["content"].startswith(first[1]["content"].split("Question: ")[0])
+
+
+def test_stream_joins_to_the_full_response():
+    streamed = LegalResponseGenerator(client=fake_client(FakeCompletions()))
+    blocking = LegalResponseGenerator(client=fake_client(FakeCompletions()))
+
+    deltas = list(streamed.generate_response_stream("What is loyalty?", CHUNKS))
+    assert len(deltas) > 1
+    assert "".join(deltas) == blocking.generate_response("What is loyalty?", CHUNKS)["answer"]
+    assert streamed.prompt_cache_hit_rate == 0.5
+
+
+def test_streamed_answer_is_cached():
+    completions = FakeCompletions()
+    generator = LegalResponseGenerator(client=fake_client(completions), response_cache=ResponseCache())
+
+    streamed = "".join(generator.generate_response_stream("What is loyalty?", CHUNKS, include_sources=False))
+    assert list(generator.generate_response_stream("What is loyalty?", CHUNKS, include_sources=False)) == [streamed]
+    assert generator.generate_response("What is loyalty?", CHUNKS, include_sources=False)["answer"] == streamed
+    assert completions.calls == 1
+
+
+def test_stream_error_yields_the_error_message():
+    generator = LegalResponseGenerator(client=fake_client(FakeCompletions(error=ValueError("bad"))))
+    assert list(generator.generate_response_stream("q", CHUNKS)) == [ERROR_MESSAGE]
+    assert list(generator.generate_response_stream("q", [])) == [NO_RESULTS_MESSAGE]
+
+
+def test_failed_generation_is_not_cached():
+    cache = ResponseCache()
+    generator = LegalResponseGenerator(
+        client=fake_client(FakeCompletions(error=ValueError("bad"))), response_cache=cache
+    )
+
+    assert generator.generate_response("q", CHUNKS)["confidence"] == "error"
+    assert len(cache) == 0
+
+
+def test_open_circuit_skips_the_api():
+    completions = FakeCompletions(error=transient_error())
+    generator = LegalResponseGenerator(
+        client=fake_client(completions),
+        circuit_breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60.0)
+    )
+
+    for _ in range(5):
+        assert generator.generate_response("q", CHUNKS)["confidence"] == "error"
+    assert completions.calls == 2
+    assert generator.circuit_breaker.is_open
+    assert list(generator.generate_response_stream("q", CHUNKS)) == [ERROR_MESSAGE]
+    assert completions.calls == 2
+
+
+def test_no_chunks_skips_the_api():
+    completions = FakeCompletions()
+    generator = LegalResponseGenerator(client=fake_client(completions))
+    assert generator.generate_response("q", [])["confidence"] == "low"
+    assert completions.calls == 0
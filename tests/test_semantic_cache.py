@@ -0,0 +1,222 @@
+"""
+Tests for the semantic query cache.
+Covers exact and semantic hits, TTL expiry, index versions, namespaces and
+sharing the SQLite store between processes.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mantra import semantic_cache
+from mantra.semantic_cache import SemanticCache
+
+DIMENSION = 8
+
+
+def unit_vector(seed: int) -> np.ndarray:
+    """Random L2-normalized embedding of shape (1, DIMENSION)."""
+    vector = np.random.default_rng(seed).standard_normal((1, DIMENSION)).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def nearby(vector: np.ndarray, noise: float = 0.01, seed: int = 0) -> np.ndarray:
+    """A unit vector with cosine similarity close to 1 to vector."""
+    jitter = np.random.default_rng(seed).standard_normal(vector.shape).astype(np.float32)
+    other = vector + noise * jitter
+    return other / np.linalg.norm(other)
+
+
+class FakeClock:
+    """Stands in for time.time() in the cache module."""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(semantic_cache.time, "time", fake)
+    return fake
+
+
+
+def test_exact_hit_normalizes_query():
+    cache = SemanticCache(dimension=DIMENSION)
+    cache.add("What is a fiduciary duty?", unit_vector(1), {"answer": "A"})
+
+    assert cache.get_exact("  what is a FIDUCIARY duty?  ") == {"answer": "A"}
+    assert cache.get_exact("What is the business judgment rule?") is None
+
+
+def test_semantic_hit_above_threshold_only():
+    cache = SemanticCache(dimension=DIMENSION, threshold=0.95)
+    vector = unit_vector(1)
+    cache.add("q", vector, {"answer": "A"})
+
+    assert cache.get_similar(nearby(vector)) == {"answer": "A"}
+    assert cache.get_similar(unit_vector(2)) is None
+
+
+def test_empty_cache_misses():
+    cache = SemanticCache(dimension=DIMENSION)
+    assert cache.get_exact("q") is None
+    assert cache.get_similar(unit_vector(1)) is None
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = SemanticCache(dimension=DIMENSION, ttl=60.0)
+    vector = unit_vector(1)
+    cache.add("q", vector, {"answer": "A"})
+
+    clock.now += 59
+    assert cache.get_exact("q") == {"answer": "A"}
+    assert cache.get_similar(vector) == {"answer": "A"}
+
+    clock.now += 2
+    assert cache.get_exact("q") is None
+    assert cache.get_similar(vector) is None
+
+
+def test_no_ttl_never_expires(clock):
+    cache = SemanticCache(dimension=DIMENSION, ttl=None)
+    cache.add("q", unit_vector(1), {"answer": "A"})
+
+    clock.now += 10 ** 9
+    assert cache.get_exact("q") == {"answer": "A"}
+
+
+def test_expired_semantic_candidate_is_skipped(clock):
+    cache = SemanticCache(dimension=DIMENSION, threshold=0.9, ttl=60.0)
+    vector = unit_vector(1)
+    cache.add("old", vector, {"answer": "old"})
+    clock.now += 30
+    cache.add("new", nearby(vector, seed=1), {"answer": "new"})
+
+    clock.now += 40  # Only the first entry has expired
+    assert cache.get_similar(vector) == {"answer": "new"}
+
+
+def test_memory_tiers_are_bounded():
+    cache = SemanticCache(dimension=DIMENSION, max_entries=4)
+    for i in range(10):
+        cache.add(f"q{i}", unit_vector(i), {"answer": i})
+
+    assert len(cache) <= 4
+    assert cache.get_exact("q9") == {"answer": 9}
+    assert cache.get_exact("q0") is None
+
+
+def test_store_survives_restart(tmp_path):
+    db_path = str(tmp_path / "cache.db")
+    vector = unit_vector(1)
+    SemanticCache(dimension=DIMENSION, db_path=db_path).add("q", vector, {"answer": "A"})
+
+    reopened = SemanticCache(dimension=DIMENSION, db_path=db_path)
+    assert reopened.get_exact("q") == {"answer": "A"}
+    assert reopened.get_similar(nearby(vector)) == {"answer": "A"}
+
+
+def test_exact_hits_served_from_disk_after_eviction(tmp_path):
+    cache = SemanticCache(dimension=DIMENSION, max_entries=2, db_path=str(tmp_path / "cache.db"))
+    for i in range(5):
+        cache.add(f"q{i}", unit_vector(i), {"answer": i})
+
+    assert cache._key("q0") not in cache._exact
+    assert cache.get_exact("q0") == {"answer": 0}
+
+
+def test_processes_share_the_store(tmp_path):
+    db_path = str(tmp_path / "cache.db")
+    first = SemanticCache(dimension=DIMENSION, db_path=db_path)
+    second = SemanticCache(dimension=DIMENSION, db_path=db_path)
+    vector = unit_vector(1)
+
+    first.add("q", vector, {"answer": "A"})
+
+    # Written after second was opened: found on disk and synced into its index
+    assert second.get_exact("q") == {"answer": "A"}
+    assert second.get_similar(nearby(vector)) == {"answer": "A"}
+
+
+def test_disk_entries_expire_after_ttl(tmp_path, clock):
+    db_path = str(tmp_path / "cache.db")
+    vector = unit_vector(1)
+    SemanticCache(dimension=DIMENSION, db_path=db_path, ttl=60.0).add("q", vector, {"answer": "A"})
+
+    clock.now += 61
+    reopened = SemanticCache(dimension=DIMENSION, db_path=db_path, ttl=60.0)
+    assert reopened.get_exact("q") is None
+    assert reopened.get_similar(vector) is None
+
+
+def test_other_index_versions_are_not_served(tmp_path):
+    db_path = str(tmp_path / "cache.db")
+    vector = unit_vector(1)
+    old = SemanticCache(dimension=DIMENSION, db_path=db_path, index_version="2024-01-01")
+    old.add("q", vector, {"answer": "old"})
+
+    new = SemanticCache(dimension=DIMENSION, db_path=db_path, index_version="2024-02-01")
+    assert new.get_exact("q") is None
+    assert new.get_similar(vector) is None
+
+    # Rows from the old build were purged when the new one opened the store
+    remaining = new._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+    assert remaining == 0
+
+
+def test_namespaces_share_a_store_without_mixing(tmp_path):
+    db_path = str(tmp_path / "cache.db")
+    vector = unit_vector(1)
+    api = SemanticCache(dimension=DIMENSION, db_path=db_path, namespace="chat_api")
+    app = SemanticCache(dimension=DIMENSION, db_path=db_path, namespace="streamlit")
+
+    api.add("q", vector, {"message": "A", "relevant": True})
+
+    # The other consumer never sees a response shape it cannot read
+    assert app.get_exact("q") is None
+    assert app.get_similar(vector) is None
+    assert SemanticCache(dimension=DIMENSION, db_path=db_path, namespace="streamlit").get_exact("q") is None
+
+    # Same query, own row: neither overwrites the other
+    app.add("q", vector, {"type": "success", "answer": "A"})
+    assert api.get_exact("q") == {"message": "A", "relevant": True}
+    reopened = SemanticCache(dimension=DIMENSION, db_path=db_path, namespace="chat_api")
+    assert reopened.get_exact("q") == {"message": "A", "relevant": True}
+    assert reopened.get_similar(vector) == {"message": "A", "relevant": True}
+    assert app.get_exact("q") == {"type": "success", "answer": "A"}
+
+
+def test_index_version_purge_keeps_other_namespaces(tmp_path):
+    db_path = str(tmp_path / "cache.db")
+    app = SemanticCache(dimension=DIMENSION, db_path=db_path, index_version="v1", namespace="streamlit")
+    app.add("q", unit_vector(1), {"answer": "A"})
+    # An API worker on a newer build only purges its own rows
+    SemanticCache(dimension=DIMENSION, db_path=db_path, index_version="v2", namespace="chat_api")
+
+    reopened = SemanticCache(dimension=DIMENSION, db_path=db_path, index_version="v1", namespace="streamlit")
+    assert reopened.get_exact("q") == {"answer": "A"}
+
+
+def test_stores_without_namespaces_are_migrated(tmp_path):
+    db_path = str(tmp_path / "cache.db")
+    cache = SemanticCache(dimension=DIMENSION, db_path=db_path)
+    cache._db.execute("DROP TABLE responses")
+    cache._db.execute(
+        "CREATE TABLE responses (key TEXT PRIMARY KEY, response TEXT NOT NULL, embedding BLOB NOT NULL)"
+    )
+    cache._db.commit()
+
+    SemanticCache(dimension=DIMENSION, db_path=db_path, namespace="chat_api").add("q", unit_vector(1), {"answer": "A"})
+
+    reopened = SemanticCache(dimension=DIMENSION, db_path=db_path, namespace="chat_api")
+    assert reopened.get_exact("q") == {"answer": "A"}